@@ -0,0 +1,10 @@
+"""Benchmarks for the data paths in :mod:`core`.
+
+Run individual benchmarks as modules from the repository root, e.g.::
+
+    python -m benchmarks.core_paths --output results.json
+    python -m benchmarks.preset_save
+
+``benchmarks.synthetic`` builds the large databases the benchmarks run on
+and can also be used on its own to create one for manual testing.
+"""
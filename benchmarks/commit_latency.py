@@ -0,0 +1,77 @@
+"""Compare commit latency of the default PRAGMA profile with plain SQLite.
+
+Each profile gets a fresh database.  The benchmark then times many small
+write transactions that resemble ``save_exercise``.  The "rollback" profile
+applies no PRAGMAs, which matches how the app opened connections before the
+WAL profile was introduced.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import core  # noqa: E402
+from benchmarks.preset_save import build_database  # noqa: E402
+
+PROFILES = {
+    "rollback": {name: None for name in core.DEFAULT_PRAGMAS},
+    "wal": {},
+}
+
+
+def _commit_times(db: core.WorkoutDatabase, commits: int, exercises: int) -> list[float]:
+    times = []
+    for i in range(commits):
+        start = time.perf_counter()
+        with db.transaction() as cursor:
+            cursor.execute(
+                "UPDATE library_exercises SET description = ? WHERE id = ?",
+                (f"edit {i}", i % exercises + 1),
+            )
+            cursor.execute(
+                "UPDATE library_exercise_metrics SET position = ? WHERE exercise_id = ?",
+                (i, i % exercises + 1),
+            )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(commits: int = 200, exercises: int = 200) -> dict:
+    """Return per-commit timings in seconds for every profile."""
+
+    results = {}
+    for name, pragmas in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bench.db"
+            build_database(db_path, exercises)
+            db = core.WorkoutDatabase(db_path, pragmas)
+            mode = db.connection().execute("PRAGMA journal_mode").fetchone()[0]
+            results[name] = {
+                "journal_mode": mode,
+                "times": _commit_times(db, commits, exercises),
+            }
+            db.close()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=200)
+    parser.add_argument("--exercises", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    results = run(args.commits, args.exercises)
+    for name, result in results.items():
+        times = sorted(result["times"])
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(
+            f"{name:>8} ({result['journal_mode']}): median"
+            f" {times[len(times) // 2] * 1000:.3f} ms, p95 {p95 * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Time the main data paths of :mod:`core` on a synthetic database.
+
+Each scenario runs ``repeat`` times after one warm-up call.  Results are
+written as JSON so runs can be stored and compared over time::
+
+    python -m benchmarks.core_paths --output results.json
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import core  # noqa: E402
+from benchmarks.synthetic import DEFAULT_SIZE, generate_database  # noqa: E402
+
+SCENARIOS = {}
+
+
+def scenario(func):
+    """Register ``func(db_path, repeat)`` returning the callable to time."""
+
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+@scenario
+def load_workout_presets(db_path, repeat):
+    return lambda: core.load_workout_presets(db_path)
+
+
+@scenario
+def load_single_preset(db_path, repeat):
+    return lambda: core.load_workout_presets(db_path, names=["Preset 0"])
+
+
+@scenario
+def get_metrics_for_exercise(db_path, repeat):
+    name = core.load_workout_presets(db_path, names=["Preset 0"])[0]["exercises"][0]["name"]
+    return lambda: core.get_metrics_for_exercise(name, db_path, preset_name="Preset 0")
+
+
+@scenario
+def preset_editor_load(db_path, repeat):
+    editor = core.PresetEditor(db_path=db_path)
+    return lambda: editor.load("Preset 0")
+
+
+@scenario
+def preset_editor_save(db_path, repeat):
+    editor = core.PresetEditor("Preset 1", db_path)
+
+    def save():
+        # Touch one exercise so every save has something to write
+        sets = editor.sections[0]["exercises"][0]["sets"]
+        editor.update_exercise(0, 0, sets=sets % 5 + 1)
+        editor.save()
+
+    return save
+
+
+@scenario
+def save_exercise(db_path, repeat):
+    exercise = core.Exercise("Exercise 1", db_path=db_path)
+
+    def save():
+        exercise.description = f"Edited {time.perf_counter()}"
+        core.save_exercise(exercise)
+
+    return save
+
+
+@scenario
+def delete_metric_type(db_path, repeat):
+    names = [f"Disposable {i}" for i in range(repeat + 1)]
+    for name in names:
+        core.add_metric_type(name, "int", "post_set", "set", db_path=db_path)
+    return lambda: core.delete_metric_type(names.pop(), db_path=db_path)
+
+
+@scenario
+def exercise_progress(db_path, repeat):
+    core.rebuild_progress(db_path)
+    name = core.get_progress_exercises(db_path)[0]
+    return lambda: core.get_exercise_progress(name, period="day", db_path=db_path)
+
+
+@contextmanager
+def _recording(statements: list):
+    """Record every statement run on connections opened by ``core``."""
+
+    open_connection = core.WorkoutDatabase.open_connection
+
+    def traced(self, *args, **kwargs):
+        conn = open_connection(self, *args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    core.WorkoutDatabase.open_connection = traced
+    try:
+        yield
+    finally:
+        core.WorkoutDatabase.open_connection = open_connection
+
+
+def _measure(action, repeat: int, statements: list) -> dict:
+    action()
+    times = []
+    counts = []
+    for _ in range(repeat):
+        statements.clear()
+        start = time.perf_counter()
+        action()
+        times.append(time.perf_counter() - start)
+        counts.append(len(statements))
+    return {
+        "median_ms": statistics.median(times) * 1000,
+        "mean_ms": statistics.fmean(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "max_ms": max(times) * 1000,
+        "statements": statistics.median(counts),
+    }
+
+
+def run(repeat: int = 20, scenarios=None, **size) -> dict:
+    """Run ``scenarios`` (all by default) and return the JSON-ready report."""
+
+    names = list(scenarios or SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+
+    report = {
+        "benchmark": "core_paths",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "repeat": repeat,
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            # A fresh database per scenario keeps writes from skewing others
+            db_path = Path(tmp) / f"{name}.db"
+            report["size"] = generate_database(db_path, **size)
+            statements: list[str] = []
+            with _recording(statements):
+                action = SCENARIOS[name](db_path, repeat)
+                report["results"][name] = _measure(action, repeat, statements)
+            core.WorkoutDatabase.close_all()
+            core.LibraryCache.clear_all()
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), dest="scenarios"
+    )
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    for field, default in DEFAULT_SIZE.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=default)
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.repeat,
+        args.scenarios,
+        **{field: getattr(args, field) for field in DEFAULT_SIZE},
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark ``search_library`` on a large exercise library.
+
+Builds a temporary database with many exercises and times full-text
+queries against loading every name into Python and scanning it, which is
+what the library screens did before.
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import core  # noqa: E402
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "data" / "workout_schema.sql"
+
+WORDS = (
+    "bench press squat row curl deadlift lunge plank dip raise fly pull push"
+    " incline decline cable dumbbell barbell kettlebell single arm leg seated"
+).split()
+
+QUERIES = ("bench", "dumbbell curl", "sea", "kettlebell swing", "zeta", "zzz")
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    syllables = "ba ce di fo gu ka le mi no pu ra se ti vo zu xa ye ze ta".split()
+    return ["".join(rng.choices(syllables, k=3)) for _ in range(size)]
+
+
+def build_database(db_path: Path, exercises: int, seed: int = 0) -> None:
+    """Create ``db_path`` with ``exercises`` randomly named exercises.
+
+    Names combine two common gym words with a rarer word; descriptions are
+    drawn from a larger vocabulary, so queries range from very common to
+    selective terms.
+    """
+
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng, 3000)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn.executemany(
+        "INSERT INTO library_exercises (name, description, is_user_created) VALUES (?, ?, ?)",
+        [
+            (
+                f"{' '.join(rng.sample(WORDS, 2)).title()} {rng.choice(vocabulary).title()} {i}",
+                " ".join(rng.choices(vocabulary, k=8)),
+                i % 10 == 0,
+            )
+            for i in range(exercises)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median(times: list[float]) -> float:
+    return sorted(times)[len(times) // 2]
+
+
+def run(exercises: int = 10000, repeat: int = 50) -> dict:
+    """Return median query times in seconds for FTS and a Python scan."""
+
+    results = {"exercises": exercises, "fts": {}, "scan": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        build_database(db_path, exercises)
+        core.search_library("warm up", db_path)
+        for query in QUERIES:
+            fts_times, scan_times = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                core.search_library(query, db_path, kind="exercise")
+                fts_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                names = core.get_all_exercises(db_path, include_user_created=True)
+                q = query.lower()
+                [n for n in names if q in n[0].lower()]
+                scan_times.append(time.perf_counter() - start)
+            results["fts"][query] = _median(fts_times)
+            results["scan"][query] = _median(scan_times)
+        core.WorkoutDatabase.close_all()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exercises", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    results = run(args.exercises, args.repeat)
+    for query in QUERIES:
+        print(
+            f"{query!r:>20}: fts {results['fts'][query] * 1000:.3f} ms,"
+            f" load+scan {results['scan'][query] * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark ``PresetEditor.save`` on a large preset.
+
+Builds a temporary database with a 200-exercise library, then measures the
+time and number of SQL statements needed to save a new 200-exercise preset
+and to re-save it after a handful of edits.
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import core  # noqa: E402
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "data" / "workout_schema.sql"
+
+
+def build_database(db_path: Path, exercises: int, metrics_per_exercise: int = 3) -> None:
+    """Create ``db_path`` with ``exercises`` library exercises."""
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn.executemany(
+        "INSERT INTO library_metric_types (name, type, input_timing, is_required, scope, description, is_user_created)"
+        " VALUES (?, 'int', 'post_set', 0, 'set', '', 0)",
+        [(f"Metric {i}",) for i in range(metrics_per_exercise)],
+    )
+    conn.executemany(
+        "INSERT INTO library_exercises (name, description, is_user_created) VALUES (?, '', 0)",
+        [(f"Exercise {i}",) for i in range(exercises)],
+    )
+    conn.execute(
+        """
+        INSERT INTO library_exercise_metrics (exercise_id, metric_type_id, position)
+        SELECT e.id, mt.id, mt.id FROM library_exercises e CROSS JOIN library_metric_types mt
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def _timed_save(editor: core.PresetEditor) -> tuple[float, int]:
+    statements: list[str] = []
+    editor.conn.set_trace_callback(statements.append)
+    start = time.perf_counter()
+    editor.save()
+    elapsed = time.perf_counter() - start
+    editor.conn.set_trace_callback(None)
+    return elapsed, len(statements)
+
+
+def run(exercises: int = 200, sections: int = 10, repeat: int = 5) -> dict:
+    """Return timings for saving a preset with ``exercises`` exercises."""
+
+    per_section = max(1, exercises // sections)
+    results = {"exercises": exercises, "sections": sections, "create": [], "resave": []}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bench.db"
+            build_database(db_path, exercises)
+            editor = core.PresetEditor(db_path=db_path)
+            editor.preset_name = "Bench Preset"
+            for s in range(sections):
+                editor.add_section(f"Section {s}")
+                for e in range(per_section):
+                    editor.add_exercise(s, f"Exercise {s * per_section + e}")
+            results["create"].append(_timed_save(editor))
+
+            # Edit a handful of rows: change sets, reorder, remove and add.
+            for s in range(sections):
+                editor.update_exercise(s, 0, sets=5)
+                editor.move_exercise(s, 0, per_section - 1)
+                editor.remove_exercise(s, 1)
+                editor.add_exercise(s, f"Exercise {(s + 1) % exercises}")
+            editor.remove_section(sections - 1)
+            results["resave"].append(_timed_save(editor))
+            editor.close()
+            core.WorkoutDatabase.close_all()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exercises", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.exercises, args.sections, args.repeat)
+    for phase in ("create", "resave"):
+        times = sorted(t for t, _ in results[phase])
+        statements = results[phase][0][1]
+        print(
+            f"{phase:>6}: median {times[len(times) // 2] * 1000:.2f} ms,"
+            f" {statements} statements"
+        )
+
+
+if __name__ == "__main__":
+    main()
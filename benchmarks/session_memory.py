@@ -0,0 +1,82 @@
+"""Compare the memory held by workout results as dicts and as ``SetResults``.
+
+Records the same synthetic sets once as a list of dicts per exercise, the
+layout ``WorkoutSession`` used before, and once in :class:`core.SetResults`,
+then reports the bytes reachable from each.  Objects shared between sets,
+such as metric name strings, are counted once::
+
+    python -m benchmarks.session_memory --sets 500
+"""
+
+import argparse
+import json
+import random
+import sys
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import core  # noqa: E402
+
+# Metric names and value generators for one recorded set
+_METRICS = (
+    ("Reps", lambda rng: rng.randint(1, 20)),
+    ("Weight", lambda rng: rng.randint(0, 400) / 2),
+    ("RPE", lambda rng: rng.randint(12, 20) / 2),
+    ("Tempo", lambda rng: rng.choice(("2-0-2", "3-1-1", "4-0-1"))),
+)
+
+
+def _sets(exercises: int, sets: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(exercises):
+        yield [{name: make(rng) for name, make in _METRICS} for _ in range(sets)]
+
+
+def _deep_size(obj, seen: set | None = None) -> int:
+    """Return the size of ``obj`` and every object reachable from it."""
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        children = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set)):
+        children = obj
+    elif isinstance(obj, core.SetResults):
+        children = [getattr(obj, slot) for slot in core.SetResults.__slots__]
+    elif isinstance(obj, (str, int, float, bool, array)) or obj is None:
+        children = ()
+    else:
+        raise TypeError(f"Cannot size {type(obj).__name__}")
+    return size + sum(_deep_size(child, seen) for child in children)
+
+
+def run(exercises: int = 10, sets: int = 100, seed: int = 0) -> dict:
+    """Return the bytes retained by both layouts for ``exercises`` x ``sets``."""
+
+    dict_bytes = _deep_size(list(_sets(exercises, sets, seed)))
+    store_bytes = _deep_size([core.SetResults(r) for r in _sets(exercises, sets, seed)])
+    return {
+        "benchmark": "session_memory",
+        "exercises": exercises,
+        "sets_per_exercise": sets,
+        "dict_bytes": dict_bytes,
+        "store_bytes": store_bytes,
+        "ratio": round(store_bytes / dict_bytes, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exercises", type=int, default=10)
+    parser.add_argument("--sets", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.exercises, args.sets, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
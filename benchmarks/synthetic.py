@@ -0,0 +1,174 @@
+"""Generate synthetic workout databases of configurable size.
+
+The generated data follows the bundled schema: a library of exercises and
+metric types, presets built from it and completed workout sessions.  Values
+are drawn from a seeded random generator so runs are reproducible.
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "data" / "workout_schema.sql"
+
+_TIMINGS = ("pre_set", "post_set", "pre_exercise", "post_exercise")
+_TYPES = ("int", "float", "str", "bool")
+
+
+# Number of rows generated for each part of the database by default
+DEFAULT_SIZE = {
+    "exercises": 1000,
+    "metric_types": 40,
+    "metrics_per_exercise": 3,
+    "presets": 50,
+    "sections_per_preset": 4,
+    "exercises_per_section": 6,
+    "sessions": 200,
+    "seed": 0,
+}
+
+
+def generate_database(db_path: Path, **size) -> dict:
+    """Create ``db_path`` from the bundled schema and fill it with data.
+
+    Keyword arguments override entries of :data:`DEFAULT_SIZE`.  Returns the
+    size that was used.
+    """
+
+    unknown = set(size) - set(DEFAULT_SIZE)
+    if unknown:
+        raise TypeError(f"Unknown dataset sizes: {sorted(unknown)}")
+    size = SimpleNamespace(**{**DEFAULT_SIZE, **size})
+    rng = random.Random(size.seed)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+    conn.executemany(
+        "INSERT INTO library_metric_types"
+        " (name, type, input_timing, is_required, scope, description, is_user_created)"
+        " VALUES (?, ?, ?, ?, 'set', ?, ?)",
+        [
+            (
+                f"Metric {i}",
+                rng.choice(_TYPES),
+                rng.choice(_TIMINGS),
+                rng.random() < 0.3,
+                f"Synthetic metric {i}",
+                i % 5 == 0,
+            )
+            for i in range(size.metric_types)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO library_exercises (name, description, is_user_created) VALUES (?, ?, ?)",
+        [
+            (f"Exercise {i}", f"Synthetic exercise {i}", i % 10 == 0)
+            for i in range(size.exercises)
+        ],
+    )
+    per_exercise = min(size.metrics_per_exercise, size.metric_types)
+    conn.executemany(
+        "INSERT INTO library_exercise_metrics (exercise_id, metric_type_id, position) VALUES (?, ?, ?)",
+        [
+            (ex_id, mt_id, pos)
+            for ex_id in range(1, size.exercises + 1)
+            for pos, mt_id in enumerate(
+                rng.sample(range(1, size.metric_types + 1), per_exercise)
+            )
+        ],
+    )
+
+    preset_exercises: dict[int, list[tuple[int, str, int]]] = {}
+    for p in range(size.presets):
+        cur = conn.execute("INSERT INTO preset_presets (name) VALUES (?)", (f"Preset {p}",))
+        preset_id = cur.lastrowid
+        preset_exercises[preset_id] = []
+        for s in range(size.sections_per_preset):
+            cur = conn.execute(
+                "INSERT INTO preset_preset_sections (preset_id, name, position) VALUES (?, ?, ?)",
+                (preset_id, f"Section {s}", s),
+            )
+            section_id = cur.lastrowid
+            for pos in range(size.exercises_per_section):
+                ex_num = rng.randrange(size.exercises)
+                sets = rng.randint(2, 5)
+                cur = conn.execute(
+                    """
+                    INSERT INTO preset_section_exercises
+                        (section_id, exercise_name, exercise_description, position,
+                         number_of_sets, rest_time, library_exercise_id)
+                    VALUES (?, ?, '', ?, ?, 90, ?)
+                    """,
+                    (section_id, f"Exercise {ex_num}", pos, sets, ex_num + 1),
+                )
+                preset_exercises[preset_id].append((ex_num + 1, f"Exercise {ex_num}", sets))
+                conn.execute(
+                    """
+                    INSERT INTO preset_exercise_metrics
+                        (section_exercise_id, metric_name, type, input_timing,
+                         is_required, scope, library_metric_type_id)
+                    SELECT ?, mt.name, mt.type, mt.input_timing, mt.is_required, mt.scope, mt.id
+                    FROM library_exercise_metrics em
+                    JOIN library_metric_types mt ON mt.id = em.metric_type_id
+                    WHERE em.exercise_id = ?
+                    """,
+                    (cur.lastrowid, ex_num + 1),
+                )
+
+    started = time.time() - size.sessions * 86400
+    preset_ids = list(preset_exercises)
+    for n in range(size.sessions if preset_ids else 0):
+        preset_id = rng.choice(preset_ids)
+        start = started + n * 86400
+        cur = conn.execute(
+            "INSERT INTO session_sessions (preset_id, preset_name, status, started_at, ended_at)"
+            " VALUES (?, ?, 'completed', ?, ?)",
+            (preset_id, f"Preset {preset_id - 1}", start, start + 3600),
+        )
+        session_id = cur.lastrowid
+        for pos, (ex_id, ex_name, sets) in enumerate(preset_exercises[preset_id]):
+            cur = conn.execute(
+                "INSERT INTO session_exercises"
+                " (session_id, library_exercise_id, exercise_name, position, number_of_sets)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (session_id, ex_id, ex_name, pos, sets),
+            )
+            se_id = cur.lastrowid
+            for set_number in range(sets):
+                cur = conn.execute(
+                    "INSERT INTO session_sets (session_exercise_id, set_number, completed_at)"
+                    " VALUES (?, ?, ?)",
+                    (se_id, set_number, start + pos * 300 + set_number * 90),
+                )
+                conn.execute(
+                    "INSERT INTO session_set_metrics (session_set_id, metric_name, value)"
+                    " VALUES (?, 'Reps', ?)",
+                    (cur.lastrowid, rng.randint(5, 15)),
+                )
+    conn.commit()
+    conn.close()
+    return vars(size)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("db_path", type=Path)
+    for field, default in DEFAULT_SIZE.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=default)
+    args = parser.parse_args(argv)
+    if args.db_path.exists():
+        sys.exit(f"{args.db_path} already exists")
+
+    size = generate_database(
+        args.db_path, **{field: getattr(args, field) for field in DEFAULT_SIZE}
+    )
+    print(json.dumps(size))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,19 @@
 import sqlite3
+from array import array
+from collections.abc import Sequence
 from pathlib import Path
+from contextlib import contextmanager
+import threading
 import time
 import re
 import copy
+import datetime
 import json
+import sys
+import unicodedata
+from typing import NamedTuple
+
+import tracing
 
 # Number of sets each exercise defaults to when starting a workout
 DEFAULT_SETS_PER_EXERCISE = 3
@@ -14,6 +24,9 @@ DEFAULT_REST_DURATION = 120
 # Default path to the bundled SQLite database
 DEFAULT_DB_PATH = Path(__file__).resolve().parent / "data" / "workout.db"
 
+# Schema every database is brought up to the first time it is opened
+SCHEMA_PATH = Path(__file__).resolve().parent / "data" / "workout_schema.sql"
+
 # Will hold preset data loaded from the database. Each item is a dict with
 #   {'name': <preset name>,
 #    'exercises': [{'name': <exercise name>, 'sets': <number_of_sets>}, ...]}
@@ -44,37 +57,797 @@ def _from_db_timing(value: str | None) -> str | None:
     return _TIMING_FROM_DB.get(value, value)
 
 
-def load_workout_presets(db_path: Path = DEFAULT_DB_PATH):
-    """Load workout presets from the SQLite database into WORKOUT_PRESETS."""
-    global WORKOUT_PRESETS
+# PRAGMA profile applied to every connection opened by ``WorkoutDatabase``.
+# ``journal_mode`` is stored in the database file itself; the remaining
+# settings only last for the connection.  In WAL mode ``synchronous = NORMAL``
+# skips the fsync on each commit while still keeping the file consistent
+# after a crash.  ``wal_autocheckpoint`` is the WAL size (in pages) at which
+# SQLite copies the log back into the main file.  Pass ``pragmas`` to
+# ``WorkoutDatabase`` to override entries; a value of ``None`` skips the
+# PRAGMA entirely.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -8000,
+    "mmap_size": 32 * 1024 * 1024,
+    "wal_autocheckpoint": 1000,
+}
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, name FROM preset_presets WHERE deleted = 0 ORDER BY id"
-    )
-    presets = []
-    for preset_id, preset_name in cursor.fetchall():
+
+class WorkoutDatabase:
+    """Repository owning long-lived connections to a single database file.
+
+    Opening a new SQLite connection for every helper call is comparatively
+    expensive, so connections are kept open and reused.  SQLite connections
+    may only be used from the thread that created them, therefore the pool
+    holds one connection per thread.  Use :meth:`for_path` to obtain the
+    shared instance for a database file.
+    """
+
+    _instances: dict[str, "WorkoutDatabase"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self, db_path: Path = DEFAULT_DB_PATH, pragmas: dict | None = None
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self._local = threading.local()
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+        self._schema_checked = False
+
+    @classmethod
+    def for_path(cls, db_path: Path = DEFAULT_DB_PATH) -> "WorkoutDatabase":
+        """Return the shared repository for ``db_path``."""
+
+        key = str(Path(db_path).resolve())
+        db = cls._instances.get(key)
+        if db is None:
+            with cls._instances_lock:
+                db = cls._instances.get(key)
+                if db is None:
+                    db = cls(db_path)
+                    cls._instances[key] = db
+        return db
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every pooled connection of every repository."""
+
+        with cls._instances_lock:
+            instances = list(cls._instances.values())
+            cls._instances.clear()
+        for db in instances:
+            db.close()
+
+    def open_connection(self, bootstrap: bool = True) -> sqlite3.Connection:
+        """Return a new configured connection that is not pooled.
+
+        The caller owns the returned connection and must close it.  When
+        :mod:`tracing` is enabled the connection reports its statements to
+        :data:`tracing.PROFILER`.  The first connection of the repository
+        runs :func:`ensure_schema` unless ``bootstrap`` is false.
+        """
+
+        conn = tracing.connect(str(self.db_path))
+        for name, value in self.pragmas.items():
+            if value is not None:
+                conn.execute(f"PRAGMA {name} = {value}")
+        if bootstrap and not self._schema_checked:
+            with self._lock:
+                if not self._schema_checked:
+                    try:
+                        ensure_schema(conn)
+                    except BaseException:
+                        conn.close()
+                        raise
+                    self._schema_checked = True
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the pooled connection for the calling thread."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.open_connection()
+            self._local.conn = conn
+            with self._lock:
+                self._connections[threading.get_ident()] = conn
+        return conn
+
+    def cursor(self) -> sqlite3.Cursor:
+        """Return a cursor on the pooled connection for the calling thread."""
+
+        return self.connection().cursor()
+
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor and commit on success or roll back on error."""
+
+        conn = self.connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            cursor.close()
+
+    def checkpoint(self, mode: str = "PASSIVE") -> tuple[int, int, int]:
+        """Copy the write-ahead log back into the main database file.
+
+        ``mode`` is one of SQLite's checkpoint modes: ``PASSIVE`` never
+        waits for other connections, ``TRUNCATE`` additionally empties the
+        ``-wal`` file.  Returns ``(busy, log_pages, checkpointed_pages)``;
+        all three are ``-1`` when the database is not in WAL mode.
+        """
+
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+        row = self.connection().execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        return tuple(row)
+
+    def close(self) -> None:
+        """Close all pooled connections owned by this repository.
+
+        The write-ahead log is checkpointed first so the main database file
+        is complete on its own, e.g. for backups that copy only that file.
+        """
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                self.checkpoint("TRUNCATE")
+            except sqlite3.Error:
+                # Another connection is still reading; the log is folded
+                # back by the next checkpoint instead.
+                pass
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Connections created in another thread cannot be closed
+                # from here; they are released with their thread.
+                pass
+
+
+def get_database(db_path: Path = DEFAULT_DB_PATH) -> WorkoutDatabase:
+    """Return the shared :class:`WorkoutDatabase` for ``db_path``."""
+
+    return WorkoutDatabase.for_path(db_path)
+
+
+# Name of each table, index and trigger created by ``workout_schema.sql``
+_SCHEMA_OBJECT = re.compile(
+    r'^CREATE (?:UNIQUE |VIRTUAL )?(?:TABLE|INDEX|TRIGGER) IF NOT EXISTS "(\w+)"',
+    re.MULTILINE,
+)
+
+
+def _schema_statements(script: str) -> list[tuple[str, str]]:
+    """Return ``(object name, statement)`` for each CREATE in ``script``."""
+
+    statements = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            match = _SCHEMA_OBJECT.match(buffer.strip())
+            if match:
+                statements.append((match.group(1), buffer.strip()))
+            buffer = ""
+    return statements
+
+
+def ensure_schema(conn: sqlite3.Connection) -> list[str]:
+    """Create the tables, indexes and triggers missing from ``conn``.
+
+    Databases created before the session, search and progress tables were
+    added, including the bundled ``workout.db``, only hold the ``library_``
+    and ``preset_`` tables.  Every statement of ``workout_schema.sql`` uses
+    ``IF NOT EXISTS``, so the missing objects are created in one
+    transaction.  New search tables are filled from the library and new
+    progress tables are rebuilt from any saved sessions.  When SQLite lacks
+    FTS5 the search tables and their triggers are left out and
+    :func:`search_library` falls back to ``LIKE`` matching.
+
+    Returns the names of the objects that were created.
+    """
+
+    statements = _schema_statements(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+    def existing() -> set[str]:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+
+    if {name for name, _ in statements} <= existing():
+        return []
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        before = existing()
+        created = []
+        unavailable = []
+        for name, statement in statements:
+            if name in before or any(f'"{t}"' in statement for t in unavailable):
+                continue
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as exc:
+                if "fts5" not in str(exc):
+                    raise
+                unavailable.append(name)
+                continue
+            created.append(name)
+
+        cursor = conn.cursor()
+        for table in ("library_exercises", "library_metric_types"):
+            if f"{table}_fts" in created:
+                cursor.execute(
+                    f"INSERT INTO {table}_fts (rowid, name, description)"
+                    f" SELECT id, name, COALESCE(description, '') FROM {table}"
+                    " WHERE deleted = 0"
+                )
+        if "session_sessions" in before:
+            if any(table in created for table in _PROGRESS_TABLES.values()):
+                _rebuild_progress(cursor)
+            if "progress_personal_records" in created:
+                _rebuild_personal_records(cursor)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return created
+
+
+# Maximum number of bound parameters placed in a single ``IN (...)`` list.
+# Older SQLite builds (such as those shipped with Android) cap statements at
+# 999 variables.
+_MAX_IN_PARAMS = 500
+
+
+def _chunks(items: list, size: int = _MAX_IN_PARAMS):
+    """Yield consecutive slices of ``items`` holding at most ``size`` entries."""
+
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _placeholders(count: int) -> str:
+    """Return ``count`` comma separated SQL parameter placeholders."""
+
+    return ", ".join("?" * count)
+
+
+def _soft_delete_where_in(
+    cursor: sqlite3.Cursor, table: str, column: str, ids: list
+) -> None:
+    """Set ``deleted = 1`` on rows of ``table`` whose ``column`` is in ``ids``."""
+
+    for chunk in _chunks(ids):
         cursor.execute(
-            """
-            SELECT se.exercise_name, se.number_of_sets, se.rest_time
-            FROM preset_preset_sections s
-            JOIN preset_section_exercises se ON se.section_id = s.id
-            WHERE s.preset_id = ? AND s.deleted = 0 AND se.deleted = 0
-            ORDER BY s.position, se.position
-            """,
-            (preset_id,),
+            f"UPDATE {table} SET deleted = 1"
+            f" WHERE deleted = 0 AND {column} IN ({_placeholders(len(chunk))})",
+            chunk,
         )
-        exercises = [
-            {"name": row[0], "sets": row[1], "rest": row[2]}
-            for row in cursor.fetchall()
-        ]
-        presets.append({"name": preset_name, "exercises": exercises})
-    conn.close()
-    WORKOUT_PRESETS = presets
+
+
+def _resolve_library_exercises(
+    cursor: sqlite3.Cursor, names
+) -> dict[str, tuple[int, str]]:
+    """Return ``{name: (id, description)}`` for active library exercises.
+
+    The user-created variant wins when both copies of an exercise exist.
+    """
+
+    result: dict[str, tuple[int, str]] = {}
+    for chunk in _chunks(list(names)):
+        cursor.execute(
+            "SELECT name, id, description FROM library_exercises"
+            f" WHERE deleted = 0 AND name IN ({_placeholders(len(chunk))})"
+            " ORDER BY is_user_created DESC",
+            chunk,
+        )
+        for name, ex_id, desc in cursor.fetchall():
+            result.setdefault(name, (ex_id, desc or ""))
+    return result
+
+
+def _resolve_metric_types(
+    cursor: sqlite3.Cursor, names
+) -> dict[str, tuple[int, str, str, bool, str]]:
+    """Return ``{name: (id, type, input_timing, is_required, scope)}``.
+
+    The predefined metric type wins when both copies of a name exist.
+    """
+
+    result: dict[str, tuple[int, str, str, bool, str]] = {}
+    for chunk in _chunks(list(names)):
+        cursor.execute(
+            "SELECT name, id, type, input_timing, is_required, scope"
+            " FROM library_metric_types"
+            f" WHERE deleted = 0 AND name IN ({_placeholders(len(chunk))})"
+            " ORDER BY is_user_created, id",
+            chunk,
+        )
+        for name, *details in cursor.fetchall():
+            result.setdefault(name, tuple(details))
+    return result
+
+
+# Default for optional record fields; unset fields read as missing keys
+_UNSET = object()
+
+
+class Record:
+    """Base for the slotted records returned by the query helpers.
+
+    Fields live in ``__slots__`` rather than a per-row dict, so large result
+    lists allocate much less.  Records also support the mapping protocol
+    (``rec["name"]``, ``get``, ``update``, ``items``, ``**rec``, ``dict(rec)``
+    and ``==`` against a dict) so callers written for the plain dicts these
+    helpers used to return keep working.  A field that was never assigned
+    behaves like a missing key.  Only the declared fields can be set.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+
+    def keys(self) -> list[str]:
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def values(self) -> list:
+        return [getattr(self, key) for key in self.keys()]
+
+    def items(self) -> list[tuple]:
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, other=(), **fields) -> None:
+        pairs = other.items() if hasattr(other, "items") else other
+        for key, value in pairs:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def copy(self):
+        clone = object.__new__(type(self))
+        for key, value in self.items():
+            setattr(clone, key, value)
+        return clone
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Record, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+
+class MetricDef(Record):
+    """Metric definition from :func:`get_metrics_for_exercise` and friends."""
+
+    __slots__ = (
+        "name",
+        "type",
+        "input_timing",
+        "is_required",
+        "scope",
+        "description",
+        "values",
+        "is_user_created",
+        "enum_values_json",
+    )
+
+    def __init__(
+        self,
+        name,
+        type,
+        input_timing,
+        is_required,
+        scope,
+        description=_UNSET,
+        values=_UNSET,
+        is_user_created=_UNSET,
+        enum_values_json=_UNSET,
+    ):
+        self.name = name
+        self.type = type
+        self.input_timing = input_timing
+        self.is_required = is_required
+        self.scope = scope
+        if description is not _UNSET:
+            self.description = description
+        if values is not _UNSET:
+            self.values = values
+        if is_user_created is not _UNSET:
+            self.is_user_created = is_user_created
+        if enum_values_json is not _UNSET:
+            self.enum_values_json = enum_values_json
+
+
+class PresetExercise(Record):
+    """Exercise entry of a preset section."""
+
+    __slots__ = ("id", "name", "sets", "rest", "library_id")
+
+    def __init__(self, name, sets, rest, id=_UNSET, library_id=_UNSET):
+        if id is not _UNSET:
+            self.id = id
+        self.name = name
+        self.sets = sets
+        self.rest = rest
+        if library_id is not _UNSET:
+            self.library_id = library_id
+
+
+class PresetSection(Record):
+    """Named section of a preset holding a list of :class:`PresetExercise`."""
+
+    __slots__ = ("name", "exercises")
+
+    def __init__(self, name, exercises):
+        self.name = name
+        self.exercises = exercises
+
+
+class ExerciseRef(NamedTuple):
+    """``(name, is_user_created)`` pair identifying a library exercise.
+
+    Besides tuple unpacking and attribute access the fields can be read
+    by name, e.g. ``ref["name"]``.
+    """
+
+    name: str
+    is_user_created: bool
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in self._fields:
+                return getattr(self, key)
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+
+
+def load_workout_presets(
+    db_path: Path = DEFAULT_DB_PATH,
+    *,
+    names: list[str] | tuple[str, ...] | None = None,
+):
+    """Load workout presets from the SQLite database into WORKOUT_PRESETS.
+
+    All presets are built from a single query.  When ``names`` is given only
+    the matching presets are loaded and returned; ``WORKOUT_PRESETS`` is left
+    untouched in that case since it holds the full catalogue.
+    """
+    global WORKOUT_PRESETS
+
+    query = """
+        SELECT p.id, p.name, se.exercise_name, se.number_of_sets, se.rest_time
+        FROM preset_presets p
+        LEFT JOIN preset_preset_sections s
+               ON s.preset_id = p.id AND s.deleted = 0
+        LEFT JOIN preset_section_exercises se
+               ON se.section_id = s.id AND se.deleted = 0
+        WHERE p.deleted = 0
+    """
+    params: list = []
+    if names is not None:
+        names = list(names)
+        if not names:
+            return []
+        query += f" AND p.name IN ({', '.join('?' for _ in names)})"
+        params.extend(names)
+    query += " ORDER BY p.id, s.position, se.position"
+
+    cursor = get_database(db_path).cursor()
+    cursor.execute(query, params)
+    presets = []
+    current_id = None
+    exercises: list[dict] = []
+    for preset_id, preset_name, ex_name, sets, rest in cursor.fetchall():
+        if preset_id != current_id:
+            current_id = preset_id
+            exercises = []
+            presets.append({"name": preset_name, "exercises": exercises})
+        if ex_name is not None:
+            exercises.append(PresetExercise(ex_name, sets, rest))
+    if names is None:
+        WORKOUT_PRESETS = presets
     return presets
 
 
+def _normalise_search_text(text: str) -> str:
+    """Return ``text`` case-folded, without accents or punctuation."""
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w]+", " ", stripped).split())
+
+
+def _bigrams(token: str) -> frozenset:
+    padded = f" {token} "
+    return frozenset(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+class SearchIndex:
+    """Substring and typo-tolerant search over library entries.
+
+    Names are normalised once when the index is built.  A trigram index
+    narrows substring queries of three or more characters to a handful of
+    candidates.  A query that extends the previous one only re-checks the
+    previous matches, so typing character by character stays cheap.  With
+    ``fuzzy=True`` and fewer than ``FUZZY_MIN_RESULTS`` substring matches,
+    entries whose words are close to the query words (by bigram similarity)
+    are appended after the substring matches, best first.
+    """
+
+    # Minimum bigram similarity for a query word to match a name word.
+    FUZZY_THRESHOLD = 0.5
+    # Typo-tolerant matching only runs when substring search finds fewer.
+    FUZZY_MIN_RESULTS = 10
+
+    def __init__(self, items, name=lambda item: item[0], is_user_created=lambda item: item[1]):
+        self._items = list(items)
+        self._names = [_normalise_search_text(name(item)) for item in self._items]
+        self._flags = [bool(is_user_created(item)) for item in self._items]
+        self._trigrams: dict[str, set[int]] = {}
+        self._bigram_postings: dict[str, set[int]] = {}
+        self._token_grams: list[list[frozenset]] = []
+        for i, norm in enumerate(self._names):
+            for j in range(len(norm) - 2):
+                self._trigrams.setdefault(norm[j:j + 3], set()).add(i)
+            grams = [_bigrams(token) for token in norm.split()]
+            self._token_grams.append(grams)
+            for gram_set in grams:
+                for gram in gram_set:
+                    self._bigram_postings.setdefault(gram, set()).add(i)
+        self._last: tuple[str, list[int]] = ("", list(range(len(self._items))))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _substring_matches(self, query: str) -> list[int]:
+        last_query, last_matches = self._last
+        if last_query and last_query in query:
+            candidates = last_matches
+        elif len(query) >= 3:
+            postings = [
+                self._trigrams.get(query[j:j + 3], set()) for j in range(len(query) - 2)
+            ]
+            candidates = sorted(set.intersection(*sorted(postings, key=len)))
+        else:
+            candidates = range(len(self._items))
+        matches = [i for i in candidates if query in self._names[i]]
+        self._last = (query, matches)
+        return matches
+
+    def _fuzzy_matches(self, query: str, exclude: set[int]) -> list[int]:
+        query_grams = [_bigrams(token) for token in query.split()]
+        candidates: set[int] = set()
+        for gram_set in query_grams:
+            for gram in gram_set:
+                candidates |= self._bigram_postings.get(gram, set())
+        scored = []
+        for i in candidates - exclude:
+            total = 0.0
+            for q_grams in query_grams:
+                best = max(
+                    (
+                        2 * len(q_grams & grams) / (len(q_grams) + len(grams))
+                        for grams in self._token_grams[i]
+                    ),
+                    default=0.0,
+                )
+                if best < self.FUZZY_THRESHOLD:
+                    break
+                total += best
+            else:
+                scored.append((-total, i))
+        return [i for _, i in sorted(scored)]
+
+    def search(
+        self,
+        query: str = "",
+        *,
+        is_user_created: bool | None = None,
+        fuzzy: bool = False,
+        limit: int | None = None,
+    ) -> list:
+        """Return the entries matching ``query`` in index order.
+
+        ``is_user_created`` restricts results to user-created (``True``) or
+        bundled (``False``) entries.  ``limit`` caps the number of results.
+        """
+
+        norm = _normalise_search_text(query)
+        matches = self._substring_matches(norm) if norm else range(len(self._items))
+        if fuzzy and len(norm) >= 3 and len(matches) < self.FUZZY_MIN_RESULTS:
+            matches = list(matches) + self._fuzzy_matches(norm, set(matches))
+        if is_user_created is not None:
+            matches = [i for i in matches if self._flags[i] == is_user_created]
+        results = [self._items[i] for i in matches]
+        return results if limit is None else results[:limit]
+
+
+class LibraryCache:
+    """Shared in-memory copy of the exercise and metric type library.
+
+    Screens read the library through :meth:`exercises` and
+    :meth:`metric_types` instead of keeping private copies.  Each kind of
+    data (``"exercises"`` or ``"metrics"``) carries a version number.  The
+    library write helpers call :meth:`invalidate` after committing.  That
+    drops the cached rows, bumps the version and notifies every callback
+    registered with :meth:`subscribe`.  The returned lists are shared and
+    must not be modified by callers.
+    """
+
+    KINDS = ("exercises", "metrics")
+
+    _instances: dict[str, "LibraryCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH) -> None:
+        self.db_path = Path(db_path)
+        self.versions = {kind: 0 for kind in self.KINDS}
+        self._data: dict[tuple[str, bool | str], object] = {}
+        self._subscribers: list = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path: Path = DEFAULT_DB_PATH) -> "LibraryCache":
+        """Return the shared cache for ``db_path``."""
+
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            cache = cls._instances.get(key)
+            if cache is None:
+                cache = cls(db_path)
+                cls._instances[key] = cache
+        return cache
+
+    @classmethod
+    def clear_all(cls) -> None:
+        """Forget every cache instance and its subscribers."""
+
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    def _get(self, key: tuple[str, bool | str], loader):
+        with self._lock:
+            data = self._data.get(key)
+        if data is None:
+            data = loader()
+            with self._lock:
+                data = self._data.setdefault(key, data)
+        return data
+
+    def exercises(self, include_user_created: bool = True) -> list:
+        """Return the cached result of :func:`get_all_exercises`."""
+
+        return self._get(
+            ("exercises", include_user_created),
+            lambda: get_all_exercises(
+                self.db_path, include_user_created=include_user_created
+            ),
+        )
+
+    def metric_types(self, include_user_created: bool = True) -> list:
+        """Return the cached result of :func:`get_all_metric_types`."""
+
+        return self._get(
+            ("metrics", include_user_created),
+            lambda: get_all_metric_types(
+                self.db_path, include_user_created=include_user_created
+            ),
+        )
+
+    def exercise_index(self) -> SearchIndex:
+        """Return a :class:`SearchIndex` over all exercises."""
+
+        return self._get(("exercises", "index"), lambda: SearchIndex(self.exercises()))
+
+    def metric_index(self) -> SearchIndex:
+        """Return a :class:`SearchIndex` over all metric types."""
+
+        return self._get(
+            ("metrics", "index"),
+            lambda: SearchIndex(
+                self.metric_types(),
+                name=lambda m: m["name"],
+                is_user_created=lambda m: m["is_user_created"],
+            ),
+        )
+
+    def invalidate(self, kind: str) -> int:
+        """Drop cached ``kind`` data and return its new version."""
+
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown library kind: {kind}")
+        with self._lock:
+            for key in [k for k in self._data if k[0] == kind]:
+                del self._data[key]
+            self.versions[kind] += 1
+            version = self.versions[kind]
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(kind, version)
+        return version
+
+    def subscribe(self, callback) -> None:
+        """Call ``callback(kind, version)`` whenever the library changes."""
+
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Stop notifying ``callback``."""
+
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+def get_library_cache(db_path: Path = DEFAULT_DB_PATH) -> LibraryCache:
+    """Return the shared :class:`LibraryCache` for ``db_path``."""
+
+    return LibraryCache.for_path(db_path)
+
+
 def get_all_exercises(
     db_path: Path = DEFAULT_DB_PATH,
     *,
@@ -83,23 +856,22 @@ def get_all_exercises(
     """Return a list of all exercise names.
 
     If ``include_user_created`` is ``True`` the returned list will contain
-    ``(name, is_user_created)`` tuples instead of just names.
+    :class:`ExerciseRef` ``(name, is_user_created)`` tuples instead of just
+    names.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    cursor = get_database(db_path).cursor()
     if include_user_created:
         cursor.execute(
             "SELECT name, is_user_created FROM library_exercises WHERE deleted = 0 ORDER BY is_user_created, name"
         )
         rows = cursor.fetchall()
-        exercises = [(name, bool(flag)) for name, flag in rows]
+        exercises = [ExerciseRef(name, bool(flag)) for name, flag in rows]
     else:
         cursor.execute(
             "SELECT name FROM library_exercises WHERE deleted = 0 ORDER BY name"
         )
         exercises = [row[0] for row in cursor.fetchall()]
-    conn.close()
     return exercises
 
 
@@ -117,8 +889,7 @@ def get_exercise_details(
     Returns ``None`` if the exercise does not exist.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    cursor = get_database(db_path).cursor()
     if is_user_created is None:
         cursor.execute(
             "SELECT name, description, is_user_created"
@@ -133,7 +904,6 @@ def get_exercise_details(
             (exercise_name, int(is_user_created)),
         )
     row = cursor.fetchone()
-    conn.close()
     if not row:
         return None
     name, description, user_flag = row
@@ -152,104 +922,130 @@ def get_metrics_for_exercise(
 ) -> list:
     """Return metric definitions for ``exercise_name``.
 
-    Each item in the returned list is a dictionary with ``name`` and ``type``
-    keys. ``values`` will contain any allowed values for ``enum`` metrics.
+    Each item in the returned list is a :class:`MetricDef` with ``name`` and
+    ``type`` keys. ``values`` will contain any allowed values for ``enum``
+    metrics.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    return get_metrics_for_exercises(
+        [exercise_name],
+        db_path,
+        preset_name=preset_name,
+        is_user_created=is_user_created,
+    ).get(exercise_name, [])
 
-    if is_user_created is None:
-        cursor.execute(
-            "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0 ORDER BY is_user_created DESC LIMIT 1",
-            (exercise_name,),
-        )
-    else:
-        cursor.execute(
-            "SELECT id FROM library_exercises WHERE name = ? AND is_user_created = ? AND deleted = 0",
-            (exercise_name, int(is_user_created)),
-        )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        return []
-    exercise_id = row[0]
 
-    cursor.execute(
-        """
-        SELECT mt.id,
-               mt.name,
-               COALESCE(em.type, mt.type),
-               COALESCE(em.input_timing, mt.input_timing),
-               COALESCE(em.is_required, mt.is_required),
-               COALESCE(em.scope, mt.scope),
-               COALESCE(em.enum_values_json, mt.enum_values_json),
-               mt.description
-        FROM library_exercise_metrics em
-        JOIN library_metric_types mt ON mt.id = em.metric_type_id
-        WHERE em.exercise_id = ? AND em.deleted = 0 AND mt.deleted = 0
-        ORDER BY em.id
-        """,
-        (exercise_id,),
-    )
+def get_metrics_for_exercises(
+    exercise_names,
+    db_path: Path = DEFAULT_DB_PATH,
+    preset_name: str | None = None,
+    is_user_created: bool | None = None,
+) -> dict[str, list]:
+    """Return ``{exercise_name: metrics}`` for several exercises at once.
 
-    metrics = []
-    for (
-        metric_id,
-        name,
-        mtype,
-        input_timing,
-        is_required,
-        scope,
-        enum_json,
-        description,
-    ) in cursor.fetchall():
-        values = []
-        if mtype == "enum" and enum_json:
-            try:
-                values = json.loads(enum_json)
-            except Exception:
-                values = []
-        metrics.append(
-            {
-                "name": name,
-                "type": mtype,
-                "input_timing": input_timing,
-                "is_required": bool(is_required),
-                "scope": scope,
-                "description": description,
-                "values": values,
-            }
-        )
+    The metrics match :func:`get_metrics_for_exercise` but are resolved with
+    one query per step for all ``exercise_names`` together.  Exercises that
+    are not in the library map to an empty list.
+    """
 
-    # Apply overrides for a specific preset if requested
-    if preset_name:
+    names = list(dict.fromkeys(exercise_names))
+    cursor = get_database(db_path).cursor()
+
+    exercise_ids: dict[str, int] = {}
+    for chunk in _chunks(names):
+        sql = (
+            "SELECT name, id FROM library_exercises"
+            f" WHERE deleted = 0 AND name IN ({_placeholders(len(chunk))})"
+        )
+        params = list(chunk)
+        if is_user_created is not None:
+            sql += " AND is_user_created = ?"
+            params.append(int(is_user_created))
+        cursor.execute(sql + " ORDER BY is_user_created DESC", params)
+        for name, ex_id in cursor.fetchall():
+            exercise_ids.setdefault(name, ex_id)
+
+    by_id: dict[int, list] = {ex_id: [] for ex_id in exercise_ids.values()}
+    for chunk in _chunks(list(by_id)):
         cursor.execute(
-            """
-            SELECT sem.metric_name, sem.input_timing, sem.is_required, sem.scope
-            FROM preset_exercise_metrics sem
-            JOIN preset_section_exercises se ON sem.section_exercise_id = se.id
-            JOIN preset_preset_sections s ON se.section_id = s.id
-            JOIN preset_presets p ON s.preset_id = p.id
-            WHERE p.name = ? AND se.exercise_name = ?
-              AND sem.deleted = 0 AND se.deleted = 0 AND s.deleted = 0 AND p.deleted = 0
+            f"""
+            SELECT em.exercise_id,
+                   mt.name,
+                   COALESCE(em.type, mt.type),
+                   COALESCE(em.input_timing, mt.input_timing),
+                   COALESCE(em.is_required, mt.is_required),
+                   COALESCE(em.scope, mt.scope),
+                   COALESCE(em.enum_values_json, mt.enum_values_json),
+                   mt.description
+            FROM library_exercise_metrics em
+            JOIN library_metric_types mt ON mt.id = em.metric_type_id
+            WHERE em.exercise_id IN ({_placeholders(len(chunk))})
+              AND em.deleted = 0 AND mt.deleted = 0
+            ORDER BY em.id
             """,
-            (preset_name, exercise_name),
+            chunk,
         )
-        overrides = {
-            name: {
-                "input_timing": input_timing,
-                "is_required": bool(is_required),
-                "scope": scope,
-            }
-            for name, input_timing, is_required, scope in cursor.fetchall()
-        }
-        for m in metrics:
-            if m["name"] in overrides:
-                m.update(overrides[m["name"]])
+        for (
+            exercise_id,
+            name,
+            mtype,
+            input_timing,
+            is_required,
+            scope,
+            enum_json,
+            description,
+        ) in cursor.fetchall():
+            values = []
+            if mtype == "enum" and enum_json:
+                try:
+                    values = json.loads(enum_json)
+                except Exception:
+                    values = []
+            by_id[exercise_id].append(
+                MetricDef(
+                    name,
+                    mtype,
+                    input_timing,
+                    bool(is_required),
+                    scope,
+                    description=description,
+                    values=values,
+                )
+            )
+
+    result = {name: [] for name in names}
+    for name, ex_id in exercise_ids.items():
+        result[name] = by_id[ex_id]
+
+    # Apply overrides for a specific preset if requested
+    if preset_name and exercise_ids:
+        overrides: dict[str, dict] = {}
+        for chunk in _chunks(list(exercise_ids)):
+            cursor.execute(
+                f"""
+                SELECT se.exercise_name, sem.metric_name, sem.input_timing,
+                       sem.is_required, sem.scope
+                FROM preset_exercise_metrics sem
+                JOIN preset_section_exercises se ON sem.section_exercise_id = se.id
+                JOIN preset_preset_sections s ON se.section_id = s.id
+                JOIN preset_presets p ON s.preset_id = p.id
+                WHERE p.name = ? AND se.exercise_name IN ({_placeholders(len(chunk))})
+                  AND sem.deleted = 0 AND se.deleted = 0 AND s.deleted = 0 AND p.deleted = 0
+                """,
+                [preset_name, *chunk],
+            )
+            for ex_name, name, input_timing, is_required, scope in cursor.fetchall():
+                overrides.setdefault(ex_name, {})[name] = {
+                    "input_timing": input_timing,
+                    "is_required": bool(is_required),
+                    "scope": scope,
+                }
+        for ex_name, metric_overrides in overrides.items():
+            for m in result[ex_name]:
+                if m["name"] in metric_overrides:
+                    m.update(metric_overrides[m["name"]])
 
-    conn.close()
-    return metrics
+    return result
 
 
 def get_all_metric_types(
@@ -257,14 +1053,13 @@ def get_all_metric_types(
     *,
     include_user_created: bool = False,
 ) -> list:
-    """Return all metric type definitions from the database.
+    """Return all metric type definitions from the database as :class:`MetricDef` records.
 
-    If ``include_user_created`` is ``True`` the returned dictionaries include an
+    If ``include_user_created`` is ``True`` the returned records include an
     ``is_user_created`` flag.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    cursor = get_database(db_path).cursor()
     if include_user_created:
         cursor.execute(
             """
@@ -277,16 +1072,16 @@ def get_all_metric_types(
             """
         )
         metric_types = [
-            {
-                "name": name,
-                "type": mtype,
-                "input_timing": input_timing,
-                "is_required": bool(is_required),
-                "scope": scope,
-                "description": description,
-                "is_user_created": bool(flag),
-                "enum_values_json": enum_json,
-            }
+            MetricDef(
+                name,
+                mtype,
+                input_timing,
+                bool(is_required),
+                scope,
+                description=description,
+                is_user_created=bool(flag),
+                enum_values_json=enum_json,
+            )
             for (
                 name,
                 mtype,
@@ -309,29 +1104,125 @@ def get_all_metric_types(
             """
         )
         metric_types = [
-            {
-                "name": name,
-                "type": mtype,
-                "input_timing": input_timing,
-                "is_required": bool(is_required),
-                "scope": scope,
-                "description": description,
-                "enum_values_json": enum_json,
-            }
-            for (
+            MetricDef(
                 name,
                 mtype,
                 input_timing,
-                is_required,
+                bool(is_required),
                 scope,
-                description,
-                enum_json,
+                description=description,
+                enum_values_json=enum_json,
+            )
+            for (
+                name,
+                mtype,
+                input_timing,
+                is_required,
+                scope,
+                description,
+                enum_json,
             ) in cursor.fetchall()
         ]
-    conn.close()
     return metric_types
 
 
+# Source and full-text tables searched by ``search_library`` for each kind.
+_SEARCH_TABLES = {
+    "exercise": ("library_exercises", "library_exercises_fts"),
+    "metric": ("library_metric_types", "library_metric_types_fts"),
+}
+
+
+def _fts_query(query: str) -> str:
+    """Return an FTS5 expression matching every word of ``query`` as a prefix."""
+
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", query))
+
+
+def search_library(
+    query: str,
+    db_path: Path = DEFAULT_DB_PATH,
+    *,
+    kind: str | None = None,
+    limit: int = 20,
+    is_user_created: bool | None = None,
+) -> list[dict]:
+    """Return library entries matching ``query``, grouped by kind.
+
+    ``kind`` is ``"exercise"``, ``"metric"`` or ``None`` for both; with both,
+    exercises come before metrics.  Within a kind the best match comes
+    first.  ``bm25`` scores of different full-text tables are not
+    comparable, so kinds are never interleaved, and ``limit`` applies to
+    each kind.  Every word of ``query`` must appear as a word prefix in the
+    name or description; name hits rank above description hits.  Each
+    result is a dictionary with ``kind``, ``id``, ``name``, ``description``
+    and ``is_user_created`` keys.  When SQLite lacks FTS5 and the full-text
+    tables could not be created, a ``LIKE`` match on the name is used.
+    """
+
+    if kind is not None and kind not in _SEARCH_TABLES:
+        raise ValueError(f"Unknown library kind: {kind}")
+    match = _fts_query(query)
+    if not match or limit <= 0:
+        return []
+
+    cursor = get_database(db_path).cursor()
+    results = []
+    for name, (table, fts) in _SEARCH_TABLES.items():
+        if kind is not None and kind != name:
+            continue
+        fts_filter = user_filter = ""
+        user_params: list = []
+        if is_user_created is not None:
+            fts_filter = f" AND rowid IN (SELECT id FROM {table} WHERE is_user_created = ?)"
+            user_filter = " AND is_user_created = ?"
+            user_params.append(int(is_user_created))
+        try:
+            # Rank inside the full-text table first so only ``limit`` rows
+            # are joined back to the source table.
+            cursor.execute(
+                f"""
+                SELECT t.id, t.name, t.description, t.is_user_created, m.score
+                FROM (
+                    SELECT rowid, bm25({fts}, 10.0, 1.0) AS score
+                    FROM {fts}
+                    WHERE {fts} MATCH ?{fts_filter}
+                    ORDER BY score
+                    LIMIT ?
+                ) m
+                JOIN {table} t ON t.id = m.rowid
+                ORDER BY m.score
+                """,
+                [match, *user_params, limit],
+            )
+        except sqlite3.OperationalError as exc:
+            # Only a missing full-text table falls back; malformed queries
+            # and other database errors are reported to the caller.
+            if f"no such table: {fts}" not in str(exc):
+                raise
+            cursor.execute(
+                f"""
+                SELECT id, name, description, is_user_created, 0
+                FROM {table}
+                WHERE deleted = 0 AND name LIKE ?{user_filter}
+                ORDER BY name
+                LIMIT ?
+                """,
+                [f"%{query.strip()}%", *user_params, limit],
+            )
+        results.extend(
+            {
+                "kind": name,
+                "id": row_id,
+                "name": row_name,
+                "description": description or "",
+                "is_user_created": bool(flag),
+            }
+            for row_id, row_name, description, flag, _ in cursor.fetchall()
+        )
+    return results
+
+
 def get_metric_type_schema(
     db_path: Path = DEFAULT_DB_PATH,
 ) -> list:
@@ -342,13 +1233,11 @@ def get_metric_type_schema(
     constraint enumerating them.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    cursor = get_database(db_path).cursor()
     cursor.execute(
         "SELECT sql FROM sqlite_master WHERE type='table' AND name='library_metric_types'"
     )
     row = cursor.fetchone()
-    conn.close()
     if not row:
         return []
 
@@ -389,14 +1278,12 @@ def is_metric_type_user_created(
 ) -> bool:
     """Return ``True`` if ``metric_type_name`` is marked as user created."""
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    cursor = get_database(db_path).cursor()
     cursor.execute(
         "SELECT is_user_created FROM library_metric_types WHERE name = ?",
         (metric_type_name,),
     )
     row = cursor.fetchone()
-    conn.close()
     return bool(row[0]) if row else False
 
 
@@ -412,29 +1299,27 @@ def add_metric_type(
 ) -> int:
     """Insert a new metric type and return its ID."""
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO library_metric_types
-            (name, type, input_timing,
-             is_required, scope, description, is_user_created,
-             enum_values_json)
-        VALUES (?, ?, ?, ?, ?, ?, 1, ?)
-        """,
-        (
-            name,
-            mtype,
-            input_timing,
-            int(is_required),
-            scope,
-            description,
-            json.dumps(enum_values) if enum_values is not None else None,
-        ),
-    )
-    metric_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO library_metric_types
+                (name, type, input_timing,
+                 is_required, scope, description, is_user_created,
+                 enum_values_json)
+            VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+            """,
+            (
+                name,
+                mtype,
+                input_timing,
+                int(is_required),
+                scope,
+                description,
+                json.dumps(enum_values) if enum_values is not None else None,
+            ),
+        )
+        metric_id = cursor.lastrowid
+    get_library_cache(db_path).invalidate("metrics")
     return metric_id
 
 
@@ -445,39 +1330,34 @@ def add_metric_to_exercise(
 ) -> None:
     """Associate an existing metric type with an exercise."""
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0",
-        (exercise_name,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Exercise '{exercise_name}' not found")
-    exercise_id = row[0]
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0",
+            (exercise_name,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Exercise '{exercise_name}' not found")
+        exercise_id = row[0]
 
-    cursor.execute(
-        "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
-        (metric_type_name,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Metric type '{metric_type_name}' not found")
-    metric_id = row[0]
+        cursor.execute(
+            "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
+            (metric_type_name,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Metric type '{metric_type_name}' not found")
+        metric_id = row[0]
 
-    cursor.execute(
-        "SELECT 1 FROM library_exercise_metrics WHERE exercise_id = ? AND metric_type_id = ? AND deleted = 0",
-        (exercise_id, metric_id),
-    )
-    if cursor.fetchone() is None:
         cursor.execute(
-            "INSERT INTO library_exercise_metrics (exercise_id, metric_type_id) VALUES (?, ?)",
+            "SELECT 1 FROM library_exercise_metrics WHERE exercise_id = ? AND metric_type_id = ? AND deleted = 0",
             (exercise_id, metric_id),
         )
-        conn.commit()
-    conn.close()
+        if cursor.fetchone() is None:
+            cursor.execute(
+                "INSERT INTO library_exercise_metrics (exercise_id, metric_type_id) VALUES (?, ?)",
+                (exercise_id, metric_id),
+            )
 
 
 def remove_metric_from_exercise(
@@ -487,34 +1367,29 @@ def remove_metric_from_exercise(
 ) -> None:
     """Remove a metric association from an exercise."""
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0",
-        (exercise_name,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Exercise '{exercise_name}' not found")
-    exercise_id = row[0]
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0",
+            (exercise_name,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Exercise '{exercise_name}' not found")
+        exercise_id = row[0]
 
-    cursor.execute(
-        "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
-        (metric_type_name,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Metric type '{metric_type_name}' not found")
-    metric_id = row[0]
+        cursor.execute(
+            "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
+            (metric_type_name,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Metric type '{metric_type_name}' not found")
+        metric_id = row[0]
 
-    cursor.execute(
-        "UPDATE library_exercise_metrics SET deleted = 1 WHERE exercise_id = ? AND metric_type_id = ?",
-        (exercise_id, metric_id),
-    )
-    conn.commit()
-    conn.close()
+        cursor.execute(
+            "UPDATE library_exercise_metrics SET deleted = 1 WHERE exercise_id = ? AND metric_type_id = ? AND deleted = 0",
+            (exercise_id, metric_id),
+        )
 
 
 def update_metric_type(
@@ -531,51 +1406,48 @@ def update_metric_type(
 ) -> None:
     """Update fields of a metric type identified by ``metric_type_name``."""
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    if is_user_created is None:
-        cursor.execute(
-            "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0 ORDER BY is_user_created DESC LIMIT 1",
-            (metric_type_name,),
-        )
-    else:
-        cursor.execute(
-            "SELECT id FROM library_metric_types WHERE name = ? AND is_user_created = ? AND deleted = 0",
-            (metric_type_name, int(is_user_created)),
-        )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Metric type '{metric_type_name}' not found")
-    metric_id = row[0]
-    updates = []
-    params: list = []
-    if mtype is not None:
-        updates.append("type = ?")
-        params.append(mtype)
-    if input_timing is not None:
-        updates.append("input_timing = ?")
-        params.append(input_timing)
-    if is_required is not None:
-        updates.append("is_required = ?")
-        params.append(int(is_required))
-    if scope is not None:
-        updates.append("scope = ?")
-        params.append(scope)
-    if description is not None:
-        updates.append("description = ?")
-        params.append(description)
-    if enum_values is not None:
-        updates.append("enum_values_json = ?")
-        params.append(json.dumps(enum_values))
-    if updates:
-        params.append(metric_id)
-        cursor.execute(
-            f"UPDATE library_metric_types SET {', '.join(updates)} WHERE id = ?",
-            params,
-        )
-        conn.commit()
-    conn.close()
+    with get_database(db_path).transaction() as cursor:
+        if is_user_created is None:
+            cursor.execute(
+                "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0 ORDER BY is_user_created DESC LIMIT 1",
+                (metric_type_name,),
+            )
+        else:
+            cursor.execute(
+                "SELECT id FROM library_metric_types WHERE name = ? AND is_user_created = ? AND deleted = 0",
+                (metric_type_name, int(is_user_created)),
+            )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Metric type '{metric_type_name}' not found")
+        metric_id = row[0]
+        updates = []
+        params: list = []
+        if mtype is not None:
+            updates.append("type = ?")
+            params.append(mtype)
+        if input_timing is not None:
+            updates.append("input_timing = ?")
+            params.append(input_timing)
+        if is_required is not None:
+            updates.append("is_required = ?")
+            params.append(int(is_required))
+        if scope is not None:
+            updates.append("scope = ?")
+            params.append(scope)
+        if description is not None:
+            updates.append("description = ?")
+            params.append(description)
+        if enum_values is not None:
+            updates.append("enum_values_json = ?")
+            params.append(json.dumps(enum_values))
+        if updates:
+            params.append(metric_id)
+            cursor.execute(
+                f"UPDATE library_metric_types SET {', '.join(updates)} WHERE id = ?",
+                params,
+            )
+    get_library_cache(db_path).invalidate("metrics")
 
 
 def set_section_exercise_metric_override(
@@ -592,84 +1464,76 @@ def set_section_exercise_metric_override(
 ) -> None:
     """Apply an override for ``metric_type_name`` for a specific exercise in a preset."""
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT id FROM preset_presets WHERE name = ? AND deleted = 0", (preset_name,)
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Preset '{preset_name}' not found")
-    preset_id = row[0]
-
-    cursor.execute(
-        "SELECT id FROM preset_preset_sections WHERE preset_id = ? AND deleted = 0 ORDER BY position",
-        (preset_id,),
-    )
-    sections = cursor.fetchall()
-    if section_index < 0 or section_index >= len(sections):
-        conn.close()
-        raise IndexError("Section index out of range")
-    section_id = sections[section_index][0]
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            "SELECT id FROM preset_presets WHERE name = ? AND deleted = 0", (preset_name,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Preset '{preset_name}' not found")
+        preset_id = row[0]
 
-    cursor.execute(
-        "SELECT id, type FROM library_metric_types WHERE name = ? AND deleted = 0",
-        (metric_type_name,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Metric '{metric_type_name}' not found")
-    metric_type_id, def_type = row
+        cursor.execute(
+            "SELECT id FROM preset_preset_sections WHERE preset_id = ? AND deleted = 0 ORDER BY position",
+            (preset_id,),
+        )
+        sections = cursor.fetchall()
+        if section_index < 0 or section_index >= len(sections):
+            raise IndexError("Section index out of range")
+        section_id = sections[section_index][0]
 
-    cursor.execute(
-        """SELECT id FROM preset_section_exercises WHERE section_id = ? AND exercise_name = ? AND deleted = 0 ORDER BY position LIMIT 1""",
-        (section_id, exercise_name),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError("Exercise not part of section")
-    se_id = row[0]
+        cursor.execute(
+            "SELECT id, type FROM library_metric_types WHERE name = ? AND deleted = 0",
+            (metric_type_name,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Metric '{metric_type_name}' not found")
+        metric_type_id, def_type = row
 
-    cursor.execute(
-        "SELECT id FROM preset_exercise_metrics WHERE section_exercise_id = ? AND metric_name = ? AND deleted = 0",
-        (se_id, metric_type_name),
-    )
-    row = cursor.fetchone()
-    if row:
-        updates = ["input_timing = ?", "is_required = ?", "scope = ?"]
-        params = [input_timing, int(is_required), scope]
-        if enum_values is not None:
-            updates.append("enum_values_json = ?")
-            params.append(json.dumps(enum_values))
-        params.append(row[0])
         cursor.execute(
-            f"UPDATE preset_exercise_metrics SET {', '.join(updates)} WHERE id = ?",
-            params,
+            """SELECT id FROM preset_section_exercises WHERE section_id = ? AND exercise_name = ? AND deleted = 0 ORDER BY position LIMIT 1""",
+            (section_id, exercise_name),
         )
-    else:
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError("Exercise not part of section")
+        se_id = row[0]
+
         cursor.execute(
-            """
-            INSERT INTO preset_exercise_metrics
-                (section_exercise_id, metric_name, type, input_timing, is_required, scope, enum_values_json, library_metric_type_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                se_id,
-                metric_type_name,
-                def_type,
-                input_timing,
-                int(is_required),
-                scope,
-                json.dumps(enum_values) if enum_values is not None else None,
-                metric_type_id,
-            ),
+            "SELECT id FROM preset_exercise_metrics WHERE section_exercise_id = ? AND metric_name = ? AND deleted = 0",
+            (se_id, metric_type_name),
         )
-    conn.commit()
-    conn.close()
+        row = cursor.fetchone()
+        if row:
+            updates = ["input_timing = ?", "is_required = ?", "scope = ?"]
+            params = [input_timing, int(is_required), scope]
+            if enum_values is not None:
+                updates.append("enum_values_json = ?")
+                params.append(json.dumps(enum_values))
+            params.append(row[0])
+            cursor.execute(
+                f"UPDATE preset_exercise_metrics SET {', '.join(updates)} WHERE id = ?",
+                params,
+            )
+        else:
+            cursor.execute(
+                """
+                INSERT INTO preset_exercise_metrics
+                    (section_exercise_id, metric_name, type, input_timing, is_required, scope, enum_values_json, library_metric_type_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    se_id,
+                    metric_type_name,
+                    def_type,
+                    input_timing,
+                    int(is_required),
+                    scope,
+                    json.dumps(enum_values) if enum_values is not None else None,
+                    metric_type_id,
+                ),
+            )
 
 
 def set_exercise_metric_override(
@@ -691,84 +1555,174 @@ def set_exercise_metric_override(
     chosen when it exists.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    with get_database(db_path).transaction() as cursor:
+        if is_user_created is None:
+            cursor.execute(
+                "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0 ORDER BY is_user_created DESC LIMIT 1",
+                (exercise_name,),
+            )
+        else:
+            cursor.execute(
+                "SELECT id FROM library_exercises WHERE name = ? AND is_user_created = ? AND deleted = 0",
+                (exercise_name, int(is_user_created)),
+            )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Exercise '{exercise_name}' not found")
+        exercise_id = row[0]
 
-    if is_user_created is None:
         cursor.execute(
-            "SELECT id FROM library_exercises WHERE name = ? AND deleted = 0 ORDER BY is_user_created DESC LIMIT 1",
-            (exercise_name,),
+            "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
+            (metric_type_name,),
         )
-    else:
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Metric '{metric_type_name}' not found")
+        metric_type_id = row[0]
+
         cursor.execute(
-            "SELECT id FROM library_exercises WHERE name = ? AND is_user_created = ? AND deleted = 0",
-            (exercise_name, int(is_user_created)),
+            "SELECT id FROM library_exercise_metrics WHERE exercise_id = ? AND metric_type_id = ? AND deleted = 0",
+            (exercise_id, metric_type_id),
         )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Exercise '{exercise_name}' not found")
-    exercise_id = row[0]
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError("Exercise is not associated with the metric")
+        em_id = row[0]
+
+        updates = []
+        params: list = []
+        if mtype is not None:
+            updates.append("type = ?")
+            params.append(mtype)
+        if input_timing is not None:
+            updates.append("input_timing = ?")
+            params.append(input_timing)
+        if is_required is not None:
+            updates.append("is_required = ?")
+            params.append(int(is_required))
+        if scope is not None:
+            updates.append("scope = ?")
+            params.append(scope)
+        if enum_values is not None:
+            updates.append("enum_values_json = ?")
+            params.append(json.dumps(enum_values))
 
-    cursor.execute(
-        "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
-        (metric_type_name,),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError(f"Metric '{metric_type_name}' not found")
-    metric_type_id = row[0]
+        if not updates:
+            cursor.execute(
+                """
+                UPDATE library_exercise_metrics
+                   SET type = NULL,
+                       input_timing = NULL,
+                       is_required = NULL,
+                       scope = NULL,
+                       enum_values_json = NULL
+                 WHERE id = ?
+                """,
+                (em_id,),
+            )
+        else:
+            params.append(em_id)
+            cursor.execute(
+                f"UPDATE library_exercise_metrics SET {', '.join(updates)} WHERE id = ?",
+                params,
+            )
 
-    cursor.execute(
-        "SELECT id FROM library_exercise_metrics WHERE exercise_id = ? AND metric_type_id = ? AND deleted = 0",
-        (exercise_id, metric_type_id),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        raise ValueError("Exercise is not associated with the metric")
-    em_id = row[0]
 
-    updates = []
-    params: list = []
-    if mtype is not None:
-        updates.append("type = ?")
-        params.append(mtype)
-    if input_timing is not None:
-        updates.append("input_timing = ?")
-        params.append(input_timing)
-    if is_required is not None:
-        updates.append("is_required = ?")
-        params.append(int(is_required))
-    if scope is not None:
-        updates.append("scope = ?")
-        params.append(scope)
-    if enum_values is not None:
-        updates.append("enum_values_json = ?")
-        params.append(json.dumps(enum_values))
-
-    if not updates:
-        cursor.execute(
-            """
-            UPDATE library_exercise_metrics
-               SET type = NULL,
-                   input_timing = NULL,
-                   is_required = NULL,
-                   scope = NULL,
-                   enum_values_json = NULL
-             WHERE id = ?
-            """,
-            (em_id,),
-        )
-    else:
-        params.append(em_id)
-        cursor.execute(
-            f"UPDATE library_exercise_metrics SET {', '.join(updates)} WHERE id = ?",
-            params,
-        )
-    conn.commit()
-    conn.close()
+class SetResults(Sequence):
+    """Compact store of the metric values recorded for an exercise's sets.
+
+    Keeping one dict per set repeats every metric name and boxes every
+    number.  Here each metric name is stored once per exercise and values
+    are kept in one column per metric: an ``array`` of 64-bit integers or
+    doubles while every value has that type, otherwise a plain list.  The
+    metric names present in a set, in their original order, are interned
+    as a layout so sets recorded with the same metrics share it.
+
+    Indexing returns the set as a new ``dict``, so code written for a list
+    of dicts keeps working; changes to that dict are not stored back.
+    """
+
+    __slots__ = ("_names", "_index", "_columns", "_layouts", "_layout_ids", "_set_layouts")
+
+    def __init__(self, results=()):
+        self._names: list[str] = []
+        self._index: dict[str, int] = {}
+        self._columns: list = []
+        self._layouts: list[tuple[int, ...]] = []
+        self._layout_ids: dict[tuple[int, ...], int] = {}
+        self._set_layouts = array("I")
+        for metrics in results:
+            self.append(metrics)
+
+    @property
+    def metric_names(self) -> tuple[str, ...]:
+        """Return every metric name recorded for any set, in first-seen order."""
+
+        return tuple(self._names)
+
+    def append(self, metrics: dict) -> None:
+        """Store the ``metrics`` of the next set."""
+
+        set_index = len(self._set_layouts)
+        layout = []
+        for name, value in metrics.items():
+            col = self._index.get(name)
+            if col is None:
+                col = self._index[name] = len(self._names)
+                self._names.append(name)
+                if type(value) is int:
+                    self._columns.append(array("q"))
+                elif type(value) is float:
+                    self._columns.append(array("d"))
+                else:
+                    self._columns.append([])
+            column = self._columns[col]
+            if len(column) < set_index:
+                # Sets without this metric leave a placeholder so values
+                # stay aligned with the set index.
+                column.extend([0] * (set_index - len(column)))
+            if isinstance(column, array):
+                fits = type(value) is (int if column.typecode == "q" else float)
+                try:
+                    if fits:
+                        column.append(value)
+                        layout.append(col)
+                        continue
+                except OverflowError:
+                    pass
+                column = self._columns[col] = column.tolist()
+            column.append(value)
+            layout.append(col)
+
+        key = tuple(layout)
+        layout_id = self._layout_ids.get(key)
+        if layout_id is None:
+            layout_id = self._layout_ids[key] = len(self._layouts)
+            self._layouts.append(key)
+        self._set_layouts.append(layout_id)
+
+    def __len__(self) -> int:
+        return len(self._set_layouts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("set index out of range")
+        return {
+            self._names[col]: self._columns[col][index]
+            for col in self._layouts[self._set_layouts[index]]
+        }
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (SetResults, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SetResults({list(self)!r})"
 
 
 class WorkoutSession:
@@ -776,9 +1730,11 @@ class WorkoutSession:
 
     The session loads the selected preset from the database when it is
     created.  While the workout is running it manages state in memory and
-    never writes to the database.  It may read additional information from
-    the database if needed but will not modify any tables until the workout
-    is finished, at which point the completed session is saved.
+    does not modify the preset or library tables.  When created with
+    ``journal=True`` every completed set is appended to
+    ``session_set_journal`` so an interrupted workout can be restored with
+    :meth:`resume`.  Once the workout is finished :meth:`save` writes the
+    completed session to the ``session_`` tables in a single transaction.
     """
 
     def __init__(
@@ -786,33 +1742,172 @@ class WorkoutSession:
         preset_name: str,
         db_path: Path = DEFAULT_DB_PATH,
         rest_duration: int = DEFAULT_REST_DURATION,
+        *,
+        journal: bool = False,
     ):
         """Load ``preset_name`` from ``db_path`` and prepare the session."""
 
-        self.preset_name = preset_name
-        presets = load_workout_presets(db_path)
+        presets = load_workout_presets(db_path, names=[preset_name])
         preset = next((p for p in presets if p["name"] == preset_name), None)
         if not preset:
             raise ValueError(f"Preset '{preset_name}' not found")
 
+        self._init_state(
+            preset_name,
+            db_path,
+            [
+                {
+                    "name": ex["name"],
+                    "sets": ex.get("sets", DEFAULT_SETS_PER_EXERCISE),
+                    "rest": ex.get("rest", DEFAULT_REST_DURATION),
+                }
+                for ex in preset["exercises"]
+            ],
+            rest_duration,
+            time.time(),
+        )
+        if journal:
+            self.start_journal()
+
+    def _init_state(
+        self,
+        preset_name: str,
+        db_path: Path,
+        exercises: list[dict],
+        rest_duration: int,
+        start_time: float,
+    ) -> None:
+        """Initialise the in-memory state shared by ``__init__`` and ``resume``."""
+
+        self.preset_name = preset_name
+        self.db_path = Path(db_path)
+        self.session_id: int | None = None
+        self.saved = False
+
         self.exercises = [
-            {
-                "name": ex["name"],
-                "sets": ex.get("sets", DEFAULT_SETS_PER_EXERCISE),
-                "results": [],
-            }
-            for ex in preset["exercises"]
+            {**ex, "results": SetResults(), "completed_at": array("d")}
+            for ex in exercises
         ]
 
         self.current_exercise = 0
         self.current_set = 0
-        self.start_time = time.time()
+        self.start_time = start_time
         self.end_time = None
 
         self.rest_duration = rest_duration
         self.last_set_time = self.start_time
         self.rest_target_time = self.last_set_time + self.rest_duration
 
+        # Metric definitions cannot change while the workout runs, so they
+        # are resolved once for every exercise up front.
+        self.metric_plan = get_metrics_for_exercises(
+            [ex["name"] for ex in self.exercises],
+            self.db_path,
+            preset_name=preset_name,
+        )
+
+        # Personal records are loaded once so every set is checked against
+        # them in memory; improvements are written by :meth:`save`.
+        self.records = _load_personal_records(
+            get_database(self.db_path).cursor(), [ex["name"] for ex in self.exercises]
+        )
+        self.new_records: list[dict] = []
+        self._record_updates: dict[tuple[str, str, int], tuple[float, float]] = {}
+
+    @classmethod
+    def resume(
+        cls,
+        session_id: int,
+        db_path: Path = DEFAULT_DB_PATH,
+    ) -> "WorkoutSession":
+        """Restore an unfinished journaled session from ``db_path``.
+
+        The exercise plan is read from ``session_exercises`` and every
+        journaled set is replayed so the session continues where it stopped.
+        """
+
+        cursor = get_database(db_path).cursor()
+        cursor.execute(
+            "SELECT preset_name, started_at, rest_duration FROM session_sessions"
+            " WHERE id = ? AND status = 'in_progress' AND deleted = 0",
+            (session_id,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"No unfinished session with id {session_id}")
+        preset_name, started_at, rest_duration = row
+
+        cursor.execute(
+            "SELECT exercise_name, number_of_sets, rest_time FROM session_exercises"
+            " WHERE session_id = ? AND deleted = 0 ORDER BY position",
+            (session_id,),
+        )
+        exercises = [
+            {"name": name, "sets": sets, "rest": rest}
+            for name, sets, rest in cursor.fetchall()
+        ]
+
+        session = cls.__new__(cls)
+        session._init_state(preset_name, db_path, exercises, rest_duration, started_at)
+        session.session_id = session_id
+
+        cursor.execute(
+            "SELECT metrics_json, recorded_at FROM session_set_journal"
+            " WHERE session_id = ? ORDER BY id",
+            (session_id,),
+        )
+        for metrics_json, recorded_at in cursor.fetchall():
+            session._advance(json.loads(metrics_json), recorded_at)
+            session.last_set_time = recorded_at
+        session.rest_target_time = session.last_set_time + session.rest_duration
+        return session
+
+    def start_journal(self) -> int:
+        """Create the session rows so completed sets can be journaled.
+
+        Returns the ``session_sessions`` id.  Calling this more than once is
+        harmless.
+        """
+
+        if self.session_id is None:
+            with get_database(self.db_path).transaction() as cursor:
+                self.session_id = self._insert_session(cursor)
+        return self.session_id
+
+    def _insert_session(self, cursor: sqlite3.Cursor) -> int:
+        """Insert the session and its exercise plan and return the new id."""
+
+        cursor.execute(
+            "SELECT id FROM preset_presets WHERE name = ? AND deleted = 0",
+            (self.preset_name,),
+        )
+        row = cursor.fetchone()
+        cursor.execute(
+            "INSERT INTO session_sessions (preset_id, preset_name, started_at, rest_duration)"
+            " VALUES (?, ?, ?, ?)",
+            (row[0] if row else None, self.preset_name, self.start_time, self.rest_duration),
+        )
+        session_id = cursor.lastrowid
+
+        library = _resolve_library_exercises(cursor, {ex["name"] for ex in self.exercises})
+        cursor.executemany(
+            "INSERT INTO session_exercises"
+            " (session_id, library_exercise_id, exercise_name, position, number_of_sets, rest_time)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    session_id,
+                    library.get(ex["name"], (None, ""))[0],
+                    ex["name"],
+                    pos,
+                    ex["sets"],
+                    ex.get("rest"),
+                )
+                for pos, ex in enumerate(self.exercises)
+            ],
+        )
+        return session_id
+
     def mark_set_completed(self) -> None:
         """Record the completion time for the current set."""
         self.last_set_time = time.time()
@@ -856,14 +1951,48 @@ class WorkoutSession:
             return f"{ex['name']} set {set_idx + 1} of {ex['sets']}"
         return ""
 
+    def metrics_for(self, exercise_name: str, input_timing: str | None = None) -> list:
+        """Return the precomputed metrics of ``exercise_name``.
+
+        When ``input_timing`` is given only metrics entered at that time are
+        returned.  No database access is performed.
+        """
+
+        metrics = self.metric_plan.get(exercise_name, [])
+        if input_timing is None:
+            return list(metrics)
+        return [m for m in metrics if m.get("input_timing") == input_timing]
+
     def record_metrics(self, metrics):
         if self.current_exercise >= len(self.exercises):
             if self.end_time is None:
                 self.end_time = time.time()
             return True
 
+        now = time.time()
+        if self.session_id is not None and not self.saved:
+            with get_database(self.db_path).transaction() as cursor:
+                cursor.execute(
+                    "INSERT INTO session_set_journal"
+                    " (session_id, exercise_position, set_number, metrics_json, recorded_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        self.session_id,
+                        self.current_exercise,
+                        self.current_set,
+                        json.dumps(metrics),
+                        now,
+                    ),
+                )
+        return self._advance(metrics, now)
+
+    def _advance(self, metrics, completed_at: float) -> bool:
+        """Store ``metrics`` for the current set and move to the next one."""
+
         ex = self.exercises[self.current_exercise]
         ex["results"].append(metrics)
+        ex["completed_at"].append(completed_at)
+        self.new_records = self._check_records(ex["name"], metrics, completed_at)
         self.current_set += 1
 
         if self.current_set >= ex["sets"]:
@@ -871,11 +2000,140 @@ class WorkoutSession:
             self.current_exercise += 1
 
         if self.current_exercise >= len(self.exercises):
-            self.end_time = time.time()
+            self.end_time = completed_at
             return True
 
         return False
 
+    def _check_records(self, exercise_name: str, metrics, completed_at: float) -> list[dict]:
+        """Update the in-memory records with one set and return those it beat.
+
+        Each returned item has ``exercise``, ``metric``, ``rep_range``,
+        ``value`` and ``previous`` keys; ``previous`` is ``None`` the first
+        time a metric is recorded.
+        """
+
+        beaten = []
+        for metric, rep_range, value in _set_records(metrics):
+            key = (exercise_name, metric, rep_range)
+            previous = self.records.get(key)
+            if previous is not None and value <= previous:
+                continue
+            self.records[key] = value
+            self._record_updates[key] = (value, completed_at)
+            beaten.append(
+                {
+                    "exercise": exercise_name,
+                    "metric": metric,
+                    "rep_range": rep_range,
+                    "value": value,
+                    "previous": previous,
+                }
+            )
+        return beaten
+
+    def save(self) -> int:
+        """Persist the session to the ``session_`` tables and return its id.
+
+        The session rows, the removal of its journal entries and the
+        updates of the progress aggregates and personal records share one
+        transaction, so a failure leaves nothing half saved and the session
+        can be saved again.  Saving an already saved session is a no-op.
+        """
+
+        if self.saved and self.session_id is not None:
+            return self.session_id
+        if self.end_time is None:
+            self.end_time = time.time()
+
+        with get_database(self.db_path).transaction() as cursor:
+            session_id = self.session_id
+            if session_id is None:
+                session_id = self._insert_session(cursor)
+            cursor.execute(
+                "UPDATE session_sessions SET status = 'completed', ended_at = ? WHERE id = ?",
+                (self.end_time, session_id),
+            )
+            cursor.execute(
+                "SELECT id FROM session_exercises WHERE session_id = ? AND deleted = 0 ORDER BY position",
+                (session_id,),
+            )
+            exercise_ids = [r[0] for r in cursor.fetchall()]
+
+            cursor.executemany(
+                "INSERT INTO session_sets (session_exercise_id, set_number, completed_at)"
+                " VALUES (?, ?, ?)",
+                [
+                    (exercise_ids[pos], set_number, completed_at)
+                    for pos, ex in enumerate(self.exercises)
+                    for set_number, completed_at in enumerate(ex["completed_at"], 1)
+                ],
+            )
+            set_ids: dict[tuple[int, int], int] = {}
+            for chunk in _chunks(exercise_ids):
+                cursor.execute(
+                    "SELECT id, session_exercise_id, set_number FROM session_sets"
+                    f" WHERE deleted = 0 AND session_exercise_id IN ({_placeholders(len(chunk))})",
+                    chunk,
+                )
+                for set_id, se_id, set_number in cursor.fetchall():
+                    set_ids[(se_id, set_number)] = set_id
+
+            metric_ids: dict[str, int] = {}
+            names = list(
+                {name for ex in self.exercises for name in ex["results"].metric_names}
+            )
+            for chunk in _chunks(names):
+                cursor.execute(
+                    "SELECT name, id FROM library_metric_types"
+                    f" WHERE deleted = 0 AND name IN ({_placeholders(len(chunk))})"
+                    " ORDER BY is_user_created DESC",
+                    chunk,
+                )
+                for name, mt_id in cursor.fetchall():
+                    metric_ids.setdefault(name, mt_id)
+
+            cursor.executemany(
+                "INSERT INTO session_set_metrics"
+                " (session_set_id, library_metric_type_id, metric_name, value)"
+                " VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        set_ids[(exercise_ids[pos], set_number)],
+                        metric_ids.get(name),
+                        name,
+                        value,
+                    )
+                    for pos, ex in enumerate(self.exercises)
+                    for set_number, result in enumerate(ex["results"], 1)
+                    for name, value in result.items()
+                ],
+            )
+            cursor.execute(
+                "DELETE FROM session_set_journal WHERE session_id = ?",
+                (session_id,),
+            )
+            _write_progress(
+                cursor,
+                _aggregate_progress(
+                    (session_id, ex["name"], completed_at, result)
+                    for ex in self.exercises
+                    for result, completed_at in zip(ex["results"], ex["completed_at"])
+                ),
+            )
+            _write_personal_records(
+                cursor,
+                {
+                    key: (value, session_id, achieved_at)
+                    for key, (value, achieved_at) in self._record_updates.items()
+                },
+            )
+
+        # Only adopt the new id once the transaction has committed.
+        self.session_id = session_id
+        self.saved = True
+        return session_id
+
     def adjust_rest_timer(self, seconds: int) -> None:
         """Adjust the target time for the current rest period."""
         now = time.time()
@@ -909,6 +2167,411 @@ class WorkoutSession:
         return "\n".join(lines)
 
 
+def find_unfinished_sessions(db_path: Path = DEFAULT_DB_PATH) -> list[dict]:
+    """Return journaled sessions that were never saved, newest first.
+
+    Each item has ``id``, ``preset_name`` and ``started_at`` keys and can be
+    passed to :meth:`WorkoutSession.resume`.
+    """
+
+    cursor = get_database(db_path).cursor()
+    cursor.execute(
+        "SELECT id, preset_name, started_at FROM session_sessions"
+        " WHERE status = 'in_progress' AND deleted = 0 ORDER BY started_at DESC"
+    )
+    return [
+        {"id": session_id, "preset_name": name, "started_at": started_at}
+        for session_id, name, started_at in cursor.fetchall()
+    ]
+
+
+def discard_unfinished_session(session_id: int, db_path: Path = DEFAULT_DB_PATH) -> None:
+    """Drop an unfinished session so it is no longer offered for resuming.
+
+    The session and its exercise plan are soft deleted and its journal is
+    removed; :mod:`maintenance` purges the remaining rows.
+    """
+
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            "UPDATE session_sessions SET deleted = 1"
+            " WHERE id = ? AND status = 'in_progress'",
+            (session_id,),
+        )
+        if cursor.rowcount:
+            cursor.execute(
+                "UPDATE session_exercises SET deleted = 1 WHERE session_id = ?",
+                (session_id,),
+            )
+            cursor.execute(
+                "DELETE FROM session_set_journal WHERE session_id = ?",
+                (session_id,),
+            )
+
+
+# Metrics whose values feed the progress aggregates, compared
+# case-insensitively with the recorded metric names.
+PROGRESS_REPS_METRIC = "Reps"
+PROGRESS_WEIGHT_METRIC = "Weight"
+
+# Aggregate table for each supported progress period
+_PROGRESS_TABLES = {
+    "day": "progress_exercise_daily",
+    "week": "progress_exercise_weekly",
+}
+
+_PROGRESS_COLUMNS = (
+    "sessions",
+    "sets",
+    "reps",
+    "tonnage",
+    "best_weight",
+    "best_reps",
+    "best_e1rm",
+)
+
+
+def _as_number(value) -> float | None:
+    """Return ``value`` as a float, or ``None`` when it is not numeric."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def estimated_one_rep_max(weight: float | None, reps: float | None) -> float:
+    """Return the Epley estimate of the one-rep max, ``0`` without a load."""
+
+    if not weight or not reps or weight <= 0 or reps <= 0:
+        return 0.0
+    if reps == 1:
+        return weight
+    return weight * (1 + reps / 30)
+
+
+def _progress_periods(timestamp: float) -> dict[str, str]:
+    """Return the start date of each progress period containing ``timestamp``."""
+
+    day = datetime.date.fromtimestamp(timestamp)
+    week = day - datetime.timedelta(days=day.weekday())
+    return {"day": day.isoformat(), "week": week.isoformat()}
+
+
+def _aggregate_progress(rows) -> dict[tuple[str, str, str], dict]:
+    """Fold per-set ``rows`` into progress aggregates.
+
+    ``rows`` yields ``(session_id, exercise_name, completed_at, metrics)``
+    where ``metrics`` maps metric names to recorded values.  The result is
+    keyed by ``(period, exercise_name, period_start)``.
+    """
+
+    reps_key = PROGRESS_REPS_METRIC.casefold()
+    weight_key = PROGRESS_WEIGHT_METRIC.casefold()
+    totals: dict[tuple[str, str, str], dict] = {}
+    for session_id, name, completed_at, metrics in rows:
+        reps = weight = None
+        for metric, value in metrics.items():
+            key = metric.casefold()
+            if key == reps_key:
+                reps = _as_number(value)
+            elif key == weight_key:
+                weight = _as_number(value)
+        e1rm = estimated_one_rep_max(weight, reps)
+        for period, start in _progress_periods(completed_at).items():
+            entry = totals.get((period, name, start))
+            if entry is None:
+                entry = totals[(period, name, start)] = {
+                    "session_ids": set(),
+                    "sets": 0,
+                    "reps": 0.0,
+                    "tonnage": 0.0,
+                    "best_weight": None,
+                    "best_reps": None,
+                    "best_e1rm": 0.0,
+                }
+            entry["session_ids"].add(session_id)
+            entry["sets"] += 1
+            entry["reps"] += reps or 0
+            if reps and weight:
+                entry["tonnage"] += reps * weight
+            empty = entry["best_reps"] is None and entry["best_weight"] is None
+            best = (entry["best_e1rm"], entry["best_reps"] or 0)
+            if (reps or weight) and (empty or (e1rm, reps or 0) > best):
+                entry["best_weight"] = weight
+                entry["best_reps"] = reps
+                entry["best_e1rm"] = e1rm
+    return totals
+
+
+def _write_progress(cursor: sqlite3.Cursor, totals: dict) -> None:
+    """Merge aggregates from :func:`_aggregate_progress` into the tables.
+
+    Counters are added to the stored row; the best set is replaced only
+    when the new one ranks higher, so saving a session touches one row per
+    exercise and period instead of re-reading history.
+    """
+
+    for period, table in _PROGRESS_TABLES.items():
+        params = [
+            (
+                name,
+                start,
+                len(entry["session_ids"]),
+                entry["sets"],
+                entry["reps"],
+                entry["tonnage"],
+                entry["best_weight"],
+                entry["best_reps"],
+                entry["best_e1rm"],
+            )
+            for (entry_period, name, start), entry in totals.items()
+            if entry_period == period
+        ]
+        if not params:
+            continue
+        better = (
+            f"({table}.best_weight IS NULL AND {table}.best_reps IS NULL"
+            f" OR excluded.best_e1rm > {table}.best_e1rm"
+            f" OR (excluded.best_e1rm = {table}.best_e1rm"
+            f" AND COALESCE(excluded.best_reps, 0) > COALESCE({table}.best_reps, 0)))"
+        )
+        cursor.executemany(
+            f"INSERT INTO {table} (exercise_name, period_start, {', '.join(_PROGRESS_COLUMNS)})"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (exercise_name, period_start) DO UPDATE SET"
+            f" sessions = {table}.sessions + excluded.sessions,"
+            f" sets = {table}.sets + excluded.sets,"
+            f" reps = {table}.reps + excluded.reps,"
+            f" tonnage = {table}.tonnage + excluded.tonnage,"
+            f" best_weight = CASE WHEN {better} THEN excluded.best_weight ELSE {table}.best_weight END,"
+            f" best_reps = CASE WHEN {better} THEN excluded.best_reps ELSE {table}.best_reps END,"
+            f" best_e1rm = MAX({table}.best_e1rm, excluded.best_e1rm)",
+            params,
+        )
+
+
+def _history_set_rows(cursor: sqlite3.Cursor, session_ids: list[int] | None = None):
+    """Yield ``(session_id, exercise_name, completed_at, metrics)`` per saved set.
+
+    Only completed, non-deleted sessions are read.  ``session_ids``
+    restricts the rows to those sessions.
+    """
+
+    sql = (
+        "SELECT ss.id, se.exercise_name, st.id, COALESCE(st.completed_at, ss.started_at),"
+        " m.metric_name, m.value"
+        " FROM session_sessions ss"
+        " JOIN session_exercises se ON se.session_id = ss.id AND se.deleted = 0"
+        " JOIN session_sets st ON st.session_exercise_id = se.id AND st.deleted = 0"
+        " LEFT JOIN session_set_metrics m ON m.session_set_id = st.id AND m.deleted = 0"
+        " WHERE ss.deleted = 0 AND ss.status = 'completed'"
+    )
+    chunks = [None] if session_ids is None else list(_chunks(session_ids))
+    for chunk in chunks:
+        params: list = []
+        query = sql
+        if chunk is not None:
+            query += f" AND ss.id IN ({_placeholders(len(chunk))})"
+            params = chunk
+        cursor.execute(query + " ORDER BY st.id", params)
+        current = None
+        for session_id, name, set_id, completed_at, metric, value in cursor:
+            if current is None or current[0] != set_id:
+                if current is not None:
+                    yield current[1]
+                current = (set_id, (session_id, name, completed_at, {}))
+            if metric is not None:
+                current[1][3][metric] = value
+        if current is not None:
+            yield current[1]
+
+
+def rebuild_progress(db_path: Path = DEFAULT_DB_PATH) -> int:
+    """Recompute every progress aggregate from the saved session history.
+
+    Useful after importing history or deleting sessions.  Returns the
+    number of sets that were aggregated.
+    """
+
+    with get_database(db_path).transaction() as cursor:
+        return _rebuild_progress(cursor)
+
+
+def _rebuild_progress(cursor: sqlite3.Cursor) -> int:
+    for table in _PROGRESS_TABLES.values():
+        cursor.execute(f"DELETE FROM {table}")
+    rows = list(_history_set_rows(cursor))
+    _write_progress(cursor, _aggregate_progress(rows))
+    return len(rows)
+
+
+def get_exercise_progress(
+    exercise_name: str,
+    period: str = "week",
+    start: str | datetime.date | None = None,
+    end: str | datetime.date | None = None,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> list[dict]:
+    """Return the progress aggregates of ``exercise_name`` in date order.
+
+    ``period`` is ``"day"`` or ``"week"``.  ``start`` and ``end`` limit the
+    result to periods starting within that inclusive range.  Each item has
+    ``period_start``, ``sessions``, ``sets``, ``reps``, ``tonnage``,
+    ``best_weight``, ``best_reps`` and ``best_e1rm`` keys.  The rows come
+    straight from the aggregate tables, so no set history is scanned.
+    """
+
+    table = _PROGRESS_TABLES.get(period)
+    if table is None:
+        raise ValueError(f"Unknown progress period: {period}")
+    sql = (
+        f"SELECT period_start, {', '.join(_PROGRESS_COLUMNS)} FROM {table}"
+        " WHERE exercise_name = ?"
+    )
+    params: list = [exercise_name]
+    if start is not None:
+        sql += " AND period_start >= ?"
+        params.append(str(start))
+    if end is not None:
+        sql += " AND period_start <= ?"
+        params.append(str(end))
+    cursor = get_database(db_path).cursor()
+    cursor.execute(sql + " ORDER BY period_start", params)
+    keys = ("period_start",) + _PROGRESS_COLUMNS
+    return [dict(zip(keys, row)) for row in cursor.fetchall()]
+
+
+def get_progress_exercises(db_path: Path = DEFAULT_DB_PATH) -> list[str]:
+    """Return the names of exercises that have progress data, sorted."""
+
+    cursor = get_database(db_path).cursor()
+    cursor.execute(
+        f"SELECT DISTINCT exercise_name FROM {_PROGRESS_TABLES['week']}"
+        " ORDER BY exercise_name"
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _set_records(metrics: dict) -> list[tuple[str, int, float]]:
+    """Return the ``(metric_name, rep_range, value)`` record candidates of a set.
+
+    Only the reps and weight metrics hold records, since a higher value
+    is not better for metrics such as RPE or time.  The weight metric is
+    ranked per rep count, so a set of five only competes with other sets
+    of five; reps use rep range ``0``.
+    """
+
+    reps_key = PROGRESS_REPS_METRIC.casefold()
+    weight_key = PROGRESS_WEIGHT_METRIC.casefold()
+    reps = next(
+        (_as_number(v) for k, v in metrics.items() if k.casefold() == reps_key), None
+    )
+    rep_range = int(reps) if reps and reps >= 1 else 0
+    candidates = []
+    for metric, value in metrics.items():
+        key = metric.casefold()
+        if key != reps_key and key != weight_key:
+            continue
+        number = _as_number(value)
+        if number is None or number <= 0:
+            continue
+        candidates.append((metric, rep_range if key == weight_key else 0, number))
+    return candidates
+
+
+def _load_personal_records(
+    cursor: sqlite3.Cursor, exercise_names
+) -> dict[tuple[str, str, int], float]:
+    """Return the stored record values of ``exercise_names``.
+
+    Keys are ``(exercise_name, metric_name, rep_range)`` tuples.
+    """
+
+    records = {}
+    for chunk in _chunks(list(set(exercise_names))):
+        cursor.execute(
+            "SELECT exercise_name, metric_name, rep_range, value"
+            " FROM progress_personal_records"
+            f" WHERE exercise_name IN ({_placeholders(len(chunk))})",
+            chunk,
+        )
+        for name, metric, rep_range, value in cursor.fetchall():
+            records[(name, metric, rep_range)] = value
+    return records
+
+
+def _write_personal_records(
+    cursor: sqlite3.Cursor, updates: dict[tuple[str, str, int], tuple]
+) -> None:
+    """Store ``updates`` mapping record keys to ``(value, session_id, achieved_at)``.
+
+    A stored record is only replaced by a higher value, so concurrent
+    sessions cannot lower it.
+    """
+
+    cursor.executemany(
+        "INSERT INTO progress_personal_records"
+        " (exercise_name, metric_name, rep_range, value, session_id, achieved_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (exercise_name, metric_name, rep_range) DO UPDATE SET"
+        " value = excluded.value, session_id = excluded.session_id,"
+        " achieved_at = excluded.achieved_at"
+        " WHERE excluded.value > progress_personal_records.value",
+        [
+            (name, metric, rep_range, value, session_id, achieved_at)
+            for (name, metric, rep_range), (value, session_id, achieved_at) in updates.items()
+        ],
+    )
+
+
+def rebuild_personal_records(db_path: Path = DEFAULT_DB_PATH) -> int:
+    """Recompute ``progress_personal_records`` from the saved session history.
+
+    Returns the number of sets that were examined.
+    """
+
+    with get_database(db_path).transaction() as cursor:
+        return _rebuild_personal_records(cursor)
+
+
+def _rebuild_personal_records(cursor: sqlite3.Cursor) -> int:
+    best: dict[tuple[str, str, int], tuple] = {}
+    count = 0
+    for session_id, name, completed_at, metrics in list(_history_set_rows(cursor)):
+        count += 1
+        for metric, rep_range, value in _set_records(metrics):
+            key = (name, metric, rep_range)
+            if key not in best or value > best[key][0]:
+                best[key] = (value, session_id, completed_at)
+    cursor.execute("DELETE FROM progress_personal_records")
+    _write_personal_records(cursor, best)
+    return count
+
+
+def get_personal_records(
+    exercise_name: str, db_path: Path = DEFAULT_DB_PATH
+) -> list[dict]:
+    """Return the personal records of ``exercise_name``.
+
+    Each item has ``metric_name``, ``rep_range``, ``value``, ``session_id``
+    and ``achieved_at`` keys.  ``rep_range`` is the rep count of a weight
+    record and ``0`` for every other metric.
+    """
+
+    cursor = get_database(db_path).cursor()
+    cursor.execute(
+        "SELECT metric_name, rep_range, value, session_id, achieved_at"
+        " FROM progress_personal_records WHERE exercise_name = ?"
+        " ORDER BY metric_name, rep_range",
+        (exercise_name,),
+    )
+    keys = ("metric_name", "rep_range", "value", "session_id", "achieved_at")
+    return [dict(zip(keys, row)) for row in cursor.fetchall()]
+
+
 class Exercise:
     """Editable exercise loaded from the database.
 
@@ -926,16 +2589,42 @@ class Exercise:
         is_user_created: bool | None = None,
     ) -> None:
         self.db_path = Path(db_path)
+        # State recorded by ``mark_saved``.  Edits are compared against it as
+        # they happen so ``is_modified`` never has to rebuild ``to_dict``.
+        self._original: dict | None = None
+        self._original_metrics: dict[str, dict] = {}
+        self._original_order: list[str] = []
+        self._changed: set[str] = set()
+        self._changed_metrics: set[str] = set()
+        self._metric_order_changed = False
+
         self.name: str = name
         self.description: str = ""
         self.metrics: list[dict] = []
         self.is_user_created: bool = True
-        self._original: dict | None = None
 
         if name:
             self.load(name, is_user_created=is_user_created)
         else:
-            self._original = self.to_dict()
+            self.mark_saved()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+        self._note_field("name", value)
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value
+        self._note_field("description", value)
 
     def load(self, name: str, *, is_user_created: bool | None = None) -> None:
         """Load ``name`` from ``db_path`` into this object."""
@@ -956,7 +2645,7 @@ class Exercise:
                 details.get("is_user_created") if details else is_user_created
             ),
         )
-        self._original = self.to_dict()
+        self.mark_saved()
 
     # ------------------------------------------------------------------
     # Modification helpers.  These operate only on the in-memory object
@@ -966,11 +2655,13 @@ class Exercise:
         """Append ``metric`` to the metrics list."""
 
         self.metrics.append(metric)
+        self._note_metric(metric.get("name"))
 
     def remove_metric(self, metric_name: str) -> None:
         """Remove metric with ``metric_name`` if present."""
 
         self.metrics = [m for m in self.metrics if m.get("name") != metric_name]
+        self._note_metric(metric_name)
 
     def update_metric(self, metric_name: str, **updates) -> None:
         """Update metric named ``metric_name`` with ``updates``."""
@@ -978,8 +2669,34 @@ class Exercise:
         for metric in self.metrics:
             if metric.get("name") == metric_name:
                 metric.update(updates)
+                self._note_metric(metric_name)
                 break
 
+    def _note_field(self, field: str, value) -> None:
+        """Record whether ``field`` now differs from its saved value."""
+
+        if self._original is None:
+            return
+        if value != self._original[field]:
+            self._changed.add(field)
+        else:
+            self._changed.discard(field)
+
+    def _note_metric(self, metric_name: str | None) -> None:
+        """Record whether ``metric_name`` now differs from its saved copy."""
+
+        current = None
+        names = []
+        for metric in self.metrics:
+            names.append(metric.get("name"))
+            if metric.get("name") == metric_name:
+                current = metric
+        if current != self._original_metrics.get(metric_name):
+            self._changed_metrics.add(metric_name)
+        else:
+            self._changed_metrics.discard(metric_name)
+        self._metric_order_changed = names != self._original_order
+
     def to_dict(self) -> dict:
         """Return a ``dict`` representation of the exercise."""
 
@@ -990,108 +2707,144 @@ class Exercise:
         }
 
     def is_modified(self) -> bool:
-        """Return ``True`` if the exercise differs from its original state."""
+        """Return ``True`` if the exercise differs from its original state.
+
+        Edits made through the setters and metric helpers are tracked as they
+        happen, so this check does not depend on the number of metrics.
+        """
+
+        return bool(
+            self._changed or self._changed_metrics or self._metric_order_changed
+        )
+
+    def changed_fields(self) -> set[str]:
+        """Return the fields (``name``, ``description``, ``metrics``) edited since the last save."""
+
+        fields = set(self._changed)
+        if self._changed_metrics or self._metric_order_changed:
+            fields.add("metrics")
+        return fields
 
-        return self._original != self.to_dict()
+    def changed_metrics(self) -> set[str]:
+        """Return the names of metrics added, removed or updated since the last save."""
+
+        return set(self._changed_metrics)
 
     def mark_saved(self) -> None:
         """Reset the original state to the current data."""
 
         self._original = self.to_dict()
+        self._original_metrics = {m.get("name"): m for m in self._original["metrics"]}
+        self._original_order = list(self._original_metrics)
+        self._changed.clear()
+        self._changed_metrics.clear()
+        self._metric_order_changed = False
 
     def had_metric(self, metric_name: str) -> bool:
         """Return ``True`` if ``metric_name`` existed when loaded."""
 
-        if not self._original:
-            return False
-        for m in self._original.get("metrics", []):
-            if m.get("name") == metric_name:
-                return True
-        return False
+        return metric_name in self._original_metrics
 
 
 def save_exercise(exercise: Exercise) -> None:
-    """Persist ``exercise`` to the database as a user-defined copy."""
+    """Persist ``exercise`` to the database as a user-defined copy.
 
-    db_path = exercise.db_path
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    Only the difference from the stored copy is written: metric links are
+    compared with the active ``library_exercise_metrics`` rows and the
+    changed ones are updated, inserted or soft-deleted in batches.
+    """
 
-    cursor.execute(
-        "SELECT id FROM library_exercises WHERE name = ? AND is_user_created = 1 AND deleted = 0",
-        (exercise.name,),
-    )
-    row = cursor.fetchone()
-    if row:
-        ex_id = row[0]
+    db_path = exercise.db_path
+    with get_database(db_path).transaction() as cursor:
         cursor.execute(
-            "UPDATE library_exercises SET description = ? WHERE id = ?",
-            (exercise.description, ex_id),
+            "SELECT id, description FROM library_exercises WHERE name = ? AND is_user_created = 1 AND deleted = 0",
+            (exercise.name,),
         )
-        cursor.execute(
-            "UPDATE library_exercise_metrics SET deleted = 1 WHERE exercise_id = ?",
-            (ex_id,),
+        row = cursor.fetchone()
+        if row:
+            ex_id, stored_description = row
+            if exercise.description != stored_description:
+                cursor.execute(
+                    "UPDATE library_exercises SET description = ? WHERE id = ?",
+                    (exercise.description, ex_id),
+                )
+            cursor.execute(
+                "SELECT metric_type_id, id, position, type, input_timing, is_required, scope, enum_values_json"
+                " FROM library_exercise_metrics WHERE exercise_id = ? AND deleted = 0",
+                (ex_id,),
+            )
+            existing = {r[0]: r[1:] for r in cursor.fetchall()}
+        else:
+            cursor.execute(
+                "INSERT INTO library_exercises (name, description, is_user_created) VALUES (?, ?, 1)",
+                (exercise.name, exercise.description),
+            )
+            ex_id = cursor.lastrowid
+            existing = {}
+
+        metric_types = _resolve_metric_types(
+            cursor, {m["name"] for m in exercise.metrics}
         )
-    else:
-        cursor.execute(
-            "INSERT INTO library_exercises (name, description, is_user_created) VALUES (?, ?, 1)",
-            (exercise.name, exercise.description),
+        updates = []
+        inserts = []
+        seen: set[int] = set()
+        for position, m in enumerate(exercise.metrics):
+            if m["name"] not in metric_types:
+                continue
+            metric_id, def_type, def_timing, def_req, def_scope = metric_types[
+                m["name"]
+            ]
+            # Only values that differ from the metric type are stored
+            mtype = m.get("type") if m.get("type") != def_type else None
+            timing = (
+                m.get("input_timing")
+                if m.get("input_timing") != def_timing
+                else None
+            )
+            req = (
+                int(m.get("is_required", False))
+                if bool(m.get("is_required")) != bool(def_req)
+                else None
+            )
+            scope_val = m.get("scope") if m.get("scope") != def_scope else None
+            enum_json = (
+                json.dumps(m.get("values"))
+                if m.get("values") and (m.get("type") or def_type) == "enum"
+                else None
+            )
+            # A metric listed twice is linked once, as the unique index requires
+            if metric_id in seen:
+                continue
+            seen.add(metric_id)
+            wanted = (position, mtype, timing, req, scope_val, enum_json)
+            old = existing.pop(metric_id, None)
+            if old is None:
+                inserts.append((ex_id, metric_id) + wanted)
+            elif tuple(old[1:]) != wanted:
+                updates.append(wanted + (old[0],))
+
+        _soft_delete_where_in(
+            cursor,
+            "library_exercise_metrics",
+            "id",
+            [old[0] for old in existing.values()],
         )
-        ex_id = cursor.lastrowid
-
-    for position, m in enumerate(exercise.metrics):
-        cursor.execute(
-            "SELECT id, type FROM library_metric_types WHERE name = ?",
-            (m["name"],),
+        cursor.executemany(
+            """UPDATE library_exercise_metrics
+                  SET position = ?, type = ?, input_timing = ?, is_required = ?, scope = ?, enum_values_json = ?
+                WHERE id = ?""",
+            updates,
         )
-        mt_row = cursor.fetchone()
-        if not mt_row:
-            continue
-        metric_id, default_type = mt_row
-
-        cursor.execute(
-            "SELECT type, input_timing, is_required, scope FROM library_metric_types WHERE id = ?",
-            (metric_id,),
-        )
-        default_row = cursor.fetchone()
-        mtype = timing = req = scope_val = None
-        if default_row:
-            def_type, def_timing, def_req, def_scope = default_row
-            if m.get("type") != def_type:
-                mtype = m.get("type")
-            if m.get("input_timing") != def_timing:
-
-                timing = m.get("input_timing")
-            if bool(m.get("is_required")) != bool(def_req):
-                req = int(m.get("is_required", False))
-            if m.get("scope") != def_scope:
-                scope_val = m.get("scope")
-
-        cursor.execute(
+        cursor.executemany(
             """INSERT INTO library_exercise_metrics
                 (exercise_id, metric_type_id, position, type, input_timing, is_required, scope, enum_values_json)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                ex_id,
-                metric_id,
-                position,
-                mtype,
-
-                timing,
-                req,
-                scope_val,
-                (
-                    json.dumps(m.get("values")) if m.get("values") and (m.get("type") or default_type) == "enum" else None
-
-                ),
-            ),
+            inserts,
         )
 
-    conn.commit()
-    conn.close()
-
     exercise.is_user_created = True
     exercise.mark_saved()
+    get_library_cache(db_path).invalidate("exercises")
 
 
 def delete_exercise(
@@ -1106,37 +2859,33 @@ def delete_exercise(
     function returns `True` when a row was deleted.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id FROM library_exercises WHERE name = ? AND is_user_created = ? AND deleted = 0",
-        (name, int(is_user_created)),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        return False
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            "SELECT id FROM library_exercises WHERE name = ? AND is_user_created = ? AND deleted = 0",
+            (name, int(is_user_created)),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return False
 
-    ex_id = row[0]
+        ex_id = row[0]
 
-    cursor.execute(
-        "SELECT 1 FROM preset_section_exercises WHERE library_exercise_id = ? AND deleted = 0 LIMIT 1",
-        (ex_id,),
-    )
-    if cursor.fetchone():
-        conn.close()
-        raise ValueError("Exercise is in use and cannot be deleted")
+        cursor.execute(
+            "SELECT 1 FROM preset_section_exercises WHERE library_exercise_id = ? AND deleted = 0 LIMIT 1",
+            (ex_id,),
+        )
+        if cursor.fetchone():
+            raise ValueError("Exercise is in use and cannot be deleted")
 
-    cursor.execute(
-        "UPDATE library_exercise_metrics SET deleted = 1 WHERE exercise_id = ?",
-        (ex_id,),
-    )
-    cursor.execute(
-        "UPDATE library_exercises SET deleted = 1 WHERE id = ?",
-        (ex_id,),
-    )
-    conn.commit()
-    conn.close()
+        cursor.execute(
+            "UPDATE library_exercise_metrics SET deleted = 1 WHERE exercise_id = ? AND deleted = 0",
+            (ex_id,),
+        )
+        cursor.execute(
+            "UPDATE library_exercises SET deleted = 1 WHERE id = ?",
+            (ex_id,),
+        )
+    get_library_cache(db_path).invalidate("exercises")
     return True
 
 
@@ -1153,44 +2902,39 @@ def delete_metric_type(
     raised if the metric type is still referenced by any exercise or preset.
     """
 
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id FROM library_metric_types WHERE name = ? AND is_user_created = ? AND deleted = 0",
-        (name, int(is_user_created)),
-    )
-    row = cursor.fetchone()
-    if not row:
-        conn.close()
-        return False
+    with get_database(db_path).transaction() as cursor:
+        cursor.execute(
+            "SELECT id FROM library_metric_types WHERE name = ? AND is_user_created = ? AND deleted = 0",
+            (name, int(is_user_created)),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return False
 
-    mt_id = row[0]
+        mt_id = row[0]
 
-    # Check if this metric type is referenced by any exercises or presets
-    cursor.execute(
-        "SELECT 1 FROM library_exercise_metrics WHERE metric_type_id = ? AND deleted = 0 LIMIT 1",
-        (mt_id,),
-    )
-    if cursor.fetchone():
-        conn.close()
-        raise ValueError("Metric type is in use and cannot be deleted")
+        # Check if this metric type is referenced by any exercises or presets
+        cursor.execute(
+            "SELECT 1 FROM library_exercise_metrics WHERE metric_type_id = ? AND deleted = 0 LIMIT 1",
+            (mt_id,),
+        )
+        if cursor.fetchone():
+            raise ValueError("Metric type is in use and cannot be deleted")
 
-    cursor.execute(
+        cursor.execute(
 
-        "SELECT 1 FROM preset_preset_metrics WHERE library_metric_type_id = ? AND deleted = 0 LIMIT 1",
+            "SELECT 1 FROM preset_preset_metrics WHERE library_metric_type_id = ? AND deleted = 0 LIMIT 1",
 
-        (mt_id,),
-    )
-    if cursor.fetchone():
-        conn.close()
-        raise ValueError("Metric type is in use and cannot be deleted")
+            (mt_id,),
+        )
+        if cursor.fetchone():
+            raise ValueError("Metric type is in use and cannot be deleted")
 
-    cursor.execute(
-        "UPDATE library_metric_types SET deleted = 1 WHERE id = ?",
-        (mt_id,),
-    )
-    conn.commit()
-    conn.close()
+        cursor.execute(
+            "UPDATE library_metric_types SET deleted = 1 WHERE id = ?",
+            (mt_id,),
+        )
+    get_library_cache(db_path).invalidate("metrics")
     return True
 
 
@@ -1205,19 +2949,28 @@ class PresetEditor:
         """Create the editor and optionally load an existing preset."""
 
         self.db_path = Path(db_path)
-        self.conn = sqlite3.connect(str(self.db_path))
+        # The editor keeps a private connection for the lifetime of the
+        # editing session so ``close`` never affects the shared pool.
+        self.conn = get_database(self.db_path).open_connection()
 
         self.preset_name: str = preset_name or ""
-        self.sections: list[dict] = []
+        self.sections: list[PresetSection] = []
         self.preset_metrics: list[dict] = []
         self._preset_id: int | None = None
-        self._original: dict | None = None
+        # Edits go through an operation log (see ``_record``) so they can be
+        # undone and so ``is_modified`` and ``save`` know what changed.
+        self._state_seq = 0
+        self._reset_history()
+        self._saved_state = self._base_state
+        self._saved_name = ""
+        self._saved_content: tuple[list, list] = ([], [])
+        self._dirty: set[str] = set()
 
         if preset_name:
             self.load(preset_name)
         else:
             self._load_required_metrics()
-            self._original = self.to_dict()
+            self.mark_saved()
 
     def _load_required_metrics(self) -> None:
         """Load required preset metric types into ``preset_metrics``."""
@@ -1296,15 +3049,9 @@ class PresetEditor:
             exercises = []
             for ex_id, ex_name, sets, rest, lib_id in cursor.fetchall():
                 exercises.append(
-                    {
-                        "id": ex_id,
-                        "name": ex_name,
-                        "sets": sets,
-                        "rest": rest,
-                        "library_id": lib_id,
-                    }
+                    PresetExercise(ex_name, sets, rest, id=ex_id, library_id=lib_id)
                 )
-            self.sections.append({"name": name, "exercises": exercises})
+            self.sections.append(PresetSection(name, exercises))
 
         cursor.execute(
             """
@@ -1358,26 +3105,30 @@ class PresetEditor:
             )
 
         self._preset_id = preset_id
-        self._original = self.to_dict()
+        self._reset_history()
+        self.mark_saved()
 
     def add_section(self, name: str = "Section") -> int:
         """Add a new section and return its index."""
 
-        self.sections.append({"name": name, "exercises": []})
-        return len(self.sections) - 1
+        index = len(self.sections)
+        self._record(("insert_section", index, PresetSection(name, [])))
+        return index
 
     def remove_section(self, index: int) -> None:
         """Remove the section at ``index`` if it exists."""
 
         if 0 <= index < len(self.sections):
-            self.sections.pop(index)
+            self._record(("delete_section", index, self.sections[index]))
 
     def rename_section(self, index: int, name: str) -> None:
         """Rename the section at ``index`` to ``name``."""
 
         if index < 0 or index >= len(self.sections):
             raise IndexError("Section index out of range")
-        self.sections[index]["name"] = name
+        old = self.sections[index]["name"]
+        if old != name:
+            self._record(("rename_section", index, old, name))
 
     def add_exercise(
         self,
@@ -1385,7 +3136,7 @@ class PresetEditor:
         exercise_name: str,
         sets: int = DEFAULT_SETS_PER_EXERCISE,
         rest: int = DEFAULT_REST_DURATION,
-    ) -> dict:
+    ) -> PresetExercise:
         """Add an exercise to the specified section."""
 
         if section_index < 0 or section_index >= len(self.sections):
@@ -1400,14 +3151,9 @@ class PresetEditor:
         if row is None:
             raise ValueError(f"Exercise '{exercise_name}' does not exist")
 
-        ex = {
-            "id": None,
-            "name": exercise_name,
-            "sets": sets,
-            "rest": rest,
-            "library_id": row[0],
-        }
-        self.sections[section_index]["exercises"].append(ex)
+        ex = PresetExercise(exercise_name, sets, rest, id=None, library_id=row[0])
+        exercises = self.sections[section_index]["exercises"]
+        self._record(("insert_exercise", section_index, len(exercises), ex))
         return ex
 
     def update_exercise(
@@ -1429,10 +3175,14 @@ class PresetEditor:
             raise IndexError("Exercise index out of range")
 
         exercise = self.sections[section_index]["exercises"][exercise_index]
-        if sets is not None:
-            exercise["sets"] = sets
-        if rest is not None:
-            exercise["rest"] = rest
+        new = {}
+        if sets is not None and exercise["sets"] != sets:
+            new["sets"] = sets
+        if rest is not None and exercise["rest"] != rest:
+            new["rest"] = rest
+        if new:
+            old = {key: exercise[key] for key in new}
+            self._record(("update_exercise", section_index, exercise_index, old, new))
 
     def remove_exercise(self, section_index: int, exercise_index: int) -> None:
         """Remove an exercise from ``section_index`` at ``exercise_index``."""
@@ -1445,7 +3195,8 @@ class PresetEditor:
         ):
             raise IndexError("Exercise index out of range")
 
-        self.sections[section_index]["exercises"].pop(exercise_index)
+        ex = self.sections[section_index]["exercises"][exercise_index]
+        self._record(("delete_exercise", section_index, exercise_index, ex))
 
     def move_exercise(self, section_index: int, old_index: int, new_index: int) -> None:
         """Move an exercise within a section to ``new_index``."""
@@ -1460,9 +3211,8 @@ class PresetEditor:
         ):
             raise IndexError("Exercise index out of range")
 
-        exercises = self.sections[section_index]["exercises"]
-        ex = exercises.pop(old_index)
-        exercises.insert(new_index, ex)
+        if old_index != new_index:
+            self._record(("move_exercise", section_index, old_index, new_index))
 
     # ------------------------------------------------------------------
     # Preset metric helpers
@@ -1497,32 +3247,186 @@ class PresetEditor:
                 values = json.loads(enum_json)
             except Exception:
                 values = []
-        self.preset_metrics.append(
-            {
-                "name": metric_name,
-                "type": mtype,
-                "input_timing": timing,
-                "is_required": bool(req),
-                "scope": scope,
-                "description": desc,
-                "values": values,
-                "value": value,
-            }
-        )
+        metric = {
+            "name": metric_name,
+            "type": mtype,
+            "input_timing": timing,
+            "is_required": bool(req),
+            "scope": scope,
+            "description": desc,
+            "values": values,
+            "value": value,
+        }
+        self._record(("insert_metrics", ((len(self.preset_metrics), metric),)))
 
     def remove_metric(self, metric_name: str) -> None:
         """Remove metric with ``metric_name`` if present."""
 
-        self.preset_metrics = [m for m in self.preset_metrics if m.get("name") != metric_name]
+        removed = tuple(
+            (idx, m)
+            for idx, m in enumerate(self.preset_metrics)
+            if m.get("name") == metric_name
+        )
+        if removed:
+            self._record(("delete_metrics", removed))
 
     def update_metric(self, metric_name: str, **updates) -> None:
         """Update metric named ``metric_name`` with ``updates``."""
 
-        for metric in self.preset_metrics:
+        for idx, metric in enumerate(self.preset_metrics):
             if metric.get("name") == metric_name:
-                metric.update(updates)
+                new = {k: v for k, v in updates.items() if metric.get(k) != v}
+                if new:
+                    old = {k: metric.get(k) for k in new}
+                    self._record(("update_metric", idx, old, new))
                 break
 
+    # ------------------------------------------------------------------
+    # Operation log
+    # ------------------------------------------------------------------
+    # Every edit is stored as a small tuple ``(kind, *args)`` that carries
+    # enough data to be applied in either direction.  ``_undo`` holds
+    # ``(state, op)`` pairs where ``state`` identifies the editor state the
+    # op leads to, so comparing states replaces comparing preset contents.
+
+    MAX_HISTORY = 200
+
+    # Kinds that are each other's inverse; the rest invert their arguments
+    _INVERSE_KINDS = {
+        "insert_section": "delete_section",
+        "delete_section": "insert_section",
+        "insert_exercise": "delete_exercise",
+        "delete_exercise": "insert_exercise",
+        "insert_metrics": "delete_metrics",
+        "delete_metrics": "insert_metrics",
+    }
+
+    def _reset_history(self) -> None:
+        """Forget all recorded operations, e.g. after loading a preset."""
+
+        self._state_seq += 1
+        self._base_state = self._state_seq
+        self._undo: list[tuple[int, tuple]] = []
+        self._redo: list[tuple[int, tuple]] = []
+
+    def _state(self) -> int:
+        return self._undo[-1][0] if self._undo else self._base_state
+
+    def _record(self, op: tuple) -> None:
+        """Apply ``op`` as a new edit and add it to the undo history."""
+
+        self._apply(op)
+        self._state_seq += 1
+        self._undo.append((self._state_seq, op))
+        self._redo.clear()
+        if len(self._undo) > self.MAX_HISTORY:
+            # The dropped op's state becomes the oldest reachable state
+            self._base_state = self._undo.pop(0)[0]
+
+    @classmethod
+    def _invert(cls, op: tuple) -> tuple:
+        kind = op[0]
+        if kind in cls._INVERSE_KINDS:
+            return (cls._INVERSE_KINDS[kind],) + op[1:]
+        if kind == "rename_section":
+            _, index, old, new = op
+            return (kind, index, new, old)
+        if kind == "move_exercise":
+            _, section_index, old_index, new_index = op
+            return (kind, section_index, new_index, old_index)
+        if kind == "update_exercise":
+            _, section_index, exercise_index, old, new = op
+            return (kind, section_index, exercise_index, new, old)
+        if kind == "update_metric":
+            _, index, old, new = op
+            return (kind, index, new, old)
+        raise ValueError(f"Unknown operation {kind!r}")
+
+    def _apply(self, op: tuple) -> None:
+        """Perform ``op`` on the in-memory preset without recording it."""
+
+        kind = op[0]
+        if kind == "insert_section":
+            self.sections.insert(op[1], op[2])
+        elif kind == "delete_section":
+            del self.sections[op[1]]
+        elif kind == "rename_section":
+            self.sections[op[1]]["name"] = op[3]
+        elif kind == "insert_exercise":
+            self.sections[op[1]]["exercises"].insert(op[2], op[3])
+        elif kind == "delete_exercise":
+            del self.sections[op[1]]["exercises"][op[2]]
+        elif kind == "move_exercise":
+            exercises = self.sections[op[1]]["exercises"]
+            exercises.insert(op[3], exercises.pop(op[2]))
+        elif kind == "update_exercise":
+            self.sections[op[1]]["exercises"][op[2]].update(op[4])
+        elif kind == "insert_metrics":
+            for index, metric in op[1]:
+                self.preset_metrics.insert(index, metric)
+        elif kind == "delete_metrics":
+            for index, _ in reversed(op[1]):
+                del self.preset_metrics[index]
+        elif kind == "update_metric":
+            self.preset_metrics[op[1]].update(op[3])
+        else:
+            raise ValueError(f"Unknown operation {kind!r}")
+        self._dirty.add("metrics" if "metric" in kind else "sections")
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> bool:
+        """Revert the most recent edit.  Return ``False`` if there is none."""
+
+        if not self._undo:
+            return False
+        state, op = self._undo.pop()
+        self._apply(self._invert(op))
+        self._redo.append((state, op))
+        return True
+
+    def redo(self) -> bool:
+        """Re-apply the most recently undone edit.  Return ``False`` if none."""
+
+        if not self._redo:
+            return False
+        state, op = self._redo.pop()
+        self._apply(op)
+        self._undo.append((state, op))
+        return True
+
+    def discard(self) -> None:
+        """Return to the state recorded by the last load or save.
+
+        The log is replayed in memory; the preset is only reloaded from the
+        database when the saved state has dropped out of the history.
+        """
+
+        target = self._saved_state
+        if any(state == target for state, _ in self._redo):
+            while self._state() != target:
+                self.redo()
+        else:
+            while self._state() != target and self._undo:
+                self.undo()
+        self.preset_name = self._saved_name
+        if self._state() != target or self._changed_parts():
+            if self._preset_id is not None:
+                self.load(self._saved_name)
+                return
+            self.sections.clear()
+            self.preset_metrics.clear()
+            self._load_required_metrics()
+            self._reset_history()
+            self.mark_saved()
+            return
+        self._redo.clear()
+        self._dirty.clear()
+
     def to_dict(self) -> dict:
         """Return the preset data as a dictionary."""
 
@@ -1546,26 +3450,67 @@ class PresetEditor:
     # Modification tracking helpers
     # ------------------------------------------------------------------
     def is_modified(self) -> bool:
-        """Return ``True`` if the preset differs from the original state."""
+        """Return ``True`` if the preset changed since it was loaded or saved.
+
+        Answered in O(1) from the operation log position and the preset
+        name, so it is cheap enough to call after every edit.  Assignments
+        into the ``sections`` or ``preset_metrics`` dicts bypass the log and
+        are not reported here; :meth:`save` and :meth:`discard` still find
+        them by comparing with the copy kept by :meth:`mark_saved`.
+        """
+
+        return (
+            self._state() != self._saved_state
+            or self.preset_name != self._saved_name
+        )
+
+    def _changed_parts(self) -> set[str]:
+        """Return the parts that differ from the copy kept by :meth:`mark_saved`."""
 
-        return self._original != self.to_dict()
+        saved_sections, saved_metrics = self._saved_content
+        parts = set()
+        if self.sections != saved_sections:
+            parts.add("sections")
+        if self.preset_metrics != saved_metrics:
+            parts.add("metrics")
+        return parts
 
     def mark_saved(self) -> None:
         """Record the current state as the saved state."""
 
-        self._preset_id = self._preset_id  # keep mypy happy
-        self._original = self.to_dict()
+        self._saved_state = self._state()
+        self._saved_name = self.preset_name
+        self._saved_content = copy.deepcopy((self.sections, self.preset_metrics))
+        self._dirty.clear()
 
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
     def save(self) -> None:
-        """Write the current preset to the database."""
+        """Write the current preset to the database.
+
+        The in-memory preset is diffed against the stored rows and the
+        resulting changes are written in batches: library ids are resolved
+        with one query, unchanged exercises are skipped, metric snapshots
+        are copied with ``INSERT ... SELECT`` and removed rows are
+        soft-deleted with ``WHERE id IN (...)``.  For a stored preset, the
+        sections or metrics are skipped entirely when neither a logged
+        operation nor a direct assignment changed them since the last save.
+        """
 
         if not self.preset_name.strip():
             raise ValueError("Preset name cannot be empty")
 
         cursor = self.conn.cursor()
+        try:
+            self._save(cursor)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        self.mark_saved()
+
+    def _save(self, cursor: sqlite3.Cursor) -> None:
         cursor.execute(
             "SELECT id FROM preset_presets WHERE name = ? AND deleted = 0",
             (self.preset_name,),
@@ -1574,18 +3519,31 @@ class PresetEditor:
         if row and (self._preset_id is None or row[0] != self._preset_id):
             raise ValueError("A preset with that name already exists")
 
+        # Resolve every referenced library exercise up front so a missing
+        # exercise aborts the save before anything is written.
+        library = _resolve_library_exercises(
+            cursor,
+            {ex["name"] for sec in self.sections for ex in sec.get("exercises", [])},
+        )
+        for sec in self.sections:
+            for ex in sec.get("exercises", []):
+                if ex["name"] not in library:
+                    raise ValueError(f"Exercise '{ex['name']}' does not exist")
+
         if row:
             preset_id = row[0]
             self._preset_id = preset_id
-            cursor.execute(
-                "SELECT id FROM preset_preset_sections WHERE preset_id = ? AND deleted = 0 ORDER BY position",
-                (preset_id,),
-            )
-            sec_ids = [r[0] for r in cursor.fetchall()]
             cursor.execute(
                 "UPDATE preset_presets SET name = ? WHERE id = ?",
                 (self.preset_name, preset_id),
             )
+            # Untouched parts already match the stored rows.  Edits that
+            # bypassed the operation log show up in ``_changed_parts``.
+            dirty = self._dirty | self._changed_parts()
+            if "sections" in dirty:
+                self._save_sections(cursor, preset_id, library)
+            if "metrics" in dirty:
+                self._save_metrics(cursor, preset_id)
         else:
             cursor.execute(
                 "INSERT INTO preset_presets (name) VALUES (?)",
@@ -1593,300 +3551,233 @@ class PresetEditor:
             )
             preset_id = cursor.lastrowid
             self._preset_id = preset_id
-            sec_ids = []
+            self._save_sections(cursor, preset_id, library)
+            self._save_metrics(cursor, preset_id)
+
+    def _save_sections(
+        self, cursor: sqlite3.Cursor, preset_id: int, library: dict
+    ) -> None:
+        """Write sections and their exercises for ``preset_id``."""
 
+        cursor.execute(
+            "SELECT id FROM preset_preset_sections WHERE preset_id = ? AND deleted = 0 ORDER BY position",
+            (preset_id,),
+        )
+        sec_ids = [r[0] for r in cursor.fetchall()]
+
+        # -- Sections -------------------------------------------------------
+        section_updates = []
+        section_ids = []
         for sec_pos, sec in enumerate(self.sections):
+            name = sec.get("name", f"Section {sec_pos + 1}")
             if sec_pos < len(sec_ids):
-                section_id = sec_ids[sec_pos]
-                cursor.execute(
-                    "UPDATE preset_preset_sections SET name = ?, position = ?, deleted = 0 WHERE id = ?",
-                    (sec.get("name", f"Section {sec_pos + 1}"), sec_pos, section_id),
-                )
+                section_updates.append((name, sec_pos, sec_ids[sec_pos]))
+                section_ids.append(sec_ids[sec_pos])
             else:
                 cursor.execute(
                     "INSERT INTO preset_preset_sections (preset_id, name, position) VALUES (?, ?, ?)",
-                    (preset_id, sec.get("name", f"Section {sec_pos + 1}"), sec_pos),
+                    (preset_id, name, sec_pos),
                 )
-                section_id = cursor.lastrowid
+                section_ids.append(cursor.lastrowid)
+        cursor.executemany(
+            "UPDATE preset_preset_sections SET name = ?, position = ?, deleted = 0 WHERE id = ?",
+            section_updates,
+        )
+        removed_sections = sec_ids[len(self.sections):]
 
+        # -- Exercises ------------------------------------------------------
+        existing: dict[int, tuple] = {}
+        for chunk in _chunks(sec_ids):
             cursor.execute(
-                "SELECT id, exercise_name, number_of_sets, rest_time, position, library_exercise_id FROM preset_section_exercises WHERE section_id = ? AND deleted = 0",
-                (section_id,),
+                "SELECT id, section_id, exercise_name, number_of_sets, rest_time, position, library_exercise_id"
+                " FROM preset_section_exercises"
+                f" WHERE deleted = 0 AND section_id IN ({_placeholders(len(chunk))})",
+                chunk,
             )
-            existing = {
-                row_id: {
-                    "name": n,
-                    "sets": s,
-                    "rest": r,
-                    "pos": p,
-                    "library_id": lib,
-                }
-                for row_id, n, s, r, p, lib in cursor.fetchall()
-            }
-            unused = set(existing.keys())
-
+            for row_id, *rest in cursor.fetchall():
+                existing[row_id] = tuple(rest)
+
+        kept: set[int] = set()
+        position_updates = []
+        full_updates = []
+        resnapshot: list[int] = []
+        inserts = []
+        new_exercises = []
+        for sec_pos, sec in enumerate(self.sections):
+            section_id = section_ids[sec_pos]
             for ex_pos, ex in enumerate(sec.get("exercises", [])):
-                cursor.execute(
-                    "SELECT id, description FROM library_exercises WHERE name = ? AND deleted = 0 ORDER BY is_user_created DESC LIMIT 1",
-                    (ex["name"],),
-                )
-                lr = cursor.fetchone()
-                if lr is None:
-                    raise ValueError(f"Exercise '{ex['name']}' does not exist")
-                lib_id, desc = lr[0], lr[1] or ""
-
+                lib_id, desc = library[ex["name"]]
                 ex_id = ex.get("id")
                 sets_val = ex.get("sets", DEFAULT_SETS_PER_EXERCISE)
                 rest_val = ex.get("rest", DEFAULT_REST_DURATION)
-
-                if ex_id is not None and ex_id in existing:
-                    row = existing[ex_id]
-                    unused.discard(ex_id)
-                    if (
-                        row["name"] == ex["name"]
-                        and row["sets"] == sets_val
-                        and row["rest"] == rest_val
-                        and row["library_id"] == lib_id
+                old = existing.get(ex_id) if ex_id is not None else None
+                if old is not None and old[0] == section_id and ex_id not in kept:
+                    kept.add(ex_id)
+                    _, name, sets, rest, pos, old_lib = old
+                    if (name, sets, rest, old_lib) == (
+                        ex["name"],
+                        sets_val,
+                        rest_val,
+                        lib_id,
                     ):
-                        if row["pos"] != ex_pos:
-                            cursor.execute(
-                                "UPDATE preset_section_exercises SET position = ? WHERE id = ?",
-                                (ex_pos, ex_id),
-                            )
+                        if pos != ex_pos:
+                            position_updates.append((ex_pos, ex_id))
                     else:
-                        cursor.execute(
-                            "UPDATE preset_section_exercises SET exercise_name = ?, exercise_description = ?, number_of_sets = ?, rest_time = ?, position = ?, library_exercise_id = ?, deleted = 0 WHERE id = ?",
-                            (
-                                ex["name"],
-                                desc,
-                                sets_val,
-                                rest_val,
-                                ex_pos,
-                                lib_id,
-                                ex_id,
-                            ),
-                        )
-
-                        if row["library_id"] != lib_id:
-                            cursor.execute(
-                                "UPDATE preset_exercise_metrics SET deleted = 1 WHERE section_exercise_id = ?",
-                                (ex_id,),
-                            )
-                            cursor.execute(
-                            """
-                            SELECT mt.name,
-                                   COALESCE(em.type, mt.type),
-                                   COALESCE(em.input_timing, mt.input_timing),
-                                   COALESCE(em.is_required, mt.is_required),
-                                   COALESCE(em.scope, mt.scope),
-                                   COALESCE(em.enum_values_json, mt.enum_values_json),
-                                  em.position,
-                                  mt.id
-                              FROM library_exercise_metrics em
-                              JOIN library_metric_types mt ON em.metric_type_id = mt.id
-                             WHERE em.exercise_id = ?
-                             ORDER BY em.position
-                            """,
-                            (lib_id,),
+                        full_updates.append(
+                            (ex["name"], desc, sets_val, rest_val, ex_pos, lib_id, ex_id)
                         )
-                        for (
-                            mt_name,
-                            m_input,
-
-                            m_timing,
-                            m_req,
-                            m_scope,
-                            m_enum_json,
-                            mpos,
-                            mt_id,
-                        ) in cursor.fetchall():
-                            cursor.execute(
-                                """INSERT INTO preset_exercise_metrics (section_exercise_id, metric_name, type, input_timing, is_required, scope, enum_values_json, position, library_metric_type_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                                (
-                                    ex_id,
-                                    mt_name,
-                                    m_input,
-
-                                    m_timing,
-                                    m_req,
-                                    m_scope,
-                                    m_enum_json,
-                                    mpos,
-                                    mt_id,
-                                ),
-                            )
+                        if old_lib != lib_id:
+                            resnapshot.append(ex_id)
                 else:
-                    cursor.execute(
-                        """INSERT INTO preset_section_exercises (section_id, exercise_name, exercise_description, position, number_of_sets, library_exercise_id, rest_time) VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            section_id,
-                            ex["name"],
-                            desc,
-                            ex_pos,
-                            sets_val,
-                            lib_id,
-                            rest_val,
-                        ),
-                    )
-                    ex_id = cursor.lastrowid
-                    ex["id"] = ex_id
-
-                    cursor.execute(
-                        """
-                        SELECT mt.name,
-                               COALESCE(em.type, mt.type),
-                               COALESCE(em.input_timing, mt.input_timing),
-                               COALESCE(em.is_required, mt.is_required),
-                               COALESCE(em.scope, mt.scope),
-                               COALESCE(em.enum_values_json, mt.enum_values_json),
-                               em.position,
-                               mt.id
-                          FROM library_exercise_metrics em
-                          JOIN library_metric_types mt ON em.metric_type_id = mt.id
-                         WHERE em.exercise_id = ?
-                         ORDER BY em.position
-                        """,
-                        (lib_id,),
+                    inserts.append(
+                        (section_id, ex["name"], desc, ex_pos, sets_val, lib_id, rest_val)
                     )
-                    for (
-                        mt_name,
-                        m_input,
-
-                        m_timing,
-                        m_req,
-                        m_scope,
-                        m_enum_json,
-                        mpos,
-                        mt_id,
-                    ) in cursor.fetchall():
-                        cursor.execute(
-                            """INSERT INTO preset_exercise_metrics (section_exercise_id, metric_name, type, input_timing, is_required, scope, enum_values_json, position, library_metric_type_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                            (
-                                ex_id,
-                                mt_name,
-                                m_input,
-
-                                m_timing,
-                                m_req,
-                                m_scope,
-                                m_enum_json,
-                                mpos,
-                                mt_id,
-                            ),
-                        )
+                    new_exercises.append(ex)
 
-            for old_id in unused:
-                cursor.execute(
-                    "UPDATE preset_exercise_metrics SET deleted = 1 WHERE section_exercise_id = ?",
-                    (old_id,),
-                )
-                cursor.execute(
-                    "UPDATE preset_section_exercises SET deleted = 1 WHERE id = ?",
-                    (old_id,),
-                )
+        cursor.executemany(
+            "UPDATE preset_section_exercises SET position = ? WHERE id = ?",
+            position_updates,
+        )
+        cursor.executemany(
+            "UPDATE preset_section_exercises SET exercise_name = ?, exercise_description = ?, number_of_sets = ?, rest_time = ?, position = ?, library_exercise_id = ?, deleted = 0 WHERE id = ?",
+            full_updates,
+        )
 
-        for sid in sec_ids[len(self.sections):]:
+        # Exercises dropped from kept sections or belonging to removed
+        # sections are soft-deleted together with their metrics.
+        removed_exercises = [row_id for row_id in existing if row_id not in kept]
+        _soft_delete_where_in(
+            cursor, "preset_exercise_metrics", "section_exercise_id", removed_exercises + resnapshot
+        )
+        _soft_delete_where_in(cursor, "preset_section_exercises", "id", removed_exercises)
+        _soft_delete_where_in(cursor, "preset_preset_sections", "id", removed_sections)
+
+        if inserts:
+            # AUTOINCREMENT ids grow monotonically, so the rows inserted by
+            # this batch are exactly those above the previous maximum.
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM preset_section_exercises")
+            max_id = cursor.fetchone()[0]
+            cursor.executemany(
+                """INSERT INTO preset_section_exercises (section_id, exercise_name, exercise_description, position, number_of_sets, library_exercise_id, rest_time) VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                inserts,
+            )
             cursor.execute(
-                "SELECT id FROM preset_section_exercises WHERE section_id = ? AND deleted = 0",
-                (sid,),
+                "SELECT id FROM preset_section_exercises WHERE id > ? ORDER BY id",
+                (max_id,),
             )
-            ex_ids = [r[0] for r in cursor.fetchall()]
-            for eid in ex_ids:
-                cursor.execute(
-                    "UPDATE preset_exercise_metrics SET deleted = 1 WHERE section_exercise_id = ?",
-                    (eid,),
-                )
-                cursor.execute(
-                    "UPDATE preset_section_exercises SET deleted = 1 WHERE id = ?",
-                    (eid,),
-                )
+            new_ids = [r[0] for r in cursor.fetchall()]
+            for ex, new_id in zip(new_exercises, new_ids):
+                ex["id"] = new_id
+            resnapshot.extend(new_ids)
+
+        for chunk in _chunks(resnapshot):
             cursor.execute(
-                "UPDATE preset_preset_sections SET deleted = 1 WHERE id = ?",
-                (sid,),
+                f"""
+                INSERT INTO preset_exercise_metrics
+                    (section_exercise_id, metric_name, type, input_timing, is_required, scope, enum_values_json, position, library_metric_type_id)
+                SELECT se.id,
+                       mt.name,
+                       COALESCE(em.type, mt.type),
+                       COALESCE(em.input_timing, mt.input_timing),
+                       COALESCE(em.is_required, mt.is_required),
+                       COALESCE(em.scope, mt.scope),
+                       COALESCE(em.enum_values_json, mt.enum_values_json),
+                       em.position,
+                       mt.id
+                  FROM preset_section_exercises se
+                  JOIN library_exercise_metrics em ON em.exercise_id = se.library_exercise_id
+                  JOIN library_metric_types mt ON em.metric_type_id = mt.id
+                 WHERE se.id IN ({_placeholders(len(chunk))}) AND em.deleted = 0
+                 ORDER BY se.id, em.position
+                """,
+                chunk,
             )
 
+    def _save_metrics(self, cursor: sqlite3.Cursor, preset_id: int) -> None:
+        """Write ``preset_metrics`` for ``preset_id``."""
+
         cursor.execute(
             "SELECT id, library_metric_type_id FROM preset_preset_metrics"
             " WHERE preset_id = ? AND deleted = 0",
             (preset_id,),
         )
-        existing = {lm_id: row_id for row_id, lm_id in cursor.fetchall()}
+        existing_metrics = {lm_id: row_id for row_id, lm_id in cursor.fetchall()}
 
-        for pos, metric in enumerate(self.preset_metrics):
+        metric_ids: dict[str, int] = {}
+        names = list({m.get("name") for m in self.preset_metrics})
+        for chunk in _chunks(names):
             cursor.execute(
-                "SELECT id FROM library_metric_types WHERE name = ? AND deleted = 0",
-                (metric.get("name"),),
+                "SELECT name, id FROM library_metric_types"
+                f" WHERE deleted = 0 AND name IN ({_placeholders(len(chunk))})"
+                " ORDER BY is_user_created, id",
+                chunk,
             )
-            row = cursor.fetchone()
-            if not row:
+            for name, mt_id in cursor.fetchall():
+                metric_ids.setdefault(name, mt_id)
+
+        metric_updates = []
+        metric_inserts = []
+        for pos, metric in enumerate(self.preset_metrics):
+            mt_id = metric_ids.get(metric.get("name"))
+            if mt_id is None:
                 continue
-            mt_id = row[0]
             enum_json = (
                 json.dumps(metric.get("values"))
                 if metric.get("type") == "enum" and metric.get("values")
                 else None
             )
-
-            if mt_id in existing:
-                cursor.execute(
-                    """
-                    UPDATE preset_preset_metrics
-                       SET type = ?,
-                           input_timing = ?,
-                           scope = ?,
-                           is_required = ?,
-                           enum_values_json = ?,
-                           position = ?,
-                           value = ?,
-                           deleted = 0
-                     WHERE id = ?
-                    """,
-                    (
-                        metric.get("type"),
-                        _to_db_timing(metric.get("input_timing")),
-                        metric.get("scope"),
-                        int(metric.get("is_required", False)),
-                        enum_json,
-                        pos,
-                        str(metric.get("value")) if metric.get("value") is not None else None,
-                        existing.pop(mt_id),
-                    ),
-                )
+            values = (
+                metric.get("type"),
+                _to_db_timing(metric.get("input_timing")),
+                metric.get("scope"),
+                int(metric.get("is_required", False)),
+                enum_json,
+                pos,
+                str(metric.get("value")) if metric.get("value") is not None else None,
+            )
+            if mt_id in existing_metrics:
+                metric_updates.append(values + (existing_metrics.pop(mt_id),))
             else:
-                cursor.execute(
-                    """
-                    INSERT INTO preset_preset_metrics
-                        (
-                            preset_id,
-                            library_metric_type_id,
-                            type,
-                            input_timing,
-                            scope,
-                            is_required,
-                            enum_values_json,
-                            position,
-                            value
-                        )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        preset_id,
-                        mt_id,
-                        metric.get("type"),
-                        _to_db_timing(metric.get("input_timing")),
-                        metric.get("scope"),
-                        int(metric.get("is_required", False)),
-                        enum_json,
-                        pos,
-                        str(metric.get("value")) if metric.get("value") is not None else None,
-                    ),
+                metric_inserts.append((preset_id, mt_id) + values)
+
+        cursor.executemany(
+            """
+            UPDATE preset_preset_metrics
+               SET type = ?,
+                   input_timing = ?,
+                   scope = ?,
+                   is_required = ?,
+                   enum_values_json = ?,
+                   position = ?,
+                   value = ?,
+                   deleted = 0
+             WHERE id = ?
+            """,
+            metric_updates,
+        )
+        cursor.executemany(
+            """
+            INSERT INTO preset_preset_metrics
+                (
+                    preset_id,
+                    library_metric_type_id,
+                    type,
+                    input_timing,
+                    scope,
+                    is_required,
+                    enum_values_json,
+                    position,
+                    value
                 )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            metric_inserts,
+        )
+        _soft_delete_where_in(
+            cursor, "preset_preset_metrics", "id", list(existing_metrics.values())
+        )
 
-        for remaining_id in existing.values():
-            cursor.execute(
-                "UPDATE preset_preset_metrics SET deleted = 1 WHERE id = ?",
-                (remaining_id,),
-            )
 
-        self.conn.commit()
-        self.mark_saved()
+tracing.register(
+    sys.modules[__name__], (WorkoutSession, Exercise, PresetEditor, LibraryCache)
+)
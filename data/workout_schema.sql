@@ -23,6 +23,12 @@ CREATE TABLE IF NOT EXISTS "library_exercises" (
 	"deleted"	BOOLEAN NOT NULL DEFAULT 0,
 	PRIMARY KEY("id" AUTOINCREMENT)
 );
+CREATE VIRTUAL TABLE IF NOT EXISTS "library_exercises_fts" USING fts5(
+	"name",
+	"description",
+	tokenize = 'unicode61 remove_diacritics 2',
+	prefix = '2 3'
+);
 CREATE TABLE IF NOT EXISTS "library_metric_types" (
 	"id"	INTEGER,
 	"name"	TEXT NOT NULL,
@@ -36,6 +42,12 @@ CREATE TABLE IF NOT EXISTS "library_metric_types" (
 	"deleted"	BOOLEAN NOT NULL DEFAULT 0,
 	PRIMARY KEY("id" AUTOINCREMENT)
 );
+CREATE VIRTUAL TABLE IF NOT EXISTS "library_metric_types_fts" USING fts5(
+	"name",
+	"description",
+	tokenize = 'unicode61 remove_diacritics 2',
+	prefix = '2 3'
+);
 CREATE TABLE IF NOT EXISTS "preset_exercise_metrics" (
 	"id"	INTEGER,
 	"section_exercise_id"	INTEGER NOT NULL,
@@ -100,6 +112,140 @@ CREATE TABLE IF NOT EXISTS "preset_section_exercises" (
 	FOREIGN KEY("library_exercise_id") REFERENCES "library_exercises"("id") ON DELETE SET NULL,
 	FOREIGN KEY("section_id") REFERENCES "preset_preset_sections"("id") ON DELETE CASCADE
 );
+CREATE TABLE IF NOT EXISTS "progress_exercise_daily" (
+	"exercise_name"	TEXT NOT NULL,
+	"period_start"	TEXT NOT NULL,
+	"sessions"	INTEGER NOT NULL DEFAULT 0,
+	"sets"	INTEGER NOT NULL DEFAULT 0,
+	"reps"	REAL NOT NULL DEFAULT 0,
+	"tonnage"	REAL NOT NULL DEFAULT 0,
+	"best_weight"	REAL,
+	"best_reps"	REAL,
+	"best_e1rm"	REAL NOT NULL DEFAULT 0,
+	PRIMARY KEY("exercise_name","period_start")
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS "progress_exercise_weekly" (
+	"exercise_name"	TEXT NOT NULL,
+	"period_start"	TEXT NOT NULL,
+	"sessions"	INTEGER NOT NULL DEFAULT 0,
+	"sets"	INTEGER NOT NULL DEFAULT 0,
+	"reps"	REAL NOT NULL DEFAULT 0,
+	"tonnage"	REAL NOT NULL DEFAULT 0,
+	"best_weight"	REAL,
+	"best_reps"	REAL,
+	"best_e1rm"	REAL NOT NULL DEFAULT 0,
+	PRIMARY KEY("exercise_name","period_start")
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS "progress_personal_records" (
+	"exercise_name"	TEXT NOT NULL,
+	"metric_name"	TEXT NOT NULL,
+	"rep_range"	INTEGER NOT NULL DEFAULT 0,
+	"value"	REAL NOT NULL,
+	"session_id"	INTEGER,
+	"achieved_at"	REAL,
+	PRIMARY KEY("exercise_name","metric_name","rep_range"),
+	FOREIGN KEY("session_id") REFERENCES "session_sessions"("id") ON DELETE SET NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS "session_exercises" (
+	"id"	INTEGER,
+	"session_id"	INTEGER NOT NULL,
+	"library_exercise_id"	INTEGER,
+	"exercise_name"	TEXT NOT NULL,
+	"position"	INTEGER NOT NULL,
+	"number_of_sets"	INTEGER NOT NULL,
+	"rest_time"	INTEGER,
+	"deleted"	BOOLEAN NOT NULL DEFAULT 0,
+	PRIMARY KEY("id" AUTOINCREMENT),
+	FOREIGN KEY("library_exercise_id") REFERENCES "library_exercises"("id") ON DELETE SET NULL,
+	FOREIGN KEY("session_id") REFERENCES "session_sessions"("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "session_sessions" (
+	"id"	INTEGER,
+	"preset_id"	INTEGER,
+	"preset_name"	TEXT NOT NULL,
+	"status"	TEXT NOT NULL DEFAULT 'in_progress' CHECK("status" IN ('in_progress', 'completed')),
+	"started_at"	REAL NOT NULL,
+	"ended_at"	REAL,
+	"rest_duration"	INTEGER NOT NULL DEFAULT 120,
+	"deleted"	BOOLEAN NOT NULL DEFAULT 0,
+	PRIMARY KEY("id" AUTOINCREMENT),
+	FOREIGN KEY("preset_id") REFERENCES "preset_presets"("id") ON DELETE SET NULL
+);
+CREATE TABLE IF NOT EXISTS "session_set_journal" (
+	"id"	INTEGER,
+	"session_id"	INTEGER NOT NULL,
+	"exercise_position"	INTEGER NOT NULL,
+	"set_number"	INTEGER NOT NULL,
+	"metrics_json"	TEXT NOT NULL,
+	"recorded_at"	REAL NOT NULL,
+	PRIMARY KEY("id" AUTOINCREMENT),
+	FOREIGN KEY("session_id") REFERENCES "session_sessions"("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "session_set_metrics" (
+	"id"	INTEGER,
+	"session_set_id"	INTEGER NOT NULL,
+	"library_metric_type_id"	INTEGER,
+	"metric_name"	TEXT NOT NULL,
+	"value"	NUMERIC,
+	"deleted"	BOOLEAN NOT NULL DEFAULT 0,
+	PRIMARY KEY("id" AUTOINCREMENT),
+	FOREIGN KEY("library_metric_type_id") REFERENCES "library_metric_types"("id") ON DELETE SET NULL,
+	FOREIGN KEY("session_set_id") REFERENCES "session_sets"("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "session_sets" (
+	"id"	INTEGER,
+	"session_exercise_id"	INTEGER NOT NULL,
+	"set_number"	INTEGER NOT NULL,
+	"completed_at"	REAL,
+	"deleted"	BOOLEAN NOT NULL DEFAULT 0,
+	PRIMARY KEY("id" AUTOINCREMENT),
+	FOREIGN KEY("session_exercise_id") REFERENCES "session_exercises"("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_library_exercise_metrics_metric_type_active" ON "library_exercise_metrics" (
+	"metric_type_id",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_preset_preset_metrics_metric_type_active" ON "preset_preset_metrics" (
+	"library_metric_type_id",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_preset_presets_name_active" ON "preset_presets" (
+	"name",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_preset_section_exercises_library_active" ON "preset_section_exercises" (
+	"library_exercise_id",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_preset_section_exercises_section_active" ON "preset_section_exercises" (
+	"section_id",
+	"position",
+	"exercise_name",
+	"number_of_sets",
+	"rest_time",
+	"library_exercise_id",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_preset_sections_preset_active" ON "preset_preset_sections" (
+	"preset_id",
+	"position",
+	"name",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_session_exercises_session_active" ON "session_exercises" (
+	"session_id",
+	"position",
+	"deleted"
+) WHERE "deleted" = 0;
+CREATE INDEX IF NOT EXISTS "idx_session_sessions_in_progress" ON "session_sessions" (
+	"started_at",
+	"preset_name",
+	"status",
+	"deleted"
+) WHERE "deleted" = 0 AND "status" = 'in_progress';
+CREATE INDEX IF NOT EXISTS "idx_session_set_journal_session" ON "session_set_journal" (
+	"session_id"
+);
 CREATE UNIQUE INDEX IF NOT EXISTS "idx_library_exercise_metric_unique_active" ON "library_exercise_metrics" (
 	"exercise_id",
 	"metric_type_id"
@@ -120,4 +266,32 @@ CREATE UNIQUE INDEX IF NOT EXISTS "idx_unique_preset_metric_active" ON "preset_p
 	"preset_id",
 	"library_metric_type_id"
 ) WHERE "deleted" = 0;
+CREATE UNIQUE INDEX IF NOT EXISTS "idx_unique_session_set_active" ON "session_sets" (
+	"session_exercise_id",
+	"set_number"
+) WHERE "deleted" = 0;
+CREATE UNIQUE INDEX IF NOT EXISTS "idx_unique_session_set_metric_active" ON "session_set_metrics" (
+	"session_set_id",
+	"metric_name"
+) WHERE "deleted" = 0;
+CREATE TRIGGER IF NOT EXISTS "library_exercises_fts_insert" AFTER INSERT ON "library_exercises" WHEN NEW."deleted" = 0 BEGIN
+	INSERT INTO "library_exercises_fts" ("rowid", "name", "description") VALUES (NEW."id", NEW."name", COALESCE(NEW."description", ''));
+END;
+CREATE TRIGGER IF NOT EXISTS "library_exercises_fts_update" AFTER UPDATE OF "name", "description", "deleted" ON "library_exercises" BEGIN
+	DELETE FROM "library_exercises_fts" WHERE "rowid" = OLD."id";
+	INSERT INTO "library_exercises_fts" ("rowid", "name", "description") SELECT NEW."id", NEW."name", COALESCE(NEW."description", '') WHERE NEW."deleted" = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS "library_exercises_fts_delete" AFTER DELETE ON "library_exercises" BEGIN
+	DELETE FROM "library_exercises_fts" WHERE "rowid" = OLD."id";
+END;
+CREATE TRIGGER IF NOT EXISTS "library_metric_types_fts_insert" AFTER INSERT ON "library_metric_types" WHEN NEW."deleted" = 0 BEGIN
+	INSERT INTO "library_metric_types_fts" ("rowid", "name", "description") VALUES (NEW."id", NEW."name", COALESCE(NEW."description", ''));
+END;
+CREATE TRIGGER IF NOT EXISTS "library_metric_types_fts_update" AFTER UPDATE OF "name", "description", "deleted" ON "library_metric_types" BEGIN
+	DELETE FROM "library_metric_types_fts" WHERE "rowid" = OLD."id";
+	INSERT INTO "library_metric_types_fts" ("rowid", "name", "description") SELECT NEW."id", NEW."name", COALESCE(NEW."description", '') WHERE NEW."deleted" = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS "library_metric_types_fts_delete" AFTER DELETE ON "library_metric_types" BEGIN
+	DELETE FROM "library_metric_types_fts" WHERE "rowid" = OLD."id";
+END;
 COMMIT;
@@ -1,7 +1,16 @@
+import sys
+from pathlib import Path
+
 from kivymd.app import MDApp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.label import MDLabel
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import maintenance  # noqa: E402
+import tracing  # noqa: E402
+
 
 class DevToolApp(MDApp):
     """Lightweight app for database maintenance tasks."""
@@ -11,16 +20,55 @@ class DevToolApp(MDApp):
         self.theme_cls.primary_palette = "Blue"
         self.theme_cls.theme_style = "Light"
         screen = MDScreen()
-        label = MDLabel(
-            text="DevTool Dashboard",
-            halign="center",
-            valign="center",
-            pos_hint={"center_x": 0.5, "center_y": 0.5},
-            font_style="H4",
+        layout = MDBoxLayout(orientation="vertical", padding="16dp", spacing="16dp")
+        layout.add_widget(
+            MDLabel(
+                text="DevTool Dashboard",
+                halign="center",
+                font_style="H4",
+                size_hint_y=None,
+                height="64dp",
+            )
+        )
+        layout.add_widget(
+            MDRaisedButton(
+                text="Run database maintenance",
+                pos_hint={"center_x": 0.5},
+                on_release=lambda *_: self.run_maintenance(),
+            )
+        )
+        layout.add_widget(
+            MDRaisedButton(
+                text="Show SQL profile",
+                pos_hint={"center_x": 0.5},
+                on_release=lambda *_: self.show_sql_profile(),
+            )
         )
-        screen.add_widget(label)
+        self.report_label = MDLabel(text="", font_style="Caption", valign="top")
+        layout.add_widget(self.report_label)
+        screen.add_widget(layout)
         return screen
 
+    def run_maintenance(self):
+        """Purge soft-deleted rows, vacuum the database and show the report."""
+
+        report = maintenance.run_maintenance()
+        self.report_label.text = maintenance.format_report(report)
+
+    def show_sql_profile(self):
+        """Show the profile the app saved on exit, or this process's own."""
+
+        report = tracing.load_snapshot()
+        if report is None:
+            if not tracing.is_enabled():
+                self.report_label.text = (
+                    f"No SQL profile found. Run the app with "
+                    f"{tracing.TRACE_ENV}=1 to record one."
+                )
+                return
+            report = tracing.PROFILER.snapshot()
+        self.report_label.text = tracing.format_report(report)
+
 
 if __name__ == "__main__":
     DevToolApp().run()
@@ -1,6 +1,13 @@
+import time
+
+# Taken before the Kivy imports so the startup report covers them
+_PROCESS_START = time.perf_counter()
+
 from kivymd.app import MDApp
 from kivy.lang import Builder
 from kivy.clock import Clock
+from kivy.factory import Factory
+from kivy.logger import Logger
 from kivy.metrics import dp
 from kivy.properties import (
     NumericProperty,
@@ -11,82 +18,218 @@ from kivy.properties import (
 )
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.textfield import MDTextField
-from kivymd.uix.slider import MDSlider
-from kivy.uix.spinner import Spinner
-from kivy.uix.scrollview import ScrollView
 from kivymd.uix.label import MDLabel
 from kivymd.uix.list import (
     OneLineListItem,
     MDList,
 )
-from kivymd.uix.selectioncontrol import MDCheckbox
 from kivymd.uix.button import MDIconButton
 from kivymd.uix.card import MDSeparator
-from kivymd.uix.dialog import MDDialog
-
-try:
-    from kivymd.uix.spinner import MDSpinner
-except Exception:  # pragma: no cover - fallback for tests without kivymd
-    from kivy.uix.spinner import Spinner as MDSpinner
 from kivymd.uix.button import MDRaisedButton
-from kivy.uix.screenmanager import NoTransition
+from kivy.uix.screenmanager import NoTransition, ScreenManager
 from pathlib import Path
+from contextlib import contextmanager
+import importlib
 import os
 import sys
-import re
-import json
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
 
 # Import core so we can always reference the up-to-date WORKOUT_PRESETS list
 import core
+import tracing
 from core import (
     WorkoutSession,
     load_workout_presets,
-    get_metrics_for_exercise,
     PresetEditor,
     DEFAULT_SETS_PER_EXERCISE,
     DEFAULT_REST_DURATION,
     DEFAULT_DB_PATH,
 )
-
-# Load workout presets from the database at startup
-load_workout_presets(DEFAULT_DB_PATH)
-import time
 import math
 
 from kivy.core.window import Window
-import string
-import sqlite3
 
 if os.name == "nt" or sys.platform.startswith("win"):
     Window.size = (280, 280 * (20 / 9))
 
-# Order of fields for metric editing popups
-METRIC_FIELD_ORDER = [
-    "name",
-    "description",
-    "type",
-    "input_timing",
-    "scope",
-    "is_required",
-]
-
-
-class LoadingDialog(MDDialog):
-    """Simple dialog displaying a spinner while work is performed."""
-
-    def __init__(self, text: str = "Loading...", **kwargs):
-        box = MDBoxLayout(
-            orientation="vertical",
-            spacing="8dp",
-            size_hint_y=None,
-            height="72dp",
+# ``is_user_created`` value passed to library searches for each filter mode
+_FILTER_USER_CREATED = {"user": True, "premade": False}
+
+# Print the startup timing report when this environment variable is set
+STARTUP_REPORT_ENV = "WORKOUT_STARTUP_REPORT"
+
+
+class StartupTimer:
+    """Record how long each startup phase takes.
+
+    :meth:`mark` closes the phase that began at the previous mark, so those
+    phases add up to the time until the first frame.  Work deferred until a
+    screen is opened is timed separately with :meth:`measure`.
+    """
+
+    def __init__(self, started: float | None = None):
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self.phases: list[tuple[str, float]] = []
+        self.deferred: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """Close ``phase`` and return its duration in seconds."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.phases.append((phase, elapsed))
+        self._last = now
+        return elapsed
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Time the wrapped block as a deferred ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.deferred.append((phase, elapsed))
+            if os.environ.get(STARTUP_REPORT_ENV):
+                Logger.info(f"Startup: {phase} took {elapsed * 1000:.1f} ms")
+
+    def report(self) -> str:
+        """Return the recorded phases as a small table in milliseconds."""
+        lines = [f"{phase:<24} {secs * 1000:8.1f} ms" for phase, secs in self.phases]
+        lines.append(f"{'total':<24} {(self._last - self.started) * 1000:8.1f} ms")
+        lines.extend(
+            f"{phase + ' *':<24} {secs * 1000:8.1f} ms"
+            for phase, secs in self.deferred
         )
-        spinner = MDSpinner(size_hint=(None, None), size=("48dp", "48dp"))
-        spinner.pos_hint = {"center_x": 0.5}
-        box.add_widget(spinner)
-        box.add_widget(MDLabel(text=text, halign="center"))
-        super().__init__(type="custom", content_cls=box, **kwargs)
+        return "\n".join(lines)
+
+    def log(self) -> None:
+        """Log :meth:`report` and the peak RSS when ``STARTUP_REPORT_ENV`` is set."""
+        if os.environ.get(STARTUP_REPORT_ENV):
+            for line in self.report().splitlines():
+                Logger.info(f"Startup: {line}")
+            rss = _peak_rss_mb()
+            if rss is not None:
+                Logger.info(f"Startup: peak rss {rss:.1f} MB")
+
+
+def _peak_rss_mb() -> float | None:
+    """Return the peak resident set size in MB, or ``None`` if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+STARTUP_TIMER = StartupTimer(_PROCESS_START)
+_presets_loaded = False
+
+
+class _Deferred:
+    """Stand-in for a widget class that is only imported when first called.
+
+    Dialogs and popups pull in a large part of KivyMD, so they are loaded the
+    first time a screen opens one rather than while the app starts.
+    """
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+        self._cls = None
+
+    def load(self):
+        if self._cls is None:
+            self._cls = getattr(importlib.import_module(self.module), self.name)
+        return self._cls
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+MDDialog = _Deferred("kivymd.uix.dialog", "MDDialog")
+LoadingDialog = _Deferred("dialogs", "LoadingDialog")
+AddMetricPopup = _Deferred("dialogs", "AddMetricPopup")
+AddPresetMetricPopup = _Deferred("dialogs", "AddPresetMetricPopup")
+AddSessionMetricPopup = _Deferred("dialogs", "AddSessionMetricPopup")
+EditMetricPopup = _Deferred("dialogs", "EditMetricPopup")
+EditMetricTypePopup = _Deferred("dialogs", "EditMetricTypePopup")
+
+
+def ensure_presets_loaded(db_path: Path = DEFAULT_DB_PATH) -> list:
+    """Load ``core.WORKOUT_PRESETS`` the first time a screen needs it."""
+    global _presets_loaded
+    if not _presets_loaded:
+        # Already filled when a preset was saved before the list was opened
+        if not core.WORKOUT_PRESETS:
+            with STARTUP_TIMER.measure("presets"):
+                load_workout_presets(db_path)
+        _presets_loaded = True
+    return core.WORKOUT_PRESETS
+
+
+# Directory holding the kv rules for the screens built on demand
+KV_DIR = Path(__file__).with_name("kv")
+
+# Screens built on first navigation, keyed by screen name.  The rules for
+# each live in ``KV_DIR / "<name>.kv"``.
+LAZY_SCREENS = {
+    "presets": "PresetsScreen",
+    "preset_detail": "PresetDetailScreen",
+    "exercise_library": "ExerciseLibraryScreen",
+    "progress": "ProgressScreen",
+    "workout_history": "WorkoutHistoryScreen",
+    "settings": "SettingsScreen",
+    "rest": "RestScreen",
+    "workout_active": "WorkoutActiveScreen",
+    "metric_input": "MetricInputScreen",
+    "workout_edit": "WorkoutEditScreen",
+    "workout_settings": "WorkoutSettingsScreen",
+    "workout_summary": "WorkoutSummaryScreen",
+    "edit_exercise": "EditExerciseScreen",
+    "edit_preset": "EditPresetScreen",
+    "preset_overview": "PresetOverviewScreen",
+    "previous_workouts": "PreviousWorkoutsScreen",
+}
+
+# Shared kv files whose rules a screen's kv file relies on
+_KV_DEPENDENCIES = {
+    "presets": ("widgets",),
+    "exercise_library": ("widgets",),
+    "workout_summary": ("widgets",),
+    "edit_preset": ("widgets",),
+    "preset_overview": ("widgets",),
+}
+
+_loaded_kv: set[str] = set()
+
+
+def load_screen_kv(name: str) -> None:
+    """Load the kv rules for screen ``name`` unless they are already loaded."""
+    for kv in _KV_DEPENDENCIES.get(name, ()) + (name,):
+        if kv not in _loaded_kv:
+            Builder.load_file(str(KV_DIR / f"{kv}.kv"))
+            _loaded_kv.add(kv)
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds screens from ``LAZY_SCREENS`` on first use.
+
+    Both ``current = name`` and :meth:`get_screen` go through
+    :meth:`get_screen`, so a screen's kv file is parsed and the screen
+    instantiated only when something first navigates to or asks for it.
+    """
+
+    def get_screen(self, name):
+        if name in LAZY_SCREENS and not self.has_screen(name):
+            with STARTUP_TIMER.measure(f"screen {name}"):
+                load_screen_kv(name)
+                self.add_widget(Factory.get(LAZY_SCREENS[name])(name=name))
+        return super().get_screen(name)
 
 
 class WorkoutActiveScreen(MDScreen):
@@ -131,14 +274,17 @@ class RestScreen(MDScreen):
     next_exercise_name = StringProperty("")
     is_ready = BooleanProperty(False)
     timer_color = ListProperty([1, 0, 0, 1])
+    records_text = StringProperty("")
 
     def on_enter(self, *args):
         session = MDApp.get_running_app().workout_session
         if session:
             self.next_exercise_name = session.next_exercise_display()
             self.target_time = session.rest_target_time
+            self.records_text = self._records_text(session.new_records)
         else:
             self.target_time = time.time() + DEFAULT_REST_DURATION
+            self.records_text = ""
         self.is_ready = False
         self.timer_color = (1, 0, 0, 1)
         self.update_timer(0)
@@ -150,6 +296,21 @@ class RestScreen(MDScreen):
             self._event.cancel()
         return super().on_leave(*args)
 
+    @staticmethod
+    def _records_text(records) -> str:
+        """Return a line announcing the records beaten by the last set."""
+
+        parts = []
+        for record in records:
+            if record["previous"] is None:
+                # The first value ever recorded is not worth announcing
+                continue
+            value = f"{record['value']:g}"
+            if record["rep_range"]:
+                value += f" x {record['rep_range']}"
+            parts.append(f"{record['metric']} {value}")
+        return "New record: " + ", ".join(parts) if parts else ""
+
     def toggle_ready(self):
         self.is_ready = not self.is_ready
         self.timer_color = (0, 1, 0, 1) if self.is_ready else (1, 0, 0, 1)
@@ -277,28 +438,23 @@ class MetricInputScreen(MDScreen):
 
     def populate_metrics(self, metrics=None):
         """Populate metric lists for previous and next sets."""
+        from kivymd.uix.textfield import MDTextField
+        from kivymd.uix.slider import MDSlider
+        from kivy.uix.spinner import Spinner
+
         app = MDApp.get_running_app()
         prev_metrics = []
         next_metrics = []
         if app.workout_session:
-            curr_ex = app.workout_session.next_exercise_name()
+            session = app.workout_session
+            curr_ex = session.next_exercise_name()
             self.exercise_name = curr_ex
-            all_metrics = get_metrics_for_exercise(
-                curr_ex, preset_name=app.workout_session.preset_name
-            )
-            prev_metrics = [
-                m for m in all_metrics if m.get("input_timing") == "post_set"
-            ]
+            prev_metrics = session.metrics_for(curr_ex, "post_set")
 
-            upcoming_ex = app.workout_session.upcoming_exercise_name()
-            next_all = (
-                get_metrics_for_exercise(
-                    upcoming_ex, preset_name=app.workout_session.preset_name
-                )
-                if upcoming_ex
-                else []
+            upcoming_ex = session.upcoming_exercise_name()
+            next_metrics = (
+                session.metrics_for(upcoming_ex, "pre_set") if upcoming_ex else []
             )
-            next_metrics = [m for m in next_all if m.get("input_timing") == "pre_set"]
         elif metrics is not None:
             prev_metrics = metrics
             next_metrics = metrics
@@ -352,6 +508,10 @@ class MetricInputScreen(MDScreen):
         self.update_header()
 
     def save_metrics(self):
+        from kivymd.uix.textfield import MDTextField
+        from kivymd.uix.slider import MDSlider
+        from kivy.uix.spinner import Spinner
+
         metrics = {}
         for row in reversed(self.prev_metric_list.children):
             name = getattr(row, "metric_name", "")
@@ -383,6 +543,8 @@ class MetricInputScreen(MDScreen):
         if app.workout_session and getattr(app, "record_new_set", False):
             finished = app.workout_session.record_metrics(metrics)
             app.record_new_set = False
+            if finished:
+                app.workout_session.save()
             if finished and self.manager:
                 self.manager.current = "workout_summary"
             elif self.manager:
@@ -414,6 +576,7 @@ class PresetsScreen(MDScreen):
             self.selected_item.theme_text_color = "Primary"
         self.selected_item = None
         self.selected_preset = ""
+        self._refresh_highlight()
         app = MDApp.get_running_app()
         if app:
             app.selected_preset = ""
@@ -429,27 +592,52 @@ class PresetsScreen(MDScreen):
         self.clear_selection()
         return super().on_leave(*args)
 
+    def _row_style(self, name: str) -> dict:
+        """Return the colour attributes of the row showing preset ``name``."""
+        if name and name == self.selected_preset:
+            return {
+                "md_bg_color": self._selected_color,
+                "theme_text_color": "Custom",
+                "text_color": self._selected_text_color,
+            }
+        return {
+            "md_bg_color": (0, 0, 0, 0),
+            "theme_text_color": "Primary",
+            "text_color": (0, 0, 0, 1),
+        }
+
+    def _refresh_highlight(self):
+        """Re-apply the selection colours to the recycled preset rows."""
+        if not self.preset_list or not self.preset_list.data:
+            return
+        for row in self.preset_list.data:
+            row.update(self._row_style(row["text"]))
+        self.preset_list.refresh_from_data()
+
     def populate(self):
         if not self.preset_list:
             return
-        self.preset_list.clear_widgets()
-        for preset in core.WORKOUT_PRESETS:
-            item = OneLineListItem(text=preset["name"])
-            item.bind(
-                on_release=lambda inst, name=preset["name"]: self.select_preset(
-                    name, inst
-                )
-            )
-            self.preset_list.add_widget(item)
+        self.preset_list.data = [
+            {
+                "text": preset["name"],
+                "release_callback": lambda row, name=preset["name"]: (
+                    self.select_preset(name, row)
+                ),
+                **self._row_style(preset["name"]),
+            }
+            for preset in ensure_presets_loaded()
+        ]
 
     def select_preset(self, name, item):
         """Select a preset from WORKOUT_PRESETS and highlight item."""
-        if self.selected_item is item:
+        # Rows are recycled, so compare by name rather than by widget
+        if self.selected_item is not None and self.selected_preset == name:
             # Toggle off selection if tapping the already selected item
             item.md_bg_color = (0, 0, 0, 0)
             item.theme_text_color = "Primary"
             self.selected_item = None
             self.selected_preset = ""
+            self._refresh_highlight()
             MDApp.get_running_app().selected_preset = ""
             return
 
@@ -463,6 +651,7 @@ class PresetsScreen(MDScreen):
         if any(p["name"] == name for p in core.WORKOUT_PRESETS):
             self.selected_preset = name
             MDApp.get_running_app().selected_preset = name
+        self._refresh_highlight()
 
     def confirm_selection(self):
         if self.selected_preset and self.manager:
@@ -485,45 +674,42 @@ class ExerciseLibraryScreen(MDScreen):
     search_text = StringProperty("")
     metric_search_text = StringProperty("")
     current_tab = StringProperty("exercises")
-    # Cached list of all exercises including user-created ones
-    all_exercises = ListProperty(None, allownone=True)
-    # Cached list of all metric types
-    all_metrics = ListProperty(None, allownone=True)
-    # Version numbers when caches were loaded
-    cache_version = NumericProperty(-1)
-    metric_cache_version = NumericProperty(-1)
+    # Shared lists from ``core.LibraryCache``; do not modify in place
+    all_exercises = ObjectProperty(None, allownone=True)
+    all_metrics = ObjectProperty(None, allownone=True)
 
     loading_dialog = ObjectProperty(None, allownone=True)
 
     _search_event = None
     _metric_search_event = None
+    _refresh_event = None
+    # ``LibraryCache.versions`` the visible list was built from
+    _shown_versions = None
 
     def on_pre_enter(self, *args):
-        app = MDApp.get_running_app()
-        if self.all_exercises is None or (
-            app and self.cache_version != getattr(app, "exercise_library_version", 0)
-        ):
-            db_path = DEFAULT_DB_PATH
-            self.all_exercises = core.get_all_exercises(
-                db_path, include_user_created=True
-            )
-            if app:
-                self.cache_version = app.exercise_library_version
+        library = core.get_library_cache(DEFAULT_DB_PATH)
+        library.subscribe(self._on_library_changed)
+        # The list only needs rebuilding if the library changed while the
+        # screen was hidden; filters and search text are kept.
+        if self._shown_versions != library.versions:
+            self.all_exercises = library.exercises()
+            self.all_metrics = library.metric_types()
+            self.populate(True)
 
-        if self.all_metrics is None or (
-            app
-            and self.metric_cache_version != getattr(app, "metric_library_version", 0)
-        ):
-            db_path = DEFAULT_DB_PATH
-            self.all_metrics = core.get_all_metric_types(
-                db_path, include_user_created=True
-            )
-            if app:
-                self.metric_cache_version = app.metric_library_version
+        return super().on_pre_enter(*args)
+
+    def _on_library_changed(self, kind, version):
+        """Rebuild the visible list after an edit; otherwise on next enter."""
+        self._shown_versions = None
+        if not self.manager or self.manager.current != self.name:
+            return
+        if self._refresh_event is None:
 
-        self.populate(True)
+            def refresh(dt):
+                self._refresh_event = None
+                self.populate()
 
-        return super().on_pre_enter(*args)
+            self._refresh_event = Clock.schedule_once(refresh, 0)
 
     def populate(self, show_loading: bool = False):
         if show_loading and not os.environ.get("KIVY_UNITTEST"):
@@ -534,6 +720,7 @@ class ExerciseLibraryScreen(MDScreen):
             self._populate_impl()
 
     def _populate_impl(self, dt: float | None = None):
+        self._shown_versions = dict(core.get_library_cache(DEFAULT_DB_PATH).versions)
         if self.current_tab == "exercises":
             self._populate_exercises()
         else:
@@ -546,26 +733,19 @@ class ExerciseLibraryScreen(MDScreen):
                 self.loading_dialog = None
             return
         self.exercise_list.data = []
-        app = MDApp.get_running_app()
-        if self.all_exercises is None or (
-            app and self.cache_version != getattr(app, "exercise_library_version", 0)
-        ):
-            db_path = DEFAULT_DB_PATH
-            self.all_exercises = core.get_all_exercises(
-                db_path, include_user_created=True
+        library = core.get_library_cache(DEFAULT_DB_PATH)
+        self.all_exercises = library.exercises()
+        exercises = library.exercise_index().search(
+            self.search_text,
+            is_user_created=_FILTER_USER_CREATED.get(self.filter_mode),
+            fuzzy=True,
+        )
+        exercises = exercises + [
+            (r["name"], r["is_user_created"])
+            for r in self._description_matches(
+                "exercise", self.search_text, self.filter_mode, exercises
             )
-            if app:
-                self.cache_version = app.exercise_library_version
-        exercises = self.all_exercises or []
-
-        mode = self.filter_mode
-        if mode == "user":
-            exercises = [ex for ex in exercises if ex[1]]
-        elif mode == "premade":
-            exercises = [ex for ex in exercises if not ex[1]]
-        if self.search_text:
-            s = self.search_text.lower()
-            exercises = [ex for ex in exercises if s in ex[0].lower()]
+        ]
         data = []
         for name, is_user in exercises:
             data.append(
@@ -589,26 +769,19 @@ class ExerciseLibraryScreen(MDScreen):
                 self.loading_dialog = None
             return
         self.metric_list.data = []
-        app = MDApp.get_running_app()
-        if self.all_metrics is None or (
-            app
-            and self.metric_cache_version != getattr(app, "metric_library_version", 0)
-        ):
-            db_path = DEFAULT_DB_PATH
-            self.all_metrics = core.get_all_metric_types(
-                db_path, include_user_created=True
-            )
-            if app:
-                self.metric_cache_version = app.metric_library_version
-        metrics = self.all_metrics or []
-        mode = self.metric_filter_mode
-        if mode == "user":
-            metrics = [m for m in metrics if m["is_user_created"]]
-        elif mode == "premade":
-            metrics = [m for m in metrics if not m["is_user_created"]]
-        if self.metric_search_text:
-            s = self.metric_search_text.lower()
-            metrics = [m for m in metrics if s in m["name"].lower()]
+        library = core.get_library_cache(DEFAULT_DB_PATH)
+        self.all_metrics = library.metric_types()
+        metrics = library.metric_index().search(
+            self.metric_search_text,
+            is_user_created=_FILTER_USER_CREATED.get(self.metric_filter_mode),
+            fuzzy=True,
+        )
+        metrics = metrics + self._description_matches(
+            "metric",
+            self.metric_search_text,
+            self.metric_filter_mode,
+            [m["name"] for m in metrics],
+        )
         data = []
         for m in metrics:
             data.append(
@@ -625,7 +798,29 @@ class ExerciseLibraryScreen(MDScreen):
             self.loading_dialog.dismiss()
             self.loading_dialog = None
 
+    def _description_matches(self, kind, text, mode, shown):
+        """Return full-text matches of ``text`` missing from ``shown``.
+
+        The name index only matches names; this adds entries whose
+        description mentions the search words, listed after the name hits.
+        """
+        if not text.strip():
+            return []
+        shown = {item[0] if isinstance(item, tuple) else item for item in shown}
+        return [
+            r
+            for r in core.search_library(
+                text,
+                DEFAULT_DB_PATH,
+                kind=kind,
+                is_user_created=_FILTER_USER_CREATED.get(mode),
+            )
+            if r["name"] not in shown
+        ]
+
     def open_filter_popup(self):
+        from kivy.uix.scrollview import ScrollView
+
         list_view = MDList()
         options = [
             ("User Created", "user"),
@@ -704,13 +899,8 @@ class ExerciseLibraryScreen(MDScreen):
                 core.delete_exercise(
                     exercise_name, db_path=db_path, is_user_created=True
                 )
-                app = MDApp.get_running_app()
-                if app:
-                    app.exercise_library_version += 1
             except Exception:
                 pass
-            self.all_exercises = None
-            self.populate()
             if dialog:
                 dialog.dismiss()
 
@@ -733,13 +923,8 @@ class ExerciseLibraryScreen(MDScreen):
                 core.delete_metric_type(
                     metric_name, db_path=db_path, is_user_created=True
                 )
-                app = MDApp.get_running_app()
-                if app:
-                    app.metric_library_version += 1
             except Exception:
                 pass
-            self.all_metrics = None
-            self.populate()
             if dialog:
                 dialog.dismiss()
 
@@ -797,7 +982,7 @@ class PresetOverviewScreen(MDScreen):
     def populate(self):
         if not self.overview_list or not self.preset_label:
             return
-        self.overview_list.clear_widgets()
+        self.overview_list.data = []
         app = MDApp.get_running_app()
         preset_name = app.selected_preset
         self.preset_label.text = (
@@ -805,12 +990,12 @@ class PresetOverviewScreen(MDScreen):
             if preset_name
             else "Preset Overview - summary of the chosen preset"
         )
-        for p in core.WORKOUT_PRESETS:
+        for p in ensure_presets_loaded():
             if p["name"] == preset_name:
-                for ex in p["exercises"]:
-                    self.overview_list.add_widget(
-                        OneLineListItem(text=f"{ex['name']} - sets: {ex['sets']}")
-                    )
+                self.overview_list.data = [
+                    {"text": f"{ex['name']} - sets: {ex['sets']}"}
+                    for ex in p["exercises"]
+                ]
                 break
 
     def start_workout(self):
@@ -831,19 +1016,59 @@ class WorkoutSummaryScreen(MDScreen):
     def populate(self):
         if not self.summary_list:
             return
-        self.summary_list.clear_widgets()
+        self.summary_list.data = []
         app = MDApp.get_running_app()
         session = app.workout_session
         if not session:
             return
         print(session.summary())
+        data = []
         for exercise in session.exercises:
-            self.summary_list.add_widget(OneLineListItem(text=exercise["name"]))
+            data.append({"text": exercise["name"]})
             for idx, metrics in enumerate(exercise["results"], 1):
                 metrics_text = ", ".join(f"{k}: {v}" for k, v in metrics.items())
-                self.summary_list.add_widget(
-                    OneLineListItem(text=f"Set {idx}: {metrics_text}")
-                )
+                data.append({"text": f"Set {idx}: {metrics_text}"})
+        self.summary_list.data = data
+
+
+def _reconcile_children(box, items, key_attr, build, update) -> None:
+    """Make ``box`` display one widget per entry of ``items``, in order.
+
+    Widgets are matched to entries by identity through ``key_attr``, which
+    holds the dict each widget displays.  Matched widgets are kept and passed
+    to ``update(index, widget)``, ``build(index, item)`` creates widgets for
+    new entries, and widgets whose entry is gone are removed.  Only widgets
+    that are out of place are moved, so a small edit touches few widgets.
+    """
+    existing = {}
+    for child in box.children:
+        item = getattr(child, key_attr, None)
+        if item is not None:
+            existing[id(item)] = child
+
+    wanted = []
+    for idx, item in enumerate(items):
+        widget = existing.pop(id(item), None)
+        if widget is None:
+            widget = build(idx, item)
+        else:
+            update(idx, widget)
+        wanted.append(widget)
+
+    keep = {id(widget) for widget in wanted}
+    for child in list(box.children):
+        if id(child) not in keep:
+            box.remove_widget(child)
+
+    # ``children`` is stored last-to-first, so display position ``pos`` is
+    # ``children[len(children) - 1 - pos]``
+    for pos, widget in enumerate(wanted):
+        count = len(box.children)
+        if pos < count and box.children[count - 1 - pos] is widget:
+            continue
+        if widget.parent is box:
+            box.remove_widget(widget)
+        box.add_widget(widget, index=len(box.children) - pos)
 
 
 class SectionWidget(MDBoxLayout):
@@ -851,6 +1076,8 @@ class SectionWidget(MDBoxLayout):
 
     section_name = StringProperty("Section")
     section_index = NumericProperty(0)
+    # Section dict from ``PresetEditor.sections`` this widget displays
+    section_data = ObjectProperty(None, allownone=True)
     color = ListProperty([1, 1, 1, 1])
     expanded = BooleanProperty(True)
     visible = BooleanProperty(True)
@@ -879,24 +1106,34 @@ class SectionWidget(MDBoxLayout):
             edit.open_exercise_panel()
 
     def refresh_exercises(self):
+        """Bring the exercise widgets in line with the preset editor."""
         app = MDApp.get_running_app()
         if not app.preset_editor:
             return
         if self.section_index >= len(app.preset_editor.sections):
             return
-        box = self.ids.exercise_list
-        box.clear_widgets()
-        for idx, ex in enumerate(
-            app.preset_editor.sections[self.section_index]["exercises"]
-        ):
-            box.add_widget(
-                SelectedExerciseItem(
-                    text=ex["name"],
-                    section_index=self.section_index,
-                    exercise_index=idx,
-                )
+
+        def build(idx, ex):
+            return SelectedExerciseItem(
+                text=ex["name"],
+                section_index=self.section_index,
+                exercise_index=idx,
+                exercise_data=ex,
             )
 
+        def update(idx, item):
+            item.text = item.exercise_data["name"]
+            item.section_index = self.section_index
+            item.exercise_index = idx
+
+        _reconcile_children(
+            self.ids.exercise_list,
+            app.preset_editor.sections[self.section_index]["exercises"],
+            "exercise_data",
+            build,
+            update,
+        )
+
     def _update_indices(self) -> None:
         """Update ``exercise_index`` on child widgets to match their order."""
         box = self.ids.exercise_list
@@ -923,12 +1160,21 @@ class SectionWidget(MDBoxLayout):
 
     def add_exercise_widget(self, name: str, idx: int) -> None:
         """Append a single exercise widget to the list."""
+        ex = None
+        app = MDApp.get_running_app()
+        if app and app.preset_editor and self.section_index < len(
+            app.preset_editor.sections
+        ):
+            exercises = app.preset_editor.sections[self.section_index]["exercises"]
+            if 0 <= idx < len(exercises):
+                ex = exercises[idx]
         box = self.ids.exercise_list
         box.add_widget(
             SelectedExerciseItem(
                 text=name,
                 section_index=self.section_index,
                 exercise_index=idx,
+                exercise_data=ex,
             )
         )
 
@@ -991,6 +1237,7 @@ class EditPresetScreen(MDScreen):
             self.save_enabled = False
 
     def on_pre_enter(self, *args):
+        core.get_library_cache(DEFAULT_DB_PATH).subscribe(self._on_library_changed)
         app = MDApp.get_running_app()
         if app and app.editing_exercise_index >= 0:
             self.preset_name = app.preset_editor.preset_name or "Preset"
@@ -1021,28 +1268,66 @@ class EditPresetScreen(MDScreen):
         app.init_preset_editor()
         self.preset_name = app.preset_editor.preset_name or "Preset"
         self.current_tab = "sections"
-        if self.sections_box:
-            self.sections_box.clear_widgets()
-            for idx, sec in enumerate(app.preset_editor.sections):
-                self.add_section(sec["name"], index=idx)
-            if not app.preset_editor.sections:
-                self.add_section()
+        self.refresh_sections()
         self.update_save_enabled()
         if self.loading_dialog:
             self.loading_dialog.dismiss()
             self.loading_dialog = None
 
     def refresh_sections(self):
-        """Repopulate the section widgets from the preset editor."""
+        """Bring the section widgets in line with the preset editor.
+
+        Existing widgets are kept and re-indexed; only sections that were
+        added or removed since the last refresh create or drop widgets.
+        """
         app = MDApp.get_running_app()
         if not self.sections_box:
             return
-        self.sections_box.clear_widgets()
-        for idx, sec in enumerate(app.preset_editor.sections):
-            self.add_section(sec["name"], index=idx)
+
+        def update(idx, section):
+            section.section_index = idx
+            name = section.section_data["name"]
+            if section.section_name != name:
+                section.section_name = name
+            section.refresh_exercises()
+
+        _reconcile_children(
+            self.sections_box,
+            app.preset_editor.sections,
+            "section_data",
+            self._build_section,
+            update,
+        )
         if not app.preset_editor.sections:
             self.add_section()
 
+    def undo(self):
+        """Revert the last preset edit and refresh the affected widgets."""
+        app = MDApp.get_running_app()
+        if app.preset_editor and app.preset_editor.undo():
+            self._after_history_change()
+
+    def redo(self):
+        """Re-apply the last undone preset edit."""
+        app = MDApp.get_running_app()
+        if app.preset_editor and app.preset_editor.redo():
+            self._after_history_change()
+
+    def _after_history_change(self):
+        self.refresh_sections()
+        if self.current_tab == "details":
+            self.populate_details()
+        elif self.current_tab == "metrics":
+            self.populate_metrics()
+        self.update_save_enabled()
+
+    def _on_library_changed(self, kind, version):
+        """Refresh the lists built from library data when it changes."""
+        if kind == "exercises" and self.panel_visible and self.exercise_panel:
+            self.exercise_panel.populate_exercises()
+        elif kind == "metrics" and self.current_tab == "metrics":
+            self.populate_metrics()
+
     def open_exercise_panel(self):
         if self.exercise_panel:
             self.exercise_panel.on_open()
@@ -1080,13 +1365,23 @@ class EditPresetScreen(MDScreen):
             if not name:
                 name = f"Section {len(app.preset_editor.sections) + 1}"
             index = app.preset_editor.add_section(name)
-        color = self._colors[len(self.sections_box.children) % len(self._colors)]
-        section = SectionWidget(section_name=name, color=color, section_index=index)
+        section = self._build_section(index, app.preset_editor.sections[index])
         self.sections_box.add_widget(section)
-        section.refresh_exercises()
         self.update_save_enabled()
         return section
 
+    def _build_section(self, index: int, sec: dict) -> SectionWidget:
+        """Create the widget for section ``sec`` at ``index``."""
+        color = self._colors[index % len(self._colors)]
+        section = SectionWidget(
+            section_name=sec["name"],
+            color=color,
+            section_index=index,
+            section_data=sec,
+        )
+        section.refresh_exercises()
+        return section
+
     def switch_tab(self, tab: str):
         """Switch between the sections, details, and metrics tabs."""
         if tab in ("sections", "details", "metrics"):
@@ -1105,6 +1400,11 @@ class EditPresetScreen(MDScreen):
         self.update_save_enabled()
 
     def populate_details(self):
+        from kivymd.uix.textfield import MDTextField
+        from kivymd.uix.slider import MDSlider
+        from kivy.uix.spinner import Spinner
+        from kivymd.uix.selectioncontrol import MDCheckbox
+
         if not self.details_box or not self.metrics_box:
             return
         self.ids.preset_name.text = self.preset_name
@@ -1216,7 +1516,7 @@ class EditPresetScreen(MDScreen):
 
         all_defs = {
             m["name"]: m
-            for m in core.get_all_metric_types(include_user_created=True)
+            for m in core.get_library_cache(DEFAULT_DB_PATH).metric_types()
         }
 
         rv.data = [
@@ -1298,7 +1598,7 @@ class EditPresetScreen(MDScreen):
             def discard(*args):
                 if dialog:
                     dialog.dismiss()
-                app.init_preset_editor(force_reload=True)
+                app.preset_editor.discard()
                 if self.manager:
                     self.manager.current = "presets"
 
@@ -1324,6 +1624,8 @@ class SelectedExerciseItem(MDBoxLayout):
     text = StringProperty("")
     section_index = NumericProperty(0)
     exercise_index = NumericProperty(0)
+    # Exercise dict from ``PresetEditor.sections`` this widget displays
+    exercise_data = ObjectProperty(None, allownone=True)
 
     def edit(self):
         """Open the EditExerciseScreen for this exercise."""
@@ -1424,8 +1726,6 @@ class ExerciseSelectionPanel(MDBoxLayout):
     filter_mode = StringProperty("both")
     filter_dialog = ObjectProperty(None, allownone=True)
     search_text = StringProperty("")
-    all_exercises = ListProperty(None, allownone=True)
-    cache_version = NumericProperty(-1)
 
     _search_event = None
 
@@ -1435,36 +1735,22 @@ class ExerciseSelectionPanel(MDBoxLayout):
     def populate_exercises(self):
         if not self.exercise_list:
             return
-        self.exercise_list.clear_widgets()
 
-        app = MDApp.get_running_app()
-        if self.all_exercises is None or (
-            app and self.cache_version != getattr(app, "exercise_library_version", 0)
-        ):
-            db_path = DEFAULT_DB_PATH
-            self.all_exercises = core.get_all_exercises(
-                db_path, include_user_created=True
-            )
-            if app:
-                self.cache_version = app.exercise_library_version
-
-        exercises = self.all_exercises or []
-        if self.filter_mode == "user":
-            exercises = [ex for ex in exercises if ex[1]]
-        elif self.filter_mode == "premade":
-            exercises = [ex for ex in exercises if not ex[1]]
-        if self.search_text:
-            s = self.search_text.lower()
-            exercises = [ex for ex in exercises if s in ex[0].lower()]
+        exercises = core.get_library_cache(DEFAULT_DB_PATH).exercise_index().search(
+            self.search_text,
+            is_user_created=_FILTER_USER_CREATED.get(self.filter_mode),
+            fuzzy=True,
+        )
 
-        for name, is_user in exercises:
-            item = OneLineListItem(
-                text=name,
-                theme_text_color="Custom",
-                text_color=(0.6, 0.2, 0.8, 1) if is_user else (0, 0, 0, 1),
-            )
-            item.bind(on_release=lambda inst, n=name: self.select_exercise(n))
-            self.exercise_list.add_widget(item)
+        self.exercise_list.data = [
+            {
+                "text": name,
+                "theme_text_color": "Custom",
+                "text_color": (0.6, 0.2, 0.8, 1) if is_user else (0, 0, 0, 1),
+                "release_callback": lambda row, n=name: self.select_exercise(n),
+            }
+            for name, is_user in exercises
+        ]
 
     def select_exercise(self, name):
         """Add ``name`` to the current section."""
@@ -1485,6 +1771,8 @@ class ExerciseSelectionPanel(MDBoxLayout):
         pass
 
     def open_filter_popup(self):
+        from kivy.uix.scrollview import ScrollView
+
         list_view = MDList()
         options = [
             ("User Created", "user"),
@@ -1527,1066 +1815,6 @@ class ExerciseSelectionPanel(MDBoxLayout):
         self.populate_exercises()
 
 
-class AddMetricPopup(MDDialog):
-    """Popup dialog for choosing an action, selecting metrics or creating a new one."""
-
-    def __init__(self, screen: "EditExerciseScreen", mode: str = "select", **kwargs):
-        self.screen = screen
-        self.mode = mode
-
-        if mode == "select":
-            content, buttons, title = self._build_select_widgets()
-        elif mode == "new":
-            content, buttons, title = self._build_new_metric_widgets()
-        else:  # initial choice
-            content, buttons, title = self._build_choice_widgets()
-
-        super().__init__(
-            title=title, type="custom", content_cls=content, buttons=buttons, **kwargs
-        )
-
-    # ------------------------------------------------------------------
-    # Building widgets for both modes
-    # ------------------------------------------------------------------
-    def _build_select_widgets(self):
-        metrics = core.get_all_metric_types()
-        existing = {m.get("name") for m in self.screen.exercise_obj.metrics}
-        metrics = [
-            m
-            for m in metrics
-            if m["name"] not in existing and m.get("scope") in ("set", "exercise")
-        ]
-        list_view = MDList()
-        for m in metrics:
-            item = OneLineListItem(text=m["name"])
-            item.bind(on_release=lambda inst, name=m["name"]: self.add_metric(name))
-            list_view.add_widget(item)
-
-        scroll = ScrollView(do_scroll_y=True, size_hint_y=None, height=dp(400))
-        scroll.add_widget(list_view)
-
-        new_btn = MDRaisedButton(
-            text="New Metric", on_release=self.show_new_metric_form
-        )
-        cancel_btn = MDRaisedButton(text="Cancel", on_release=lambda *a: self.dismiss())
-        buttons = [new_btn, cancel_btn]
-        return scroll, buttons, "Select Metric"
-
-    def _build_new_metric_widgets(self):
-        default_height = dp(48)
-        self.input_widgets = {}
-
-        schema = core.get_metric_type_schema()
-        if not schema:
-            schema = [
-                {"name": "name"},
-                {"name": "description"},
-                {
-                    "name": "type",
-                    "options": ["int", "float", "str", "bool", "enum", "slider"],
-                },
-
-                {
-                    "name": "input_timing",
-                    "options": [
-                        "preset",
-                        "pre_session",
-                        "post_session",
-                        "pre_set",
-                        "post_set",
-                    ],
-                },
-                {
-                    "name": "scope",
-                    "options": ["session", "section", "exercise", "set"],
-                },
-                {"name": "is_required"},
-            ]
-        else:
-            order_map = {field["name"]: field for field in schema}
-            schema = [
-                order_map[name] for name in METRIC_FIELD_ORDER if name in order_map
-            ] + [field for field in schema if field["name"] not in METRIC_FIELD_ORDER]
-
-        form = MDBoxLayout(
-            orientation="vertical",
-            spacing="8dp",
-            size_hint_y=None,
-        )
-        form.bind(minimum_height=form.setter("height"))
-
-        def enable_auto_resize(text_field: MDTextField):
-            text_field.bind(
-                text=lambda inst, val: setattr(
-                    inst, "height", max(default_height, inst.minimum_height)
-                )
-            )
-
-        for field in schema:
-            name = field["name"]
-            if name == "enum_values_json":
-                # handled separately via ``enum_values_field``
-                continue
-            options = field.get("options")
-            if name == "is_required":
-                row = MDBoxLayout(
-                    orientation="horizontal", size_hint_y=None, height="40dp"
-                )
-                widget = MDCheckbox(size_hint_y=None, height=default_height)
-                row.add_widget(widget)
-                row.add_widget(MDLabel(text="Required"))
-                form.add_widget(row)
-            elif options:
-                widget = Spinner(
-                    text=options[0],
-                    values=options,
-                    size_hint_y=None,
-                    height=default_height,
-                )
-                form.add_widget(widget)
-            else:
-                # Older versions of KivyMD do not accept the
-                # ``hint_text_font_size`` kwarg. Set the property
-                # after creation to avoid ``TypeError``.
-                widget = MDTextField(
-                    hint_text=name.replace("_", " ").title(),
-                    size_hint_y=None,
-                    height=default_height,
-                    multiline=True,
-                )
-                widget.hint_text_font_size = "12sp"
-                enable_auto_resize(widget)
-                form.add_widget(widget)
-
-            self.input_widgets[name] = widget
-
-        # Text box for enum values. This field only appears when the
-        # metric's type is ``enum``.
-        self.enum_values_field = MDTextField(
-            hint_text="Enum Values (comma separated)",
-            size_hint_y=None,
-            height=default_height,
-            multiline=True,
-        )
-        self.enum_values_field.hint_text_font_size = "12sp"
-        enable_auto_resize(self.enum_values_field)
-
-        # Helper that toggles visibility based on ``type``.
-
-        def update_enum_visibility(*args):
-            show = self.input_widgets["type"].text == "enum"
-            has_parent = self.enum_values_field.parent is not None
-            if show and not has_parent:
-                form.add_widget(self.enum_values_field)
-            elif not show and has_parent:
-                form.remove_widget(self.enum_values_field)
-
-        def update_enum_filter(*args):
-            metric_type = self.input_widgets["type"].text
-            if metric_type == "int":
-                allowed = string.digits + ","
-            elif metric_type == "float":
-                allowed = string.digits + ",."
-
-            else:  # default to str
-                allowed = string.ascii_letters + " ,"
-
-            def _filter(value, from_undo):
-                filtered = "".join(ch for ch in value if ch in allowed)
-                return re.sub(r",\s+", ",", filtered)
-
-            self.enum_values_field.input_filter = _filter
-
-        if "type" in self.input_widgets:
-            self.input_widgets["type"].bind(text=lambda *a: (update_enum_visibility(), update_enum_filter()))
-
-            update_enum_visibility()
-            update_enum_filter()
-
-        layout = ScrollView(do_scroll_y=True, size_hint_y=None, height=dp(400))
-        layout.add_widget(form)
-
-        save_btn = MDRaisedButton(text="Save", on_release=self.save_metric)
-        back_btn = MDRaisedButton(text="Back", on_release=lambda *a: self.dismiss())
-        buttons = [save_btn, back_btn]
-        return layout, buttons, "New Metric"
-
-    def _build_choice_widgets(self):
-        label = MDLabel(text="Choose an option", halign="center")
-        add_btn = MDRaisedButton(text="Add Metric", on_release=self.show_metric_list)
-        new_btn = MDRaisedButton(
-            text="New Metric", on_release=self.show_new_metric_form
-        )
-        cancel_btn = MDRaisedButton(text="Cancel", on_release=lambda *a: self.dismiss())
-        content = MDBoxLayout(orientation="vertical", spacing="8dp")
-        content.add_widget(label)
-        buttons = [add_btn, new_btn, cancel_btn]
-        return content, buttons, "Metric Options"
-
-    # ------------------------------------------------------------------
-    # Mode switching helpers
-    # ------------------------------------------------------------------
-    def show_new_metric_form(self, *args):
-        self.dismiss()
-        popup = AddMetricPopup(self.screen, mode="new")
-        popup.open()
-
-    def show_metric_list(self, *args):
-        self.dismiss()
-        popup = AddMetricPopup(self.screen, mode="select")
-        popup.open()
-
-    def add_metric(self, name, *args):
-        """Add the selected metric type to the exercise object."""
-        metric_defs = core.get_all_metric_types()
-        for m in metric_defs:
-            if m["name"] == name:
-                self.screen.exercise_obj.add_metric(m)
-                break
-        self.dismiss()
-        self.screen.populate()
-        self.screen.save_enabled = self.screen.exercise_obj.is_modified()
-
-    def save_metric(self, *args):
-        """Validate fields and add the new metric to the exercise object."""
-        errors = []
-
-        name = self.input_widgets["name"].text.strip()
-        metric_type = self.input_widgets["type"].text
-
-
-        if not name:
-            errors.append("name")
-
-        # check for duplicate metric name
-        existing_names = {m.get("name") for m in self.screen.exercise_obj.metrics}
-        if name and name in existing_names:
-            errors.append("name")
-            if hasattr(self.input_widgets["name"], "helper_text"):
-                self.input_widgets["name"].helper_text = "Duplicate name"
-                self.input_widgets["name"].helper_text_mode = "on_error"
-
-        values = []
-        if metric_type == "enum":
-
-            text = self.enum_values_field.text.strip()
-            if not text:
-                errors.append("enum_values")
-            else:
-                values = [v.strip() for v in text.split(",") if v.strip()]
-                if not values:
-                    errors.append("enum_values")
-
-        red = (1, 0, 0, 1)
-        for key, widget in self.input_widgets.items():
-            if isinstance(widget, Spinner):
-                widget.text_color = red if key in errors else (1, 1, 1, 1)
-            elif isinstance(widget, MDTextField):
-                widget.error = key in errors
-        self.enum_values_field.error = "enum_values" in errors
-
-        if errors:
-            return
-
-        metric = {}
-        for key, widget in self.input_widgets.items():
-            if isinstance(widget, MDCheckbox):
-                metric[key] = bool(widget.active)
-            else:
-                metric[key] = widget.text
-        metric_type = metric.pop("type", mtype)
-        metric["type"] = metric_type
-        if values:
-            metric["values"] = values
-
-        db_path = DEFAULT_DB_PATH
-        try:
-            core.add_metric_type(
-                metric["name"],
-                metric["type"],
-                metric["input_timing"],
-                metric["scope"],
-                metric.get("description", ""),
-                metric.get("is_required", False),
-                metric.get("values"),
-                db_path=db_path,
-            )
-        except sqlite3.IntegrityError:
-            self.input_widgets["name"].error = True
-            return
-
-        app = MDApp.get_running_app()
-        if app:
-            app.metric_library_version += 1
-
-        self.screen.exercise_obj.add_metric(metric)
-        self.screen.populate()
-        self.screen.save_enabled = self.screen.exercise_obj.is_modified()
-        self.show_metric_list()
-
-
-class AddPresetMetricPopup(MDDialog):
-    """Popup for adding preset-level metrics."""
-
-    def __init__(self, screen: "EditPresetScreen", **kwargs):
-        self.screen = screen
-        content, buttons = self._build_widgets()
-        super().__init__(
-            title="Select Metric", type="custom", content_cls=content, buttons=buttons, **kwargs
-        )
-
-    def _build_widgets(self):
-        app = MDApp.get_running_app()
-        existing = set()
-        if app and app.preset_editor:
-            existing = {m.get("name") for m in app.preset_editor.preset_metrics}
-        metrics = [
-            m
-            for m in core.get_all_metric_types()
-            if m.get("scope") == "preset" and m.get("name") not in existing
-        ]
-
-        list_view = MDList()
-        for m in metrics:
-            item = OneLineListItem(text=m["name"])
-            item.bind(on_release=lambda inst, name=m["name"]: self.add_metric(name))
-            list_view.add_widget(item)
-
-        scroll = ScrollView(do_scroll_y=True, size_hint_y=None, height=dp(400))
-        scroll.add_widget(list_view)
-
-        cancel_btn = MDRaisedButton(text="Cancel", on_release=lambda *a: self.dismiss())
-        buttons = [cancel_btn]
-        return scroll, buttons
-
-    def add_metric(self, name, *args):
-        app = MDApp.get_running_app()
-        if app and app.preset_editor:
-            app.preset_editor.add_metric(name)
-        self.dismiss()
-        self.screen.populate_details()
-        self.screen.update_save_enabled()
-
-
-class AddSessionMetricPopup(MDDialog):
-    """Popup for adding session-level metrics."""
-
-    def __init__(self, screen: "EditPresetScreen", **kwargs):
-        self.screen = screen
-        content, buttons = self._build_widgets()
-        super().__init__(
-            title="Select Metric",
-            type="custom",
-            content_cls=content,
-            buttons=buttons,
-            **kwargs,
-        )
-
-    def _build_widgets(self):
-        app = MDApp.get_running_app()
-        existing = set()
-        if app and app.preset_editor:
-            existing = {m.get("name") for m in app.preset_editor.preset_metrics}
-        metrics = [
-            m
-            for m in core.get_all_metric_types()
-            if m.get("scope") == "session" and m.get("name") not in existing
-        ]
-
-        list_view = MDList()
-        for m in metrics:
-            item = OneLineListItem(text=m["name"])
-            item.bind(on_release=lambda inst, name=m["name"]: self.add_metric(name))
-            list_view.add_widget(item)
-
-        scroll = ScrollView(do_scroll_y=True, size_hint_y=None, height=dp(400))
-        scroll.add_widget(list_view)
-
-        cancel_btn = MDRaisedButton(text="Cancel", on_release=lambda *a: self.dismiss())
-        buttons = [cancel_btn]
-        return scroll, buttons
-
-    def add_metric(self, name, *args):
-        app = MDApp.get_running_app()
-        if app and app.preset_editor:
-            app.preset_editor.add_metric(name)
-        self.dismiss()
-        self.screen.populate_metrics()
-        self.screen.update_save_enabled()
-
-
-class EditMetricPopup(MDDialog):
-    """Popup for editing an existing metric."""
-
-    def __init__(self, screen: "EditExerciseScreen", metric: dict, **kwargs):
-        self.screen = screen
-        self.metric = metric
-        content, buttons, title = self._build_widgets()
-        super().__init__(
-            title=title, type="custom", content_cls=content, buttons=buttons, **kwargs
-        )
-
-    def _build_widgets(self):
-        default_height = dp(48)
-        self.input_widgets = {}
-
-        schema = core.get_metric_type_schema()
-        if not schema:
-            schema = [
-                {"name": "name"},
-                {"name": "description"},
-                {
-                    "name": "type",
-                    "options": ["int", "float", "str", "bool", "enum", "slider"],
-                },
-                {
-                    "name": "input_timing",
-                    "options": [
-                        "preset",
-                        "pre_session",
-                        "post_session",
-                        "pre_set",
-                        "post_set",
-                    ],
-                },
-                {
-                    "name": "scope",
-                    "options": ["session", "section", "exercise", "set"],
-                },
-                {"name": "is_required"},
-            ]
-        else:
-            order_map = {field["name"]: field for field in schema}
-            schema = [
-                order_map[name] for name in METRIC_FIELD_ORDER if name in order_map
-            ] + [field for field in schema if field["name"] not in METRIC_FIELD_ORDER]
-
-        form = MDBoxLayout(
-            orientation="vertical",
-            spacing="8dp",
-            size_hint_y=None,
-        )
-        form.bind(minimum_height=form.setter("height"))
-
-        def enable_auto_resize(text_field: MDTextField):
-            text_field.bind(
-                text=lambda inst, val: setattr(
-                    inst, "height", max(default_height, inst.minimum_height)
-                )
-            )
-
-        for field in schema:
-            name = field["name"]
-            if name == "enum_values_json":
-                # handled separately below
-                continue
-            options = field.get("options")
-            if name == "is_required":
-                row = MDBoxLayout(
-                    orientation="horizontal", size_hint_y=None, height="40dp"
-                )
-                widget = MDCheckbox(size_hint_y=None, height=default_height)
-                row.add_widget(widget)
-                row.add_widget(MDLabel(text="Required"))
-                form.add_widget(row)
-            elif options:
-                widget = Spinner(
-                    text=options[0],
-                    values=options,
-                    size_hint_y=None,
-                    height=default_height,
-                )
-                form.add_widget(widget)
-            else:
-                widget = MDTextField(
-                    hint_text=name.replace("_", " ").title(),
-                    size_hint_y=None,
-                    height=default_height,
-                    multiline=True,
-                )
-                enable_auto_resize(widget)
-                form.add_widget(widget)
-
-            self.input_widgets[name] = widget
-
-        # Text box for enum values shown when ``type`` is ``enum``
-        self.enum_values_field = MDTextField(
-            hint_text="Enum Values (comma separated)",
-            size_hint_y=None,
-            height=default_height,
-            multiline=True,
-        )
-        self.enum_values_field.hint_text_font_size = "12sp"
-        enable_auto_resize(self.enum_values_field)
-
-        # populate values
-        for key, widget in self.input_widgets.items():
-            if key not in self.metric:
-                continue
-            value = self.metric[key]
-            if isinstance(widget, MDCheckbox):
-                widget.active = bool(value)
-            elif isinstance(widget, Spinner):
-                if value in widget.values:
-                    widget.text = value
-            elif isinstance(widget, MDTextField):
-                widget.text = str(value)
-
-        # populate enum values
-        metric_type = self.metric.get("type", "str")
-        if metric_type == "enum":
-            if self.enum_values_field.parent is None:
-                form.add_widget(self.enum_values_field)
-            values = ", ".join(self.metric.get("values", []))
-            self.enum_values_field.text = values
-        else:
-            if self.enum_values_field.parent is not None:
-                form.remove_widget(self.enum_values_field)
-
-        def update_enum_visibility(*args):
-            show = self.input_widgets["type"].text == "enum"
-            has_parent = self.enum_values_field.parent is not None
-            if show and not has_parent:
-                form.add_widget(self.enum_values_field)
-            elif not show and has_parent:
-                form.remove_widget(self.enum_values_field)
-
-        def update_enum_filter(*args):
-            mtype = self.input_widgets["type"].text
-            if mtype == "int":
-                allowed = string.digits + ","
-            elif mtype in ("float", "slider"):
-                allowed = string.digits + ".,"
-            else:
-                allowed = string.ascii_letters + " ,"
-
-            def _filter(value, from_undo):
-                filtered = "".join(ch for ch in value if ch in allowed)
-                return re.sub(r",\s+", ",", filtered)
-
-            self.enum_values_field.input_filter = _filter
-
-        if "type" in self.input_widgets:
-            self.input_widgets["type"].bind(text=lambda *a: (update_enum_filter(), update_enum_visibility()))
-            update_enum_visibility()
-            update_enum_filter()
-
-        layout = ScrollView(do_scroll_y=True, size_hint_y=None, height=dp(400))
-        layout.add_widget(form)
-
-        save_btn = MDRaisedButton(text="Save", on_release=self.save_metric)
-        cancel_btn = MDRaisedButton(text="Cancel", on_release=lambda *a: self.dismiss())
-        buttons = [save_btn, cancel_btn]
-        return layout, buttons, "Edit Metric"
-
-    def save_metric(self, *args):
-        """Update the metric on the exercise object with the new values."""
-        errors = []
-        updates = {}
-        for key, widget in self.input_widgets.items():
-            if isinstance(widget, MDCheckbox):
-                updates[key] = bool(widget.active)
-            else:
-                updates[key] = widget.text
-
-        if "type" in updates:
-            updates["type"] = updates.pop("type")
-
-
-        if self.enum_values_field.parent is not None:
-            text = self.enum_values_field.text.strip()
-            updates["values"] = [v.strip() for v in text.split(",") if v.strip()]
-
-        name = updates.get("name", "").strip()
-
-        if not name:
-            errors.append("name")
-
-        existing_names = {
-            m.get("name")
-            for m in self.screen.exercise_obj.metrics
-            if m.get("name") != self.metric.get("name")
-        }
-        if name and name in existing_names:
-            errors.append("name")
-            if hasattr(self.input_widgets["name"], "helper_text"):
-                self.input_widgets["name"].helper_text = "Duplicate name"
-                self.input_widgets["name"].helper_text_mode = "on_error"
-
-        red = (1, 0, 0, 1)
-        for key, widget in self.input_widgets.items():
-            if isinstance(widget, Spinner):
-                widget.text_color = red if key in errors else (1, 1, 1, 1)
-            elif isinstance(widget, MDTextField):
-                widget.error = key in errors
-
-        if errors:
-            return
-
-        def apply_updates():
-            self.screen.exercise_obj.update_metric(self.metric["name"], **updates)
-            self.dismiss()
-            self.screen.populate()
-            self.screen.save_enabled = self.screen.exercise_obj.is_modified()
-
-        db_path = DEFAULT_DB_PATH
-        app = MDApp.get_running_app()
-        from_preset = (
-            app
-            and app.preset_editor
-            and self.screen.section_index >= 0
-            and self.screen.exercise_index >= 0
-        )
-
-        if from_preset:
-            dialog = None
-
-            def cancel_action(*a):
-                if dialog:
-                    dialog.dismiss()
-
-            cb_type = MDCheckbox(
-                group="apply", size_hint=(None, None), height="40dp", width="40dp"
-            )
-            cb_ex = MDCheckbox(
-                group="apply", size_hint=(None, None), height="40dp", width="40dp"
-            )
-            cb_preset = MDCheckbox(
-                group="apply",
-                size_hint=(None, None),
-                height="40dp",
-                width="40dp",
-                active=True,
-            )
-            row1 = MDBoxLayout(
-                orientation="horizontal", spacing="8dp", size_hint_y=None, height="40dp"
-            )
-            row1.add_widget(cb_type)
-            row1.add_widget(MDLabel(text="Set as default metric type", halign="left"))
-            row2 = MDBoxLayout(
-                orientation="horizontal", spacing="8dp", size_hint_y=None, height="40dp"
-            )
-            row2.add_widget(cb_ex)
-            row2.add_widget(
-                MDLabel(text="Apply to all instances of this exercise", halign="left")
-            )
-            row3 = MDBoxLayout(
-                orientation="horizontal", spacing="8dp", size_hint_y=None, height="40dp"
-            )
-            row3.add_widget(cb_preset)
-            row3.add_widget(MDLabel(text="Apply only to this preset", halign="left"))
-            content = MDBoxLayout(
-                orientation="vertical", spacing="8dp", size_hint_y=None
-            )
-            content.add_widget(row1)
-            content.add_widget(row2)
-            content.add_widget(row3)
-
-            def on_save(*a):
-                metric_saved = self.screen.exercise_obj.had_metric(self.metric["name"])
-                if cb_type.active:
-                    core.update_metric_type(
-                        self.metric["name"],
-                        mtype=updates.get("type"),
-                        input_timing=updates.get("input_timing"),
-                        scope=updates.get("scope"),
-                        description=updates.get("description"),
-                        is_required=updates.get("is_required"),
-                        enum_values=updates.get("values"),
-                        db_path=db_path,
-                    )
-                    if metric_saved:
-                        core.set_exercise_metric_override(
-                            self.screen.exercise_obj.name,
-                            self.metric["name"],
-                            is_user_created=self.screen.exercise_obj.is_user_created,
-                            db_path=db_path,
-                        )
-                elif cb_ex.active:
-                    if metric_saved:
-                        core.set_exercise_metric_override(
-                            self.screen.exercise_obj.name,
-                            self.metric["name"],
-                            mtype=updates.get("type"),
-                            input_timing=updates.get("input_timing"),
-                            is_required=updates.get("is_required"),
-                            scope=updates.get("scope"),
-                            enum_values=updates.get("values"),
-                            is_user_created=self.screen.exercise_obj.is_user_created,
-                            db_path=db_path,
-                        )
-                else:
-                    preset_name = app.preset_editor.preset_name if app else ""
-                    core.set_section_exercise_metric_override(
-                        preset_name,
-                        self.screen.section_index,
-                        self.screen.exercise_obj.name,
-                        self.metric["name"],
-                        input_timing=updates.get("input_timing"),
-                        is_required=bool(updates.get("is_required")),
-                        scope=updates.get("scope", "set"),
-                        enum_values=updates.get("values"),
-                        db_path=db_path,
-                    )
-                cancel_action()
-                apply_updates()
-
-            dialog = MDDialog(
-                title="Save Metric",
-                type="custom",
-                content_cls=content,
-                buttons=[
-                    MDRaisedButton(text="Cancel", on_release=cancel_action),
-                    MDRaisedButton(text="Save", on_release=on_save),
-                ],
-            )
-
-            def _on_open(instance):
-                if hasattr(instance, "ids") and "buttons" in instance.ids:
-                    instance.ids.buttons.orientation = (
-                        "vertical" if Window.width < dp(400) else "horizontal"
-                    )
-
-            dialog.bind(on_open=_on_open)
-            dialog.open()
-        elif core.is_metric_type_user_created(self.metric["name"], db_path=db_path):
-            dialog = None
-
-            def cancel_action(*a):
-                if dialog:
-                    dialog.dismiss()
-
-            checkbox = MDCheckbox(size_hint=(None, None), height="40dp", width="40dp")
-            label = MDLabel(
-                text="Apply changes to all exercises using this metric",
-                halign="left",
-            )
-            content = MDBoxLayout(
-                orientation="horizontal",
-                spacing="8dp",
-                size_hint_y=None,
-                height="40dp",
-            )
-            content.add_widget(checkbox)
-            content.add_widget(label)
-
-            def on_save(*a):
-                metric_saved = self.screen.exercise_obj.had_metric(self.metric["name"])
-                if checkbox.active:
-                    core.update_metric_type(
-                        self.metric["name"],
-                        mtype=updates.get("type"),
-                        input_timing=updates.get("input_timing"),
-                        scope=updates.get("scope"),
-                        description=updates.get("description"),
-                        is_required=updates.get("is_required"),
-                        is_user_created=self.metric.get("is_user_created"),
-                        db_path=db_path,
-                    )
-                    if metric_saved:
-                        core.set_exercise_metric_override(
-                            self.screen.exercise_obj.name,
-                            self.metric["name"],
-                            is_user_created=self.screen.exercise_obj.is_user_created,
-                            db_path=db_path,
-                        )
-                else:
-                    if metric_saved:
-                        core.set_exercise_metric_override(
-                            self.screen.exercise_obj.name,
-                            self.metric["name"],
-                            mtype=updates.get("type"),
-                            input_timing=updates.get("input_timing"),
-                            is_required=updates.get("is_required"),
-                            scope=updates.get("scope"),
-                            is_user_created=self.screen.exercise_obj.is_user_created,
-                            db_path=db_path,
-                        )
-                cancel_action()
-                apply_updates()
-
-            dialog = MDDialog(
-                title="Save Metric",
-                type="custom",
-                content_cls=content,
-                buttons=[
-                    MDRaisedButton(text="Cancel", on_release=cancel_action),
-                    MDRaisedButton(text="Save", on_release=on_save),
-                ],
-            )
-
-            def _on_open(instance):
-                if hasattr(instance, "ids") and "buttons" in instance.ids:
-                    instance.ids.buttons.orientation = (
-                        "vertical" if Window.width < dp(400) else "horizontal"
-                    )
-
-            dialog.bind(on_open=_on_open)
-            dialog.open()
-        else:
-            apply_updates()
-
-
-class EditMetricTypePopup(MDDialog):
-    """Popup for editing or creating metric types from the library."""
-
-    def __init__(
-        self,
-        screen: "ExerciseLibraryScreen",
-        metric_name: str | None,
-        is_user_created: bool,
-        **kwargs,
-    ):
-        self.screen = screen
-        self.metric_name = metric_name
-        self.is_user_created = is_user_created
-        self.metric = None
-        if metric_name:
-            for m in screen.all_metrics or []:
-                if (
-                    m["name"] == metric_name
-                    and m.get("is_user_created", False) == is_user_created
-                ):
-                    self.metric = m
-                    break
-        content, buttons, title = self._build_widgets()
-        super().__init__(
-            title=title, type="custom", content_cls=content, buttons=buttons, **kwargs
-        )
-
-    def _build_widgets(self):
-        default_height = dp(48)
-        self.input_widgets = {}
-        schema = core.get_metric_type_schema()
-        if not schema:
-            schema = [
-                {"name": "name"},
-                {"name": "description"},
-                {
-                    "name": "type",
-                    "options": ["int", "float", "str", "bool", "enum", "slider"],
-                },
-                {
-                    "name": "input_timing",
-                    "options": [
-                        "preset",
-                        "pre_session",
-                        "post_session",
-                        "pre_set",
-                        "post_set",
-                    ],
-                },
-                {"name": "scope", "options": ["session", "section", "exercise", "set"]},
-                {"name": "is_required"},
-            ]
-        else:
-            order_map = {field["name"]: field for field in schema}
-            schema = [
-                order_map[name] for name in METRIC_FIELD_ORDER if name in order_map
-            ] + [field for field in schema if field["name"] not in METRIC_FIELD_ORDER]
-
-        form = MDBoxLayout(orientation="vertical", spacing="8dp", size_hint_y=None)
-        form.bind(minimum_height=form.setter("height"))
-
-        def enable_auto_resize(text_field: MDTextField):
-            text_field.bind(
-                text=lambda inst, val: setattr(
-                    inst, "height", max(default_height, inst.minimum_height)
-                )
-            )
-
-        for field in schema:
-            name = field["name"]
-            if name == "enum_values_json":
-                # handled separately via ``enum_values_field``
-                continue
-            options = field.get("options")
-            if name == "is_required":
-                row = MDBoxLayout(
-                    orientation="horizontal", size_hint_y=None, height="40dp"
-                )
-                widget = MDCheckbox(size_hint_y=None, height=default_height)
-                row.add_widget(widget)
-                row.add_widget(MDLabel(text="Required"))
-                form.add_widget(row)
-            elif options:
-                widget = Spinner(
-                    text=options[0],
-                    values=options,
-                    size_hint_y=None,
-                    height=default_height,
-                )
-                form.add_widget(widget)
-            else:
-                widget = MDTextField(
-                    hint_text=name.replace("_", " ").title(),
-                    size_hint_y=None,
-                    height=default_height,
-                    multiline=True,
-                )
-                widget.hint_text_font_size = "12sp"
-                enable_auto_resize(widget)
-                form.add_widget(widget)
-            self.input_widgets[name] = widget
-
-        # Text box for enum values. Only shown for manual enum metrics
-        self.enum_values_field = MDTextField(
-            hint_text="Enum Values (comma separated)",
-            size_hint_y=None,
-            height=default_height,
-            multiline=True,
-        )
-        self.enum_values_field.hint_text_font_size = "12sp"
-        enable_auto_resize(self.enum_values_field)
-
-        if self.metric:
-            for key, widget in self.input_widgets.items():
-                if key not in self.metric:
-                    continue
-                val = self.metric[key]
-                if isinstance(widget, MDCheckbox):
-                    widget.active = bool(val)
-                elif isinstance(widget, Spinner):
-                    if val in widget.values:
-                        widget.text = val
-                else:
-                    widget.text = str(val)
-
-        # show enum values if current metric uses enum type
-        if self.metric and self.metric.get("type") == "enum":
-            if self.enum_values_field.parent is None:
-                form.add_widget(self.enum_values_field)
-            values = []
-            if "values" in self.metric and self.metric["values"]:
-                values = self.metric["values"]
-            elif self.metric.get("enum_values_json"):
-                try:
-                    values = json.loads(self.metric["enum_values_json"])
-                except Exception:
-                    values = []
-            self.enum_values_field.text = ", ".join(values)
-
-        def update_enum_visibility(*args):
-            show = self.input_widgets["type"].text == "enum"
-            has_parent = self.enum_values_field.parent is not None
-            if show and not has_parent:
-                form.add_widget(self.enum_values_field)
-            elif not show and has_parent:
-                form.remove_widget(self.enum_values_field)
-
-        def update_enum_filter(*args):
-            metric_type = self.input_widgets["type"].text
-            if metric_type == "int":
-                allowed = string.digits + ","
-            elif metric_type == "float":
-                allowed = string.digits + ",."
-            else:
-                allowed = string.ascii_letters + " ,"
-
-            def _filter(value, from_undo):
-                filtered = "".join(ch for ch in value if ch in allowed)
-                return re.sub(r",\s+", ",", filtered)
-
-            self.enum_values_field.input_filter = _filter
-
-        if "type" in self.input_widgets:
-            self.input_widgets["type"].bind(text=lambda *a: (update_enum_filter(), update_enum_visibility()))
-            update_enum_visibility()
-            update_enum_filter()
-
-        layout = ScrollView(do_scroll_y=True, size_hint_y=None, height=dp(400))
-        info_box = None
-        if self.metric and not self.is_user_created:
-            has_copy = False
-            if self.screen and self.metric_name:
-                for m in self.screen.all_metrics or []:
-                    if m.get("name") == self.metric_name and m.get("is_user_created"):
-                        has_copy = True
-                        break
-            if has_copy:
-                msg = (
-                    "Built-in metric. Saving will overwrite your existing user copy."
-                )
-            else:
-                msg = (
-                    "Built-in metric. Saving will create a user copy you can edit."
-                )
-            info_box = MDLabel(text=msg, halign="center")
-        elif self.metric and self.is_user_created:
-            msg = (
-                "Changes here update the metric defaults. Exercises using this "
-                "metric without overrides will reflect the changes."
-            )
-            info_box = MDLabel(text=msg, halign="center")
-        layout.add_widget(form)
-        buttons = [
-            MDRaisedButton(text="Save", on_release=self.save_metric),
-            MDRaisedButton(text="Cancel", on_release=lambda *a: self.dismiss()),
-        ]
-        if info_box:
-            wrapper = MDBoxLayout(
-                orientation="vertical",
-                spacing="8dp",
-                size_hint_y=None,
-            )
-            wrapper.bind(minimum_height=wrapper.setter("height"))
-            wrapper.add_widget(info_box)
-            wrapper.add_widget(layout)
-            return wrapper, buttons, "Edit Metric"
-        return layout, buttons, "Edit Metric" if self.metric else "New Metric"
-
-    def save_metric(self, *args):
-        data = {}
-        for key, widget in self.input_widgets.items():
-            if isinstance(widget, MDCheckbox):
-                data[key] = bool(widget.active)
-            else:
-                data[key] = widget.text
-
-        enum_values = None
-        if self.enum_values_field.parent is not None:
-            text = self.enum_values_field.text.strip()
-            if text:
-                enum_values = [v.strip() for v in text.split(",") if v.strip()]
-
-        db_path = DEFAULT_DB_PATH
-        if self.metric and self.is_user_created:
-            core.update_metric_type(
-                self.metric_name,
-                mtype=data.get("type"),
-                input_timing=data.get("input_timing"),
-                scope=data.get("scope"),
-                description=data.get("description"),
-                is_required=data.get("is_required"),
-                enum_values=enum_values,
-                is_user_created=True,
-                db_path=db_path,
-            )
-        else:
-            try:
-                core.add_metric_type(
-                    data.get("name"),
-                    data.get("type"),
-                    data.get("input_timing"),
-                    data.get("scope"),
-                    data.get("description", ""),
-                    data.get("is_required", False),
-                    enum_values,
-                    db_path=db_path,
-                )
-            except sqlite3.IntegrityError:
-                if "name" in self.input_widgets:
-                    self.input_widgets["name"].error = True
-                return
-
-        app = MDApp.get_running_app()
-        if app:
-            app.metric_library_version += 1
-        self.screen.all_metrics = None
-        self.screen.populate()
-        self.dismiss()
-
-
 class EditExerciseScreen(MDScreen):
     """Screen for editing an individual exercise within a preset."""
 
@@ -2827,6 +2055,8 @@ class EditExerciseScreen(MDScreen):
         popup.open()
 
     def save_exercise(self):
+        from kivymd.uix.selectioncontrol import MDCheckbox
+
         if not self.exercise_obj:
             return
 
@@ -2860,13 +2090,11 @@ class EditExerciseScreen(MDScreen):
 
         db_path = DEFAULT_DB_PATH
 
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
+        cursor = core.get_database(db_path).cursor()
 
         if not name:
             if self.name_field:
                 self.name_field.error = True
-            conn.close()
             dialog = MDDialog(
                 title="Error",
                 text="Name cannot be empty",
@@ -2888,7 +2116,6 @@ class EditExerciseScreen(MDScreen):
         if exists and (original_name != name or not self.exercise_obj.is_user_created):
             if self.name_field:
                 self.name_field.error = True
-            conn.close()
             dialog = MDDialog(
                 title="Error",
                 text="Duplicate name",
@@ -2910,7 +2137,6 @@ class EditExerciseScreen(MDScreen):
                 msg = f"A user-defined copy of {self.exercise_obj.name} exists and will be overwritten."
             else:
                 msg = f"{self.exercise_obj.name} is predefined. A user-defined copy will be created."
-        conn.close()
 
         dialog = None
 
@@ -2918,8 +2144,6 @@ class EditExerciseScreen(MDScreen):
             update_library = (not update_in_preset) or (checkbox and checkbox.active)
             if update_library:
                 core.save_exercise(self.exercise_obj)
-                if app:
-                    app.exercise_library_version += 1
             if update_in_preset:
                 app.preset_editor.update_exercise(
                     self.section_index,
@@ -2955,36 +2179,33 @@ class EditExerciseScreen(MDScreen):
                         db_path = (
                             Path(__file__).resolve().parent / "data" / "workout.db"
                         )
-                        conn = sqlite3.connect(str(db_path))
-                        cur = conn.cursor()
-                        cur.execute(
-                            "SELECT id FROM preset_presets WHERE name = ?",
-                            (preset_name,),
-                        )
-                        row = cur.fetchone()
-                        if row:
-                            preset_id = row[0]
+                        with core.get_database(db_path).transaction() as cur:
                             cur.execute(
-                                "SELECT id FROM preset_preset_sections WHERE preset_id = ? ORDER BY position",
-                                (preset_id,),
+                                "SELECT id FROM preset_presets WHERE name = ?",
+                                (preset_name,),
                             )
-                            sections = cur.fetchall()
-                            if 0 <= self.section_index < len(sections):
-                                section_id = sections[self.section_index][0]
+                            row = cur.fetchone()
+                            if row:
+                                preset_id = row[0]
                                 cur.execute(
-                                    """SELECT id FROM preset_section_exercises WHERE section_id = ? AND exercise_name = ? ORDER BY position LIMIT 1""",
-                                    (section_id, self.exercise_obj.name),
+                                    "SELECT id FROM preset_preset_sections WHERE preset_id = ? ORDER BY position",
+                                    (preset_id,),
                                 )
-                                se_row = cur.fetchone()
-                                if se_row:
-                                    se_id = se_row[0]
-                                    for mname in removed:
-                                        cur.execute(
-                                            "DELETE FROM preset_exercise_metrics WHERE section_exercise_id = ? AND metric_name = ?",
-                                            (se_id, mname),
-                                        )
-                                    conn.commit()
-                        conn.close()
+                                sections = cur.fetchall()
+                                if 0 <= self.section_index < len(sections):
+                                    section_id = sections[self.section_index][0]
+                                    cur.execute(
+                                        """SELECT id FROM preset_section_exercises WHERE section_id = ? AND exercise_name = ? ORDER BY position LIMIT 1""",
+                                        (section_id, self.exercise_obj.name),
+                                    )
+                                    se_row = cur.fetchone()
+                                    if se_row:
+                                        se_id = se_row[0]
+                                        for mname in removed:
+                                            cur.execute(
+                                                "DELETE FROM preset_exercise_metrics WHERE section_exercise_id = ? AND metric_name = ?",
+                                                (se_id, mname),
+                                            )
 
             self.save_enabled = False
             if dialog:
@@ -3072,13 +2293,75 @@ class WorkoutApp(MDApp):
     editing_exercise_index: int = -1
     # True when metrics being entered correspond to a newly completed set
     record_new_set = False
-    # Incremented whenever an exercise is added, edited or deleted
-    exercise_library_version: int = 0
-    # Incremented when a metric type is added or edited
-    metric_library_version: int = 0
 
     def build(self):
-        return Builder.load_file(str(Path(__file__).with_name("main.kv")))
+        root = Builder.load_file(str(Path(__file__).with_name("main.kv")))
+        STARTUP_TIMER.mark("build")
+        return root
+
+    def on_start(self):
+        # Clock callbacks scheduled with a zero timeout run after the next frame
+        Clock.schedule_once(self._on_first_frame, 0)
+
+    def _on_first_frame(self, *args):
+        STARTUP_TIMER.mark("first_frame")
+        STARTUP_TIMER.log()
+        self.offer_resume()
+
+    def offer_resume(self):
+        """Offer to continue the newest workout that was interrupted."""
+
+        unfinished = core.find_unfinished_sessions(DEFAULT_DB_PATH)
+        if not unfinished:
+            return
+        latest = unfinished[0]
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(latest["started_at"]))
+        dialog = None
+
+        def resume(*args):
+            dialog.dismiss()
+            self.resume_workout(latest["id"])
+
+        def discard(*args):
+            dialog.dismiss()
+            core.discard_unfinished_session(latest["id"], DEFAULT_DB_PATH)
+
+        dialog = MDDialog(
+            title="Resume Workout?",
+            text=f"{latest['preset_name']} started {started} was not finished.",
+            buttons=[
+                MDRaisedButton(text="Discard", on_release=discard),
+                MDRaisedButton(text="Resume", on_release=resume),
+            ],
+        )
+        dialog.open()
+
+    def resume_workout(self, session_id: int):
+        """Restore a journaled session and continue where it stopped."""
+
+        self.workout_session = WorkoutSession.resume(session_id, DEFAULT_DB_PATH)
+        self.selected_preset = self.workout_session.preset_name
+        self.record_new_set = False
+        session = self.workout_session
+        if session.current_exercise >= len(session.exercises):
+            # Every set was journaled; only the final save was lost.
+            session.save()
+            self.root.current = "workout_summary"
+        else:
+            self.root.current = "rest"
+
+    def on_pause(self):
+        # The OS may kill a paused app, so fold the WAL into the database
+        core.get_database(DEFAULT_DB_PATH).checkpoint()
+        return True
+
+    def on_stop(self):
+        if self.preset_editor:
+            self.preset_editor.close()
+        core.WorkoutDatabase.close_all()
+        if tracing.is_enabled():
+            path = tracing.PROFILER.dump()
+            Logger.info(f"SQL trace: profile written to {path}")
 
     def init_preset_editor(self, force_reload: bool = False):
         """Create or reload the ``PresetEditor`` for the selected preset."""
@@ -3108,7 +2391,8 @@ class WorkoutApp(MDApp):
 
     def start_workout(self, exercises):
         if exercises:
-            self.workout_session = WorkoutSession(exercises)
+            # Journal each set so an interrupted workout can be resumed
+            self.workout_session = WorkoutSession(exercises, journal=True)
         else:
             self.workout_session = None
 
@@ -3120,5 +2404,8 @@ class WorkoutApp(MDApp):
             self.workout_session.mark_set_completed()
 
 
+STARTUP_TIMER.mark("imports")
+
+
 if __name__ == "__main__":
     WorkoutApp().run()
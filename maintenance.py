@@ -0,0 +1,331 @@
+"""Housekeeping for the workout database.
+
+The save paths in :mod:`core` never remove rows; they set ``deleted = 1``
+so history that still points at a row keeps working.  Over time those rows
+make every table and partial index larger than the live data needs.
+:func:`run_maintenance` removes soft-deleted rows that nothing references
+any more, returns the freed pages to the file system with an incremental
+vacuum, refreshes the planner statistics and reports what changed.  With
+``rebuild`` the tables derived from the session history are recomputed
+as well::
+
+    python maintenance.py --db data/workout.db
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+import core
+from core import DEFAULT_DB_PATH
+
+# Tables holding soft-deleted rows, ordered so children are purged before
+# the rows they point at.  Each entry lists the ``(table, column)`` pairs
+# referencing the table's ``id``; a deleted row is only removed when none
+# of them still points at it, whether the referencing row is live or not.
+PURGE_ORDER = (
+    ("library_exercise_metrics", ()),
+    ("preset_exercise_metrics", ()),
+    ("preset_preset_metrics", ()),
+    ("session_set_metrics", ()),
+    ("session_sets", (("session_set_metrics", "session_set_id"),)),
+    ("session_exercises", (("session_sets", "session_exercise_id"),)),
+    ("preset_section_exercises", (("preset_exercise_metrics", "section_exercise_id"),)),
+    ("preset_preset_sections", (("preset_section_exercises", "section_id"),)),
+    (
+        "session_sessions",
+        (
+            ("session_exercises", "session_id"),
+            ("session_set_journal", "session_id"),
+        ),
+    ),
+    (
+        "preset_presets",
+        (
+            ("preset_preset_sections", "preset_id"),
+            ("preset_preset_metrics", "preset_id"),
+            ("session_sessions", "preset_id"),
+        ),
+    ),
+    (
+        "library_exercises",
+        (
+            ("library_exercise_metrics", "exercise_id"),
+            ("preset_section_exercises", "library_exercise_id"),
+            ("session_exercises", "library_exercise_id"),
+        ),
+    ),
+    (
+        "library_metric_types",
+        (
+            ("library_exercise_metrics", "metric_type_id"),
+            ("preset_exercise_metrics", "library_metric_type_id"),
+            ("preset_preset_metrics", "library_metric_type_id"),
+            ("session_set_metrics", "library_metric_type_id"),
+        ),
+    ),
+)
+
+# Representative read queries timed before and after maintenance.
+TIMED_QUERIES = {
+    "library_exercises": (
+        "SELECT name FROM library_exercises WHERE deleted = 0 ORDER BY name"
+    ),
+    "exercise_metrics": (
+        "SELECT e.name, mt.name, COALESCE(em.type, mt.type) "
+        "FROM library_exercise_metrics em "
+        "JOIN library_exercises e ON e.id = em.exercise_id "
+        "JOIN library_metric_types mt ON mt.id = em.metric_type_id "
+        "WHERE em.deleted = 0 AND e.deleted = 0 AND mt.deleted = 0 "
+        "ORDER BY e.id, em.position"
+    ),
+    "preset_exercises": (
+        "SELECT p.name, s.name, se.exercise_name, se.number_of_sets "
+        "FROM preset_presets p "
+        "JOIN preset_preset_sections s ON s.preset_id = p.id AND s.deleted = 0 "
+        "JOIN preset_section_exercises se ON se.section_id = s.id AND se.deleted = 0 "
+        "WHERE p.deleted = 0 ORDER BY p.position, s.position, se.position"
+    ),
+    "session_history": (
+        "SELECT id, preset_name, started_at FROM session_sessions "
+        "WHERE deleted = 0 ORDER BY started_at DESC LIMIT 50"
+    ),
+}
+
+# Tables recomputed by ``rebuild`` together with the tables they are read from
+REBUILD_TABLES = {
+    "progress_sets": (
+        "progress_exercise_daily",
+        "progress_exercise_weekly",
+        "session_sessions",
+        "session_exercises",
+        "session_sets",
+        "session_set_metrics",
+    ),
+    "record_sets": (
+        "progress_personal_records",
+        "session_sessions",
+        "session_exercises",
+        "session_sets",
+        "session_set_metrics",
+    ),
+}
+
+
+def existing_tables(conn: sqlite3.Connection | sqlite3.Cursor) -> set[str]:
+    """Return the names of the tables in the database of ``conn``."""
+
+    return {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+
+def _query_tables(sql: str) -> set[str]:
+    return set(re.findall(r"\b(?:FROM|JOIN)\s+(\w+)", sql))
+
+
+def missing_tables(conn: sqlite3.Connection) -> list[str]:
+    """Return the tables maintenance works on that ``conn`` does not have.
+
+    Databases that were never opened by the app, such as the bundled
+    ``workout.db``, lack the session and progress tables; maintenance
+    skips whatever refers to them.
+    """
+
+    wanted = {table for table, _ in PURGE_ORDER}
+    for sql in TIMED_QUERIES.values():
+        wanted |= _query_tables(sql)
+    for tables in REBUILD_TABLES.values():
+        wanted.update(tables)
+    return sorted(wanted - existing_tables(conn))
+
+
+def purge_soft_deleted(cursor: sqlite3.Cursor) -> dict[str, int]:
+    """Delete unreferenced soft-deleted rows; return the count per table.
+
+    Tables missing from the database are left out of the result, and a
+    missing referencing table cannot hold references.
+    """
+
+    tables = existing_tables(cursor)
+    purged = {}
+    for table, references in PURGE_ORDER:
+        if table not in tables:
+            continue
+        sql = f"DELETE FROM {table} WHERE deleted = 1"
+        for child, column in references:
+            if child not in tables:
+                continue
+            sql += (
+                f" AND NOT EXISTS (SELECT 1 FROM {child}"
+                f" WHERE {child}.{column} = {table}.id)"
+            )
+        cursor.execute(sql)
+        purged[table] = cursor.rowcount
+    return purged
+
+
+def page_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    """Return the page size, total pages and free pages of ``conn``."""
+
+    return {
+        "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+        "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+
+
+def ensure_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """Switch ``conn`` to ``auto_vacuum = INCREMENTAL``.
+
+    Changing the mode of an existing database only takes effect after a
+    full ``VACUUM``, which is run once here.  Returns ``True`` when that
+    conversion happened.
+    """
+
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return False
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return True
+
+
+def time_queries(conn: sqlite3.Connection, repeat: int = 5) -> dict[str, float]:
+    """Return the median time in milliseconds of each of :data:`TIMED_QUERIES`.
+
+    Queries reading a table the database does not have are skipped.
+    """
+
+    tables = existing_tables(conn)
+    timings = {}
+    for label, sql in TIMED_QUERIES.items():
+        if not _query_tables(sql) <= tables:
+            continue
+        conn.execute(sql).fetchall()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            times.append(time.perf_counter() - start)
+        timings[label] = round(statistics.median(times) * 1000, 3)
+    return timings
+
+
+def run_maintenance(
+    db_path: Path = DEFAULT_DB_PATH,
+    repeat: int = 5,
+    vacuum: bool = True,
+    rebuild: bool = False,
+) -> dict:
+    """Purge, vacuum and analyze ``db_path`` and return a report.
+
+    The work runs on a dedicated connection so it never holds the pooled
+    connections used by the app.  Rows that are purged were already
+    invisible to every helper, so cached library data stays valid.  The
+    schema is left as it is; tables it lacks are listed under
+    ``missing_tables`` and skipped.
+    """
+
+    conn = core.get_database(db_path).open_connection(bootstrap=False)
+    try:
+        missing = missing_tables(conn)
+        before = page_stats(conn)
+        timings_before = time_queries(conn, repeat)
+
+        rebuilders = {
+            "progress_sets": core._rebuild_progress,
+            "record_sets": core._rebuild_personal_records,
+        }
+        rebuilt = {}
+        with conn:
+            cursor = conn.cursor()
+            purged = purge_soft_deleted(cursor)
+            if rebuild:
+                for name, rebuilder in rebuilders.items():
+                    if not set(REBUILD_TABLES[name]) & set(missing):
+                        rebuilt[name] = rebuilder(cursor)
+
+        converted = False
+        if vacuum:
+            converted = ensure_incremental_vacuum(conn)
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+        after = page_stats(conn)
+        timings_after = time_queries(conn, repeat)
+    finally:
+        conn.close()
+
+    return {
+        "db_path": str(db_path),
+        "missing_tables": missing,
+        "purged": purged,
+        "rebuilt": rebuilt,
+        "converted_to_incremental": converted,
+        "page_size": after["page_size"],
+        "pages_before": before["page_count"],
+        "pages_after": after["page_count"],
+        "reclaimed_pages": before["page_count"] - after["page_count"],
+        "freelist_before": before["freelist_count"],
+        "freelist_after": after["freelist_count"],
+        "timings_ms": {
+            label: {"before": timings_before[label], "after": timings_after[label]}
+            for label in timings_before
+        },
+    }
+
+
+def format_report(report: dict) -> str:
+    """Return ``report`` as a short human readable summary."""
+
+    lines = [f"Database: {report['db_path']}"]
+    if report["missing_tables"]:
+        lines.append(f"Skipped missing tables: {', '.join(report['missing_tables'])}")
+    total = sum(report["purged"].values())
+    lines.append(f"Purged rows: {total}")
+    for table, count in report["purged"].items():
+        if count:
+            lines.append(f"  {table:<28}{count:>8}")
+    for name, count in report["rebuilt"].items():
+        lines.append(f"Rebuilt {name}: {count}")
+    reclaimed_kb = report["reclaimed_pages"] * report["page_size"] / 1024
+    lines.append(
+        f"Pages: {report['pages_before']} -> {report['pages_after']}"
+        f" (reclaimed {report['reclaimed_pages']}, {reclaimed_kb:.1f} KiB)"
+    )
+    if report["converted_to_incremental"]:
+        lines.append("Switched to auto_vacuum = INCREMENTAL")
+    lines.append("Query timings (ms, before -> after):")
+    for label, timing in report["timings_ms"].items():
+        lines.append(f"  {label:<28}{timing['before']:>8.3f} -> {timing['after']:.3f}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--no-vacuum", action="store_true", help="only purge rows and analyze"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompute tables derived from history"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_maintenance(
+        args.db, repeat=args.repeat, vacuum=not args.no_vacuum, rebuild=args.rebuild
+    )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import sqlite3
+from pathlib import Path
+import shutil
+import time
+import sys
+
+SESSION_TABLES = (
+    "session_sessions",
+    "session_exercises",
+    "session_sets",
+    "session_set_metrics",
+    "session_set_journal",
+)
+
+
+def check_not_migrated(conn):
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    present = [t for t in SESSION_TABLES if t in existing]
+    if present:
+        raise RuntimeError(f"Session tables already exist: {present}")
+
+
+def create_session_tables(conn):
+    conn.execute(
+        """
+        CREATE TABLE session_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            preset_id INTEGER,
+            preset_name TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'in_progress' CHECK(status IN ('in_progress','completed')),
+            started_at REAL NOT NULL,
+            ended_at REAL,
+            rest_duration INTEGER NOT NULL DEFAULT 120,
+            deleted BOOLEAN NOT NULL DEFAULT 0,
+            FOREIGN KEY(preset_id) REFERENCES preset_presets(id) ON DELETE SET NULL
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE session_exercises (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            library_exercise_id INTEGER,
+            exercise_name TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            number_of_sets INTEGER NOT NULL,
+            rest_time INTEGER,
+            deleted BOOLEAN NOT NULL DEFAULT 0,
+            FOREIGN KEY(library_exercise_id) REFERENCES library_exercises(id) ON DELETE SET NULL,
+            FOREIGN KEY(session_id) REFERENCES session_sessions(id) ON DELETE CASCADE
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE session_sets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_exercise_id INTEGER NOT NULL,
+            set_number INTEGER NOT NULL,
+            completed_at REAL,
+            deleted BOOLEAN NOT NULL DEFAULT 0,
+            FOREIGN KEY(session_exercise_id) REFERENCES session_exercises(id) ON DELETE CASCADE
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE session_set_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_set_id INTEGER NOT NULL,
+            library_metric_type_id INTEGER,
+            metric_name TEXT NOT NULL,
+            value NUMERIC,
+            deleted BOOLEAN NOT NULL DEFAULT 0,
+            FOREIGN KEY(library_metric_type_id) REFERENCES library_metric_types(id) ON DELETE SET NULL,
+            FOREIGN KEY(session_set_id) REFERENCES session_sets(id) ON DELETE CASCADE
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE session_set_journal (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            exercise_position INTEGER NOT NULL,
+            set_number INTEGER NOT NULL,
+            metrics_json TEXT NOT NULL,
+            recorded_at REAL NOT NULL,
+            FOREIGN KEY(session_id) REFERENCES session_sessions(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+
+def create_session_indexes(conn):
+    conn.execute(
+        "CREATE UNIQUE INDEX idx_unique_session_set_active ON session_sets (session_exercise_id, set_number) WHERE deleted = 0"
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX idx_unique_session_set_metric_active ON session_set_metrics (session_set_id, metric_name) WHERE deleted = 0"
+    )
+
+
+def main():
+    base = Path(__file__).resolve().parent.parent
+    db_dir = base / 'data'
+    old_db = db_dir / 'workout.db'
+    backup_dir = base / 'backups'
+    backup_dir.mkdir(exist_ok=True)
+    # Fold any pending WAL pages into workout.db so the copies are complete
+    conn = sqlite3.connect(old_db)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE);')
+    conn.close()
+    backup_file = backup_dir / f"workout_{int(time.time())}.db.bak"
+    shutil.copyfile(old_db, backup_file)
+    new_db = db_dir / 'workout_new.db'
+    shutil.copyfile(old_db, new_db)
+    print(f"✅ Backup created at {backup_file}")
+
+    conn = sqlite3.connect(new_db)
+    try:
+        conn.execute('PRAGMA foreign_keys = OFF;')
+        check_not_migrated(conn)
+
+        create_session_tables(conn)
+        for table in SESSION_TABLES:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"✅ Created table: {table} ({count} rows)")
+        create_session_indexes(conn)
+
+        conn.execute('PRAGMA foreign_keys = ON;')
+        fk_errors = conn.execute('PRAGMA foreign_key_check;').fetchall()
+        if fk_errors:
+            raise RuntimeError(f"Foreign key violations detected: {fk_errors}")
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        print(f"Migration failed: {exc}")
+        conn.close()
+        new_db.unlink(missing_ok=True)
+        sys.exit(1)
+    conn.close()
+
+    shutil.move(str(new_db), str(old_db))
+    print("✅ Migration completed successfully.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import sqlite3
+from pathlib import Path
+import shutil
+import time
+import sys
+
+SEARCHED_TABLES = ("library_exercises", "library_metric_types")
+
+
+def check_fts5_available(conn):
+    options = {row[0] for row in conn.execute("PRAGMA compile_options")}
+    if "ENABLE_FTS5" not in options:
+        raise RuntimeError("This SQLite build does not include FTS5")
+
+
+def check_not_migrated(conn):
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    present = [f"{t}_fts" for t in SEARCHED_TABLES if f"{t}_fts" in existing]
+    if present:
+        raise RuntimeError(f"Search tables already exist: {present}")
+
+
+def create_search_table(conn, table):
+    fts = f"{table}_fts"
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE {fts} USING fts5(
+            name,
+            description,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+        """
+    )
+    conn.execute(
+        f"""
+        INSERT INTO {fts} (rowid, name, description)
+        SELECT id, name, COALESCE(description, '') FROM {table} WHERE deleted = 0
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} WHEN NEW.deleted = 0 BEGIN
+            INSERT INTO {fts} (rowid, name, description) VALUES (NEW.id, NEW.name, COALESCE(NEW.description, ''));
+        END;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER {fts}_update AFTER UPDATE OF name, description, deleted ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = OLD.id;
+            INSERT INTO {fts} (rowid, name, description) SELECT NEW.id, NEW.name, COALESCE(NEW.description, '') WHERE NEW.deleted = 0;
+        END;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = OLD.id;
+        END;
+        """
+    )
+
+
+def validate_counts(conn, table):
+    expected = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE deleted = 0").fetchone()[0]
+    indexed = conn.execute(f"SELECT COUNT(*) FROM {table}_fts").fetchone()[0]
+    if expected != indexed:
+        raise RuntimeError(f"{table}_fts holds {indexed} rows, expected {expected}")
+    return indexed
+
+
+def main():
+    base = Path(__file__).resolve().parent.parent
+    db_dir = base / 'data'
+    old_db = db_dir / 'workout.db'
+    backup_dir = base / 'backups'
+    backup_dir.mkdir(exist_ok=True)
+    # Fold any pending WAL pages into workout.db so the copies are complete
+    conn = sqlite3.connect(old_db)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE);')
+    conn.close()
+    backup_file = backup_dir / f"workout_{int(time.time())}.db.bak"
+    shutil.copyfile(old_db, backup_file)
+    new_db = db_dir / 'workout_new.db'
+    shutil.copyfile(old_db, new_db)
+    print(f"✅ Backup created at {backup_file}")
+
+    conn = sqlite3.connect(new_db)
+    try:
+        conn.execute('PRAGMA foreign_keys = OFF;')
+        check_fts5_available(conn)
+        check_not_migrated(conn)
+
+        for table in SEARCHED_TABLES:
+            create_search_table(conn, table)
+            count = validate_counts(conn, table)
+            print(f"✅ Indexed {table}: {count} rows")
+
+        conn.execute('PRAGMA foreign_keys = ON;')
+        fk_errors = conn.execute('PRAGMA foreign_key_check;').fetchall()
+        if fk_errors:
+            raise RuntimeError(f"Foreign key violations detected: {fk_errors}")
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        print(f"Migration failed: {exc}")
+        conn.close()
+        new_db.unlink(missing_ok=True)
+        sys.exit(1)
+    conn.close()
+
+    shutil.move(str(new_db), str(old_db))
+    print("✅ Migration completed successfully.")
+
+
+if __name__ == '__main__':
+    main()
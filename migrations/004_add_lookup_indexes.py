@@ -0,0 +1,99 @@
+import sqlite3
+from pathlib import Path
+import shutil
+import time
+import sys
+
+# (index name, table, columns, partial index condition)
+LOOKUP_INDEXES = (
+    ("idx_library_exercise_metrics_metric_type_active", "library_exercise_metrics",
+     ("metric_type_id", "deleted"), "deleted = 0"),
+    ("idx_preset_preset_metrics_metric_type_active", "preset_preset_metrics",
+     ("library_metric_type_id", "deleted"), "deleted = 0"),
+    ("idx_preset_presets_name_active", "preset_presets",
+     ("name", "deleted"), "deleted = 0"),
+    ("idx_preset_section_exercises_library_active", "preset_section_exercises",
+     ("library_exercise_id", "deleted"), "deleted = 0"),
+    ("idx_preset_section_exercises_section_active", "preset_section_exercises",
+     ("section_id", "position", "exercise_name", "number_of_sets", "rest_time",
+      "library_exercise_id", "deleted"), "deleted = 0"),
+    ("idx_preset_sections_preset_active", "preset_preset_sections",
+     ("preset_id", "position", "name", "deleted"), "deleted = 0"),
+    ("idx_session_exercises_session_active", "session_exercises",
+     ("session_id", "position", "deleted"), "deleted = 0"),
+    ("idx_session_sessions_in_progress", "session_sessions",
+     ("started_at", "preset_name", "status", "deleted"),
+     "deleted = 0 AND status = 'in_progress'"),
+    ("idx_session_set_journal_session", "session_set_journal",
+     ("session_id",), None),
+)
+
+
+def check_tables(conn):
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    missing = sorted({table for _, table, _, _ in LOOKUP_INDEXES} - existing)
+    if missing:
+        raise RuntimeError(f"Missing tables {missing}; run the earlier migrations first")
+    indexes = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    }
+    present = [name for name, _, _, _ in LOOKUP_INDEXES if name in indexes]
+    if present:
+        raise RuntimeError(f"Indexes already exist: {present}")
+
+
+def create_indexes(conn):
+    for name, table, columns, where in LOOKUP_INDEXES:
+        sql = f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+        if where:
+            sql += f" WHERE {where}"
+        conn.execute(sql)
+        print(f"✅ Created index: {name}")
+
+
+def main():
+    base = Path(__file__).resolve().parent.parent
+    db_dir = base / 'data'
+    old_db = db_dir / 'workout.db'
+    backup_dir = base / 'backups'
+    backup_dir.mkdir(exist_ok=True)
+    # Fold any pending WAL pages into workout.db so the copies are complete
+    conn = sqlite3.connect(old_db)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE);')
+    conn.close()
+    backup_file = backup_dir / f"workout_{int(time.time())}.db.bak"
+    shutil.copyfile(old_db, backup_file)
+    new_db = db_dir / 'workout_new.db'
+    shutil.copyfile(old_db, new_db)
+    print(f"✅ Backup created at {backup_file}")
+
+    conn = sqlite3.connect(new_db)
+    try:
+        conn.execute('PRAGMA foreign_keys = OFF;')
+        check_tables(conn)
+        create_indexes(conn)
+        conn.execute('ANALYZE;')
+
+        conn.execute('PRAGMA foreign_keys = ON;')
+        fk_errors = conn.execute('PRAGMA foreign_key_check;').fetchall()
+        if fk_errors:
+            raise RuntimeError(f"Foreign key violations detected: {fk_errors}")
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        print(f"Migration failed: {exc}")
+        conn.close()
+        new_db.unlink(missing_ok=True)
+        sys.exit(1)
+    conn.close()
+
+    shutil.move(str(new_db), str(old_db))
+    print("✅ Migration completed successfully.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import sqlite3
+from pathlib import Path
+import shutil
+import time
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import core  # noqa: E402
+
+PROGRESS_TABLES = ("progress_exercise_daily", "progress_exercise_weekly")
+
+
+def check_not_migrated(conn):
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    if "session_set_metrics" not in existing:
+        raise RuntimeError("Missing session tables; run the earlier migrations first")
+    present = [t for t in PROGRESS_TABLES if t in existing]
+    if present:
+        raise RuntimeError(f"Progress tables already exist: {present}")
+
+
+def create_progress_table(conn, table):
+    conn.execute(
+        f"""
+        CREATE TABLE {table} (
+            exercise_name TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            sets INTEGER NOT NULL DEFAULT 0,
+            reps REAL NOT NULL DEFAULT 0,
+            tonnage REAL NOT NULL DEFAULT 0,
+            best_weight REAL,
+            best_reps REAL,
+            best_e1rm REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (exercise_name, period_start)
+        ) WITHOUT ROWID;
+        """
+    )
+    print(f"✅ Created table: {table}")
+
+
+def main():
+    base = Path(__file__).resolve().parent.parent
+    db_dir = base / 'data'
+    old_db = db_dir / 'workout.db'
+    backup_dir = base / 'backups'
+    backup_dir.mkdir(exist_ok=True)
+    # Fold any pending WAL pages into workout.db so the copies are complete
+    conn = sqlite3.connect(old_db)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE);')
+    conn.close()
+    backup_file = backup_dir / f"workout_{int(time.time())}.db.bak"
+    shutil.copyfile(old_db, backup_file)
+    new_db = db_dir / 'workout_new.db'
+    shutil.copyfile(old_db, new_db)
+    print(f"✅ Backup created at {backup_file}")
+
+    conn = sqlite3.connect(new_db)
+    try:
+        conn.execute('PRAGMA foreign_keys = OFF;')
+        check_not_migrated(conn)
+        for table in PROGRESS_TABLES:
+            create_progress_table(conn, table)
+        sets = core._rebuild_progress(conn.cursor())
+        print(f"✅ Aggregated {sets} saved sets")
+
+        conn.execute('PRAGMA foreign_keys = ON;')
+        fk_errors = conn.execute('PRAGMA foreign_key_check;').fetchall()
+        if fk_errors:
+            raise RuntimeError(f"Foreign key violations detected: {fk_errors}")
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        print(f"Migration failed: {exc}")
+        conn.close()
+        new_db.unlink(missing_ok=True)
+        sys.exit(1)
+    conn.close()
+
+    shutil.move(str(new_db), str(old_db))
+    print("✅ Migration completed successfully.")
+
+
+if __name__ == '__main__':
+    main()
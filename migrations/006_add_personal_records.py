@@ -0,0 +1,82 @@
+import sqlite3
+from pathlib import Path
+import shutil
+import time
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import core  # noqa: E402
+
+
+def check_not_migrated(conn):
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    if "progress_exercise_weekly" not in existing:
+        raise RuntimeError("Missing progress tables; run the earlier migrations first")
+    if "progress_personal_records" in existing:
+        raise RuntimeError("progress_personal_records already exists")
+
+
+def create_records_table(conn):
+    conn.execute(
+        """
+        CREATE TABLE progress_personal_records (
+            exercise_name TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            rep_range INTEGER NOT NULL DEFAULT 0,
+            value REAL NOT NULL,
+            session_id INTEGER,
+            achieved_at REAL,
+            PRIMARY KEY (exercise_name, metric_name, rep_range),
+            FOREIGN KEY (session_id) REFERENCES session_sessions(id) ON DELETE SET NULL
+        ) WITHOUT ROWID;
+        """
+    )
+    print("✅ Created table: progress_personal_records")
+
+
+def main():
+    base = Path(__file__).resolve().parent.parent
+    db_dir = base / 'data'
+    old_db = db_dir / 'workout.db'
+    backup_dir = base / 'backups'
+    backup_dir.mkdir(exist_ok=True)
+    # Fold any pending WAL pages into workout.db so the copies are complete
+    conn = sqlite3.connect(old_db)
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE);')
+    conn.close()
+    backup_file = backup_dir / f"workout_{int(time.time())}.db.bak"
+    shutil.copyfile(old_db, backup_file)
+    new_db = db_dir / 'workout_new.db'
+    shutil.copyfile(old_db, new_db)
+    print(f"✅ Backup created at {backup_file}")
+
+    conn = sqlite3.connect(new_db)
+    try:
+        conn.execute('PRAGMA foreign_keys = OFF;')
+        check_not_migrated(conn)
+        create_records_table(conn)
+        sets = core._rebuild_personal_records(conn.cursor())
+        print(f"✅ Checked {sets} saved sets for records")
+
+        conn.execute('PRAGMA foreign_keys = ON;')
+        fk_errors = conn.execute('PRAGMA foreign_key_check;').fetchall()
+        if fk_errors:
+            raise RuntimeError(f"Foreign key violations detected: {fk_errors}")
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        print(f"Migration failed: {exc}")
+        conn.close()
+        new_db.unlink(missing_ok=True)
+        sys.exit(1)
+    conn.close()
+
+    shutil.move(str(new_db), str(old_db))
+    print("✅ Migration completed successfully.")
+
+
+if __name__ == '__main__':
+    main()
@@ -152,3 +152,22 @@ def sample_db(tmp_path: Path) -> Path:
     conn.commit()
     conn.close()
     return db_path
+
+
+@pytest.fixture
+def shipped_db(tmp_path: Path) -> Path:
+    """Copy the bundled ``data/workout.db``, which predates the session tables."""
+    db_path = tmp_path / "shipped.db"
+    src = Path(__file__).resolve().parent.parent / "data" / "workout.db"
+    db_path.write_bytes(src.read_bytes())
+    return db_path
+
+
+@pytest.fixture(autouse=True)
+def _close_pooled_connections():
+    """Release pooled connections and caches so each test starts clean."""
+    yield
+    import core
+
+    core.WorkoutDatabase.close_all()
+    core.LibraryCache.clear_all()
@@ -0,0 +1,42 @@
+import json
+import sqlite3
+
+from benchmarks import core_paths, session_memory
+from benchmarks.synthetic import generate_database
+
+
+def test_generate_database_sizes(tmp_path):
+    db_path = tmp_path / "synthetic.db"
+    size = generate_database(
+        db_path, exercises=20, presets=2, sections_per_preset=2, exercises_per_section=3, sessions=4
+    )
+    assert size["exercises"] == 20
+    conn = sqlite3.connect(db_path)
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("library_exercises", "preset_presets", "preset_section_exercises", "session_sessions")
+    }
+    conn.close()
+    assert counts == {
+        "library_exercises": 20,
+        "preset_presets": 2,
+        "preset_section_exercises": 12,
+        "session_sessions": 4,
+    }
+
+
+def test_core_paths_report_is_json(tmp_path):
+    report = core_paths.run(
+        repeat=1, exercises=20, presets=2, sections_per_preset=2, exercises_per_section=3, sessions=2
+    )
+    assert set(report["results"]) == set(core_paths.SCENARIOS)
+    for result in report["results"].values():
+        assert result["median_ms"] >= 0
+        assert result["statements"] > 0
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_session_memory_store_is_smaller():
+    report = session_memory.run(exercises=3, sets=50)
+    assert report["store_bytes"] < report["dict_bytes"]
+    assert json.loads(json.dumps(report)) == report
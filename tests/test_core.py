@@ -224,3 +224,31 @@ def test_delete_metric_type(sample_db):
     assert all(m["name"] != "Tempo" for m in metrics)
     assert core.delete_metric_type("Tempo", db_path=sample_db, is_user_created=True) is False
 
+
+
+def test_load_workout_presets_name_filter(sample_db):
+    conn = sqlite3.connect(sample_db)
+    conn.execute("INSERT INTO preset_presets (name) VALUES ('Empty Day')")
+    conn.commit()
+    conn.close()
+
+    all_presets = core.load_workout_presets(sample_db)
+    assert [p["name"] for p in all_presets] == ["Push Day", "Empty Day"]
+    assert all_presets[1]["exercises"] == []
+
+    filtered = core.load_workout_presets(sample_db, names=["Empty Day"])
+    assert filtered == [{"name": "Empty Day", "exercises": []}]
+    # A filtered load must not replace the full catalogue
+    assert core.WORKOUT_PRESETS == all_presets
+    assert core.load_workout_presets(sample_db, names=[]) == []
+
+
+def test_load_workout_presets_single_query(sample_db):
+    statements = []
+    conn = core.get_database(sample_db).connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        core.load_workout_presets(sample_db)
+    finally:
+        conn.set_trace_callback(None)
+    assert len(statements) == 1
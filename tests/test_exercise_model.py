@@ -1,3 +1,5 @@
+import sqlite3
+
 import core
 
 
@@ -29,3 +31,69 @@ def test_had_metric(sample_db):
     core.save_exercise(ex)
     loaded = core.Exercise("Push-up", db_path=sample_db, is_user_created=True)
     assert loaded.had_metric("Weight")
+
+
+def test_changed_fields_track_edits(sample_db):
+    ex = core.Exercise("Push-up", db_path=sample_db)
+    assert not ex.is_modified()
+    assert ex.changed_fields() == set()
+
+    original = ex.description
+    ex.description = "Chest"
+    assert ex.changed_fields() == {"description"}
+    ex.description = original
+    assert not ex.is_modified()
+
+    reps = next(m for m in ex.metrics if m["name"] == "Reps")
+    ex.update_metric("Reps", is_required=not reps["is_required"])
+    assert ex.changed_fields() == {"metrics"}
+    assert ex.changed_metrics() == {"Reps"}
+
+    ex.add_metric({"name": "Weight"})
+    ex.remove_metric("Weight")
+    assert ex.changed_metrics() == {"Reps"}
+
+    ex.mark_saved()
+    assert not ex.is_modified()
+
+
+def test_reordering_metrics_is_a_modification(sample_db):
+    ex = core.Exercise("Push-up", db_path=sample_db)
+    ex.add_metric({"name": "Weight"})
+    ex.mark_saved()
+
+    reps = next(m for m in ex.metrics if m["name"] == "Reps")
+    ex.remove_metric("Reps")
+    ex.add_metric(reps)
+    assert ex.changed_metrics() == set()
+    assert ex.is_modified()
+
+
+def test_save_exercise_writes_only_changed_metrics(sample_db):
+    ex = core.Exercise("Push-up", db_path=sample_db)
+    ex.add_metric({"name": "Weight", "type": "float"})
+    core.save_exercise(ex)
+
+    conn = sqlite3.connect(sample_db)
+    before = conn.execute(
+        "SELECT id, metric_type_id FROM library_exercise_metrics WHERE deleted = 0"
+        " AND exercise_id = (SELECT id FROM library_exercises WHERE name = 'Push-up' AND is_user_created = 1)"
+        " ORDER BY id"
+    ).fetchall()
+    total_before = conn.execute("SELECT COUNT(*) FROM library_exercise_metrics").fetchone()[0]
+
+    # Saving again without edits leaves the rows untouched
+    core.save_exercise(ex)
+    ex.remove_metric("Weight")
+    core.save_exercise(ex)
+
+    after = conn.execute(
+        "SELECT id, metric_type_id FROM library_exercise_metrics WHERE deleted = 0"
+        " AND exercise_id = (SELECT id FROM library_exercises WHERE name = 'Push-up' AND is_user_created = 1)"
+        " ORDER BY id"
+    ).fetchall()
+    total_after = conn.execute("SELECT COUNT(*) FROM library_exercise_metrics").fetchone()[0]
+    conn.close()
+
+    assert after == before[:-1]
+    assert total_after == total_before
@@ -0,0 +1,150 @@
+import sqlite3
+
+import pytest
+
+import core
+
+
+def test_library_cache_reuses_rows(sample_db):
+    cache = core.get_library_cache(sample_db)
+    first = cache.exercises()
+    assert ("Push-up", False) in first
+
+    statements = []
+    core.get_database(sample_db).connection().set_trace_callback(statements.append)
+    assert cache.exercises() is first
+    assert core.get_library_cache(sample_db) is cache
+    assert statements == []
+
+
+def test_save_and_delete_exercise_invalidate_cache(sample_db):
+    cache = core.get_library_cache(sample_db)
+    events = []
+    cache.subscribe(lambda kind, version: events.append((kind, version)))
+    assert ("Push-up", True) not in cache.exercises()
+
+    ex = core.Exercise("Push-up", db_path=sample_db)
+    ex.description = "changed"
+    core.save_exercise(ex)
+    assert events == [("exercises", 1)]
+    assert ("Push-up", True) in cache.exercises()
+
+    core.delete_exercise("Push-up", db_path=sample_db, is_user_created=True)
+    assert events[-1] == ("exercises", 2)
+    assert ("Push-up", True) not in cache.exercises()
+
+
+def test_metric_type_helpers_invalidate_cache(sample_db):
+    cache = core.get_library_cache(sample_db)
+    events = []
+
+    def listener(kind, version):
+        events.append(kind)
+
+    cache.subscribe(listener)
+    core.add_metric_type("Tempo", "str", "post_set", "set", db_path=sample_db)
+    assert "Tempo" in {m["name"] for m in cache.metric_types()}
+    core.update_metric_type("Tempo", description="slow", db_path=sample_db)
+    assert any(m["description"] == "slow" for m in cache.metric_types())
+    core.delete_metric_type("Tempo", db_path=sample_db)
+    assert "Tempo" not in {m["name"] for m in cache.metric_types()}
+    assert events == ["metrics"] * 3
+    assert cache.versions == {"exercises": 0, "metrics": 3}
+
+    cache.unsubscribe(listener)
+    cache.invalidate("metrics")
+    assert len(events) == 3
+
+
+def test_search_index_filters_and_tolerates_typos():
+    index = core.SearchIndex(
+        [("Bench Press", False), ("Push-up", False), ("Push-up", True), ("Café Curl", True)]
+    )
+    assert index.search("") == index.search()
+    assert len(index.search()) == 4
+    assert index.search("PUSH UP") == [("Push-up", False), ("Push-up", True)]
+    assert index.search("push", is_user_created=True) == [("Push-up", True)]
+    assert index.search("cafe") == [("Café Curl", True)]
+    assert index.search("bnech prss") == []
+    assert index.search("bnech prss", fuzzy=True) == [("Bench Press", False)]
+    assert index.search("pu", limit=1) == [("Push-up", False)]
+
+
+def test_search_index_incremental_queries_match_full_scan():
+    names = [(f"Exercise {i}", i % 2 == 0) for i in range(200)]
+    index = core.SearchIndex(names)
+    for query in ["1", "12", "123", "13", "ex", "exercise 1", "exercise 19"]:
+        fresh = core.SearchIndex(names).search(query)
+        assert index.search(query) == fresh
+        assert fresh == [n for n in names if query in n[0].lower()]
+
+
+def test_library_cache_search_index_invalidated(sample_db):
+    cache = core.get_library_cache(sample_db)
+    index = cache.exercise_index()
+    assert index.search("bench") == [("Bench Press", False)]
+    assert cache.exercise_index() is index
+
+    core.save_exercise(core.Exercise("Bench Press", db_path=sample_db))
+    assert cache.exercise_index() is not index
+    assert cache.exercise_index().search("bench", is_user_created=True) == [
+        ("Bench Press", True)
+    ]
+    assert [m["name"] for m in cache.metric_index().search("rep")] == ["Reps"]
+
+
+def test_search_library_ranks_and_tracks_changes(sample_db):
+    results = core.search_library("bench", sample_db)
+    assert [(r["kind"], r["name"]) for r in results] == [("exercise", "Bench Press")]
+
+    # Description hits rank below name hits and prefixes match whole words
+    ex = core.Exercise("Push-up", db_path=sample_db)
+    ex.description = "Bodyweight alternative to the bench press"
+    core.save_exercise(ex)
+    names = [r["name"] for r in core.search_library("ben", sample_db, kind="exercise")]
+    assert names == ["Bench Press", "Push-up"]
+    user = core.search_library("bench", sample_db, is_user_created=True)
+    assert [r["name"] for r in user] == ["Push-up"]
+
+    core.delete_exercise("Push-up", db_path=sample_db, is_user_created=True)
+    assert [r["name"] for r in core.search_library("bench", sample_db)] == ["Bench Press"]
+
+    metrics = core.search_library("REP", sample_db, kind="metric", limit=5)
+    assert [r["name"] for r in metrics] == ["Reps"]
+    assert core.search_library("  ", sample_db) == []
+
+
+def test_search_library_without_fts_tables(sample_db):
+    # Open the database first so the schema bootstrap does not recreate them
+    core.get_database(sample_db).connection()
+    conn = sqlite3.connect(sample_db)
+    for table in ("library_exercises", "library_metric_types"):
+        for suffix in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER {table}_fts_{suffix}")
+        conn.execute(f"DROP TABLE {table}_fts")
+    conn.commit()
+    conn.close()
+
+    assert [r["name"] for r in core.search_library("press", sample_db)] == ["Bench Press"]
+    assert core.search_library("press", sample_db, is_user_created=True) == []
+
+
+def test_search_library_groups_results_by_kind(sample_db):
+    conn = sqlite3.connect(sample_db)
+    conn.execute(
+        "UPDATE library_metric_types SET description = 'Reps at a bench' WHERE name = 'Reps'"
+    )
+    conn.commit()
+    conn.close()
+
+    results = core.search_library("bench", sample_db, limit=1)
+    assert [(r["kind"], r["name"]) for r in results] == [
+        ("exercise", "Bench Press"),
+        ("metric", "Reps"),
+    ]
+
+
+def test_search_library_reports_bad_queries(sample_db, monkeypatch):
+    monkeypatch.setattr(core, "_fts_query", lambda query: '"unterminated')
+    with pytest.raises(sqlite3.OperationalError):
+        core.search_library("bench", sample_db)
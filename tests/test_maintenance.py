@@ -0,0 +1,145 @@
+import json
+import sqlite3
+
+import core
+import maintenance
+
+
+def _count(db_path, table, where="1"):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_purge_keeps_rows_that_are_still_referenced(sample_db):
+    conn = sqlite3.connect(sample_db)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(
+        "UPDATE library_exercises SET deleted = 1 WHERE name = 'Bench Press'"
+    )
+    conn.execute(
+        "UPDATE library_exercise_metrics SET deleted = 1 WHERE exercise_id = "
+        "(SELECT id FROM library_exercises WHERE name = 'Bench Press')"
+    )
+    conn.execute(
+        "UPDATE preset_section_exercises SET deleted = 1 WHERE exercise_name = 'Push-up'"
+    )
+    conn.execute(
+        "UPDATE preset_exercise_metrics SET deleted = 1 WHERE section_exercise_id = "
+        "(SELECT id FROM preset_section_exercises WHERE exercise_name = 'Push-up')"
+    )
+    conn.commit()
+
+    with conn:
+        purged = maintenance.purge_soft_deleted(conn.cursor())
+    conn.close()
+
+    assert purged["library_exercise_metrics"] == 3
+    assert purged["preset_exercise_metrics"] == 1
+    assert purged["preset_section_exercises"] == 1
+    # Bench Press is soft-deleted but a preset exercise still links to it.
+    assert purged["library_exercises"] == 0
+    assert _count(sample_db, "library_exercises", "name = 'Bench Press'") == 1
+    assert _count(sample_db, "preset_section_exercises", "exercise_name = 'Bench Press'") == 1
+    assert _count(sample_db, "preset_exercise_metrics") == 3
+
+
+def test_purge_cascades_through_deleted_children(sample_db):
+    conn = sqlite3.connect(sample_db)
+    conn.execute("PRAGMA foreign_keys = ON")
+    for table in (
+        "preset_presets",
+        "preset_preset_sections",
+        "preset_section_exercises",
+        "preset_exercise_metrics",
+    ):
+        conn.execute(f"UPDATE {table} SET deleted = 1")
+    conn.commit()
+
+    with conn:
+        purged = maintenance.purge_soft_deleted(conn.cursor())
+    conn.close()
+
+    assert purged["preset_presets"] == 1
+    assert purged["preset_preset_sections"] == 1
+    assert purged["preset_section_exercises"] == 2
+    assert purged["preset_exercise_metrics"] == 4
+    assert _count(sample_db, "library_exercises") == 2
+
+
+def test_run_maintenance_reclaims_pages(sample_db):
+    conn = sqlite3.connect(sample_db)
+    conn.executemany(
+        "INSERT INTO library_exercises (name, description, deleted) VALUES (?, ?, 1)",
+        [(f"Old {i}", "x" * 500) for i in range(500)],
+    )
+    conn.commit()
+    conn.close()
+
+    report = maintenance.run_maintenance(sample_db, repeat=1)
+
+    assert report["purged"]["library_exercises"] == 500
+    assert report["converted_to_incremental"] is True
+    assert report["reclaimed_pages"] > 0
+    assert report["pages_after"] < report["pages_before"]
+    assert set(report["timings_ms"]) == set(maintenance.TIMED_QUERIES)
+    assert core.get_all_exercises(sample_db) == ["Bench Press", "Push-up"]
+
+    conn = sqlite3.connect(sample_db)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    conn.close()
+
+    again = maintenance.run_maintenance(sample_db, repeat=1)
+    assert again["converted_to_incremental"] is False
+    assert sum(again["purged"].values()) == 0
+
+
+def test_cli_prints_json_report(sample_db, capsys):
+    maintenance.main(["--db", str(sample_db), "--repeat", "1", "--json"])
+    report = json.loads(capsys.readouterr().out)
+    assert report["db_path"] == str(sample_db)
+    assert "Purged rows: 0" in maintenance.format_report(report)
+
+
+def test_rebuild_recomputes_progress(sample_db):
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    for metrics in ({"Reps": 10}, {"Reps": 8}, {"Reps": 5, "Weight": 100}, {"Reps": 5, "Weight": 100}):
+        session.record_metrics(metrics)
+    session.save()
+    core.WorkoutDatabase.close_all()
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DELETE FROM progress_exercise_weekly")
+    conn.commit()
+    conn.close()
+
+    report = maintenance.run_maintenance(sample_db, repeat=1, rebuild=True)
+
+    assert report["rebuilt"] == {"progress_sets": 4, "record_sets": 4}
+    assert core.get_exercise_progress("Bench Press", db_path=sample_db)[0]["tonnage"] == 1000
+
+
+def test_maintenance_skips_tables_the_database_lacks(shipped_db, capsys):
+    conn = sqlite3.connect(shipped_db)
+    conn.execute("UPDATE library_exercises SET deleted = 1 WHERE id = (SELECT MAX(id) FROM library_exercises)")
+    conn.commit()
+    conn.close()
+
+    report = maintenance.run_maintenance(shipped_db, repeat=1, rebuild=True)
+
+    assert "session_sessions" in report["missing_tables"]
+    assert "progress_personal_records" in report["missing_tables"]
+    assert "session_sessions" not in report["purged"]
+    assert "library_exercises" in report["purged"]
+    assert "session_history" not in report["timings_ms"]
+    assert "library_exercises" in report["timings_ms"]
+    assert report["rebuilt"] == {}
+    # Maintenance reports the schema; it does not create the missing tables.
+    conn = sqlite3.connect(shipped_db)
+    assert "session_sessions" in maintenance.missing_tables(conn)
+    conn.close()
+
+    maintenance.main(["--db", str(shipped_db), "--repeat", "1"])
+    assert "Skipped missing tables: " in capsys.readouterr().out
@@ -349,6 +349,29 @@ def test_is_modified_tracking(db_copy):
     editor.close()
 
 
+def test_is_modified_ignores_no_op_edits(db_with_preset):
+    editor = PresetEditor("Test Preset", db_path=db_with_preset)
+    name = editor.sections[0]["name"]
+    ex = editor.sections[0]["exercises"][0]
+
+    editor.rename_section(0, name)
+    editor.update_exercise(0, 0, sets=ex["sets"], rest=ex["rest"])
+    editor.move_exercise(0, 0, 0)
+    editor.remove_metric("NotAMetric")
+    assert editor.is_modified() is False
+
+    editor.preset_name = "Renamed"
+    assert editor.is_modified() is True
+    editor.preset_name = "Test Preset"
+    assert editor.is_modified() is False
+
+    editor.update_exercise(0, 0, sets=ex["sets"] + 1)
+    assert editor.is_modified() is True
+    editor.save()
+    assert editor.is_modified() is False
+    editor.close()
+
+
 def test_remove_exercise_and_save(db_with_preset):
     editor = PresetEditor("Test Preset", db_path=db_with_preset)
     editor.remove_exercise(0, 0)
@@ -385,4 +408,162 @@ def test_move_exercise_updates_position_only(sample_db):
     assert deleted == 0
 
 
+def test_save_resolves_library_in_one_query(sample_db):
+    editor = PresetEditor("Push Day", db_path=sample_db)
+    editor.add_section("Finisher")
+    editor.add_exercise(1, "Push-up")
+    editor.add_exercise(1, "Bench Press")
+    statements = []
+    editor.conn.set_trace_callback(statements.append)
+    editor.save()
+    editor.conn.set_trace_callback(None)
+    lookups = [s for s in statements if "FROM library_exercises" in s]
+    assert len(lookups) == 1
+
+    conn = sqlite3.connect(sample_db)
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT se.exercise_name, COUNT(m.id)
+          FROM preset_section_exercises se
+          JOIN preset_preset_sections s ON s.id = se.section_id
+          LEFT JOIN preset_exercise_metrics m
+                 ON m.section_exercise_id = se.id AND m.deleted = 0
+         WHERE s.name = 'Finisher' AND se.deleted = 0
+         GROUP BY se.id ORDER BY se.position
+        """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    editor.close()
+    assert rows == [("Push-up", 1), ("Bench Press", 3)]
+    assert all(ex["id"] is not None for ex in editor.sections[1]["exercises"])
+
 
+def test_remove_section_soft_deletes_children(sample_db):
+    editor = PresetEditor("Push Day", db_path=sample_db)
+    editor.add_section("Extra")
+    editor.add_exercise(1, "Push-up")
+    editor.save()
+    editor.remove_section(0)
+    editor.save()
+    conn = sqlite3.connect(sample_db)
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM preset_preset_sections WHERE deleted = 0")
+    sections = [r[0] for r in cur.fetchall()]
+    cur.execute(
+        "SELECT COUNT(*) FROM preset_section_exercises WHERE deleted = 0"
+    )
+    active_exercises = cur.fetchone()[0]
+    cur.execute(
+        "SELECT COUNT(*) FROM preset_exercise_metrics WHERE deleted = 0"
+    )
+    active_metrics = cur.fetchone()[0]
+    conn.close()
+    editor.close()
+    # Section 0 was renamed in place to "Extra" holding the single Push-up;
+    # the original rows were soft-deleted.
+    assert sections == ["Extra"]
+    assert active_exercises == 1
+    assert active_metrics == 1
+
+
+def test_undo_redo_and_discard(db_with_preset):
+    editor = PresetEditor("Test Preset", db_path=db_with_preset)
+    original = editor.to_dict()
+
+    editor.add_section("Extra")
+    editor.rename_section(0, "Renamed")
+    editor.update_exercise(0, 0, sets=9)
+    editor.remove_exercise(0, 0)
+    assert editor.is_modified()
+
+    assert editor.undo()
+    assert editor.sections[0]["exercises"][0]["sets"] == 9
+    assert editor.undo()
+    assert editor.sections[0]["exercises"][0]["sets"] == original["sections"][0]["exercises"][0]["sets"]
+    assert editor.redo()
+    assert editor.sections[0]["exercises"][0]["sets"] == 9
+
+    editor.discard()
+    assert editor.to_dict() == original
+    assert not editor.is_modified()
+    assert not editor.can_undo()
+    editor.close()
+
+
+def test_undo_past_save_marks_modified(db_with_preset):
+    editor = PresetEditor("Test Preset", db_path=db_with_preset)
+    editor.update_exercise(0, 0, sets=7)
+    editor.save()
+    assert not editor.is_modified()
+
+    editor.undo()
+    assert editor.is_modified()
+    editor.update_exercise(0, 0, sets=8)
+    assert editor.is_modified()
+
+    editor.discard()
+    assert editor.sections[0]["exercises"][0]["sets"] == 7
+    assert not editor.is_modified()
+    editor.close()
+
+
+def test_save_skips_untouched_parts(db_with_preset):
+    editor = PresetEditor("Test Preset", db_path=db_with_preset)
+    statements = []
+    editor.conn.set_trace_callback(statements.append)
+    editor.save()
+    assert not any("preset_section_exercises" in sql for sql in statements)
+    assert not any("preset_preset_metrics" in sql for sql in statements)
+
+    statements.clear()
+    editor.update_exercise(0, 0, sets=6)
+    editor.save()
+    assert any("UPDATE preset_section_exercises" in sql for sql in statements)
+    assert not any("preset_preset_metrics" in sql for sql in statements)
+    editor.conn.set_trace_callback(None)
+    editor.close()
+
+
+def test_direct_edits_are_saved_and_discarded(db_with_preset):
+    editor = PresetEditor("Test Preset", db_path=db_with_preset)
+
+    editor.sections[0]["name"] = "Renamed"
+    editor.preset_metrics.append(
+        {
+            "name": "Focus",
+            "type": "str",
+            "input_timing": "preset",
+            "is_required": False,
+            "scope": "preset",
+            "description": "",
+            "values": [],
+            "value": "Legs",
+        }
+    )
+    editor.discard()
+    assert editor.sections[0]["name"] != "Renamed"
+    assert all(m["name"] != "Focus" for m in editor.preset_metrics)
+
+    editor.sections[0]["exercises"][0]["rest"] = 45
+    editor.save()
+    assert not editor.is_modified()
+    editor.close()
+
+    reloaded = PresetEditor("Test Preset", db_path=db_with_preset)
+    assert reloaded.sections[0]["exercises"][0]["rest"] == 45
+    reloaded.close()
+
+
+def test_is_modified_does_not_compare_content(db_with_preset, monkeypatch):
+    editor = PresetEditor("Test Preset", db_path=db_with_preset)
+
+    def fail():
+        raise AssertionError("is_modified must not compare the preset content")
+
+    monkeypatch.setattr(editor, "_changed_parts", fail)
+    assert not editor.is_modified()
+    editor.update_exercise(0, 0, sets=9)
+    assert editor.is_modified()
+    editor.close()
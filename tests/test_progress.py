@@ -0,0 +1,226 @@
+import datetime
+import sqlite3
+
+import pytest
+
+import core
+
+
+def _run_push_day(db_path, bench_sets, pushup_reps=(10, 8)):
+    session = core.WorkoutSession("Push Day", db_path=db_path)
+    for reps in pushup_reps:
+        session.record_metrics({"Reps": reps})
+    for reps, weight in bench_sets:
+        session.record_metrics({"Reps": reps, "Weight": weight, "Machine": "A"})
+    return session
+
+
+def test_estimated_one_rep_max():
+    assert core.estimated_one_rep_max(100, 1) == 100
+    assert core.estimated_one_rep_max(100, 10) == pytest.approx(133.333, rel=1e-4)
+    assert core.estimated_one_rep_max(None, 10) == 0
+    assert core.estimated_one_rep_max(100, 0) == 0
+
+
+def test_save_updates_progress_aggregates(sample_db):
+    session = _run_push_day(sample_db, [(5, 100), (10, 90)])
+    session.save()
+
+    today = datetime.date.today()
+    week = today - datetime.timedelta(days=today.weekday())
+    daily = core.get_exercise_progress("Bench Press", period="day", db_path=sample_db)
+    weekly = core.get_exercise_progress("Bench Press", db_path=sample_db)
+
+    assert [row["period_start"] for row in daily] == [today.isoformat()]
+    assert [row["period_start"] for row in weekly] == [week.isoformat()]
+    row = weekly[0]
+    assert row["sessions"] == 1
+    assert row["sets"] == 2
+    assert row["reps"] == 15
+    assert row["tonnage"] == 5 * 100 + 10 * 90
+    # 90 x 10 estimates higher than 100 x 5.
+    assert (row["best_weight"], row["best_reps"]) == (90, 10)
+    assert row["best_e1rm"] == pytest.approx(core.estimated_one_rep_max(90, 10))
+
+    pushups = core.get_exercise_progress("Push-up", db_path=sample_db)[0]
+    assert (pushups["sets"], pushups["reps"], pushups["tonnage"]) == (2, 18, 0)
+    assert pushups["best_reps"] == 10
+    assert core.get_progress_exercises(sample_db) == ["Bench Press", "Push-up"]
+
+
+def test_second_session_merges_into_existing_rows(sample_db):
+    _run_push_day(sample_db, [(5, 100), (5, 100)]).save()
+    _run_push_day(sample_db, [(3, 120), (1, 130)]).save()
+
+    row = core.get_exercise_progress("Bench Press", period="day", db_path=sample_db)[0]
+    assert row["sessions"] == 2
+    assert row["sets"] == 4
+    assert row["tonnage"] == 1000 + 360 + 130
+    assert (row["best_weight"], row["best_reps"]) == (120, 3)
+
+
+def test_save_does_not_read_set_history(sample_db, monkeypatch):
+    _run_push_day(sample_db, [(5, 100), (5, 100)]).save()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("saving should not rescan history")
+
+    monkeypatch.setattr(core, "_history_set_rows", fail)
+    _run_push_day(sample_db, [(5, 100), (5, 100)]).save()
+
+
+def test_rebuild_matches_incremental_updates(sample_db):
+    _run_push_day(sample_db, [(5, 100), (8, 90)]).save()
+    _run_push_day(sample_db, [(6, 95), (2, 110)], pushup_reps=(12, 11)).save()
+    incremental = {
+        (period, name): core.get_exercise_progress(name, period=period, db_path=sample_db)
+        for period in ("day", "week")
+        for name in ("Bench Press", "Push-up")
+    }
+
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DELETE FROM progress_exercise_daily")
+    conn.execute("DELETE FROM progress_exercise_weekly")
+    conn.commit()
+    conn.close()
+
+    assert core.rebuild_progress(sample_db) == 8
+    rebuilt = {
+        key: core.get_exercise_progress(key[1], period=key[0], db_path=sample_db)
+        for key in incremental
+    }
+    assert rebuilt == incremental
+
+
+def test_progress_range_and_period_validation(sample_db):
+    _run_push_day(sample_db, [(5, 100), (5, 100)]).save()
+    today = datetime.date.today()
+
+    assert core.get_exercise_progress(
+        "Bench Press", period="day", start=today, end=today, db_path=sample_db
+    )
+    assert not core.get_exercise_progress(
+        "Bench Press", period="day", start=today + datetime.timedelta(days=1), db_path=sample_db
+    )
+    with pytest.raises(ValueError):
+        core.get_exercise_progress("Bench Press", period="month", db_path=sample_db)
+
+
+def test_set_records_rank_weight_by_rep_count():
+    records = core._set_records({"Reps": 5, "Weight": 100.0, "Machine": "A"})
+    assert records == [("Reps", 0, 5.0), ("Weight", 5, 100.0)]
+    assert core._set_records({"Reps": 0, "Weight": 0}) == []
+
+
+def test_rpe_never_creates_a_record(sample_db):
+    assert core._set_records({"RPE": 9, "Time": 60}) == []
+
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    session.record_metrics({"Reps": 10, "RPE": 7})
+    assert [r["metric"] for r in session.new_records] == ["Reps"]
+    session.record_metrics({"Reps": 8, "RPE": 9})
+    assert session.new_records == []
+    session.save()
+
+    assert [
+        r["metric_name"] for r in core.get_personal_records("Push-up", db_path=sample_db)
+    ] == ["Reps"]
+    core.rebuild_personal_records(sample_db)
+    assert [
+        r["metric_name"] for r in core.get_personal_records("Push-up", db_path=sample_db)
+    ] == ["Reps"]
+
+
+def test_session_reports_records_as_sets_are_recorded(sample_db):
+    _run_push_day(sample_db, [(5, 100), (5, 100)]).save()
+
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    statements = []
+    core.get_database(sample_db).connection().set_trace_callback(statements.append)
+    session.record_metrics({"Reps": 12})
+    assert statements == []
+    assert session.new_records == [
+        {"exercise": "Push-up", "metric": "Reps", "rep_range": 0, "value": 12, "previous": 10}
+    ]
+    session.record_metrics({"Reps": 9})
+    assert session.new_records == []
+    session.record_metrics({"Reps": 5, "Weight": 100})
+    assert session.new_records == []
+    session.record_metrics({"Reps": 3, "Weight": 110})
+    assert [(r["metric"], r["rep_range"], r["previous"]) for r in session.new_records] == [
+        ("Weight", 3, None)
+    ]
+    session_id = session.save()
+
+    records = {
+        (r["metric_name"], r["rep_range"]): (r["value"], r["session_id"])
+        for r in core.get_personal_records("Bench Press", db_path=sample_db)
+    }
+    assert records[("Weight", 5)][0] == 100
+    assert records[("Weight", 3)] == (110, session_id)
+    assert records[("Reps", 0)][0] == 5
+    assert core.get_personal_records("Push-up", db_path=sample_db)[0]["value"] == 12
+
+
+def test_unsaved_session_does_not_store_records(sample_db):
+    session = _run_push_day(sample_db, [(5, 100), (5, 100)])
+    assert session.records[("Bench Press", "Weight", 5)] == 100
+    assert core.get_personal_records("Bench Press", db_path=sample_db) == []
+
+
+def test_rebuild_personal_records_matches_incremental(sample_db):
+    _run_push_day(sample_db, [(5, 100), (8, 90)]).save()
+    _run_push_day(sample_db, [(5, 105), (1, 130)], pushup_reps=(12, 11)).save()
+    expected = {
+        name: core.get_personal_records(name, db_path=sample_db)
+        for name in ("Bench Press", "Push-up")
+    }
+
+    assert core.rebuild_personal_records(sample_db) == 8
+    assert {
+        name: core.get_personal_records(name, db_path=sample_db) for name in expected
+    } == expected
+
+
+def test_session_starts_on_database_without_records_table(shipped_db):
+    preset = core.load_workout_presets(shipped_db)[0]
+    exercise = preset["exercises"][0]["name"]
+
+    session = core.WorkoutSession(preset["name"], db_path=shipped_db)
+    assert session.records == {}
+    session.record_metrics({"Reps": 5, "Weight": 40})
+    assert session.new_records[0]["previous"] is None
+    while not session.record_metrics({"Reps": 5, "Weight": 40}):
+        pass
+    session.save()
+
+    records = core.get_personal_records(exercise, db_path=shipped_db)
+    assert {(r["metric_name"], r["rep_range"], r["value"]) for r in records} == {
+        ("Reps", 0, 5),
+        ("Weight", 5, 40),
+    }
+
+
+def test_failed_progress_write_rolls_back_the_whole_save(sample_db, monkeypatch):
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    for metrics in ({"Reps": 10}, {"Reps": 8}, {"Reps": 5, "Weight": 100}, {"Reps": 5, "Weight": 100}):
+        session.record_metrics(metrics)
+
+    def fail(cursor, totals):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(core, "_write_progress", fail)
+    with pytest.raises(sqlite3.OperationalError):
+        session.save()
+    assert session.session_id is None
+    assert not session.saved
+    conn = sqlite3.connect(sample_db)
+    for table in ("session_sessions", "session_sets", "session_set_metrics"):
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+    conn.close()
+
+    monkeypatch.undo()
+    session_id = session.save()
+    assert core.get_exercise_progress("Bench Press", db_path=sample_db)[0]["tonnage"] == 1000
+    assert core.find_unfinished_sessions(sample_db) == []
+    assert session_id == session.session_id
@@ -0,0 +1,175 @@
+"""Check the query plans of the SQL issued by ``core``.
+
+A representative workflow is run against the sample database while every
+statement is recorded.  Each recorded statement is then passed through
+``EXPLAIN QUERY PLAN`` to make sure lookups are served by an index instead
+of scanning a whole table.
+"""
+
+import sqlite3
+
+import pytest
+
+import core
+
+# Statements that intentionally read every active row of a table: the
+# scanned table (or its alias) and the start of the statement.
+ALLOWED_SCANS = {
+    # Whole preset catalogue loaded at startup
+    ("p", "SELECT p.id, p.name, se.exercise_name"),
+    # Library listings cached by ``LibraryCache``
+    ("library_exercises", "SELECT name, is_user_created FROM library_exercises"),
+    ("library_exercises", "SELECT name FROM library_exercises"),
+    ("library_metric_types", "SELECT name, type, input_timing"),
+    # Walks idx_session_sessions_in_progress, which only holds unfinished sessions
+    ("session_sessions", "SELECT id, preset_name, started_at FROM session_sessions"),
+}
+
+
+def _run_workflow(db):
+    core.load_workout_presets(db)
+    core.load_workout_presets(db, names=["Push Day"])
+    core.get_all_exercises(db, include_user_created=True)
+    core.get_all_exercises(db)
+    core.get_exercise_details("Bench Press", db)
+    core.get_metrics_for_exercise("Bench Press", db, preset_name="Push Day")
+    core.get_all_metric_types(db, include_user_created=True)
+    core.get_all_metric_types(db)
+    core.search_library("bench", db)
+    core.is_metric_type_user_created("Reps", db_path=db)
+
+    core.add_metric_type("Tempo", "int", "post_set", "set", db_path=db)
+    core.add_metric_to_exercise("Push-up", "Tempo", db_path=db)
+    core.set_exercise_metric_override(
+        "Push-up", "Tempo", input_timing="pre_set", db_path=db
+    )
+    core.set_section_exercise_metric_override(
+        "Push Day", 0, "Bench Press", "Weight", input_timing="post_set", db_path=db
+    )
+    core.remove_metric_from_exercise("Push-up", "Tempo", db_path=db)
+    core.update_metric_type("Tempo", description="slow", db_path=db)
+    core.delete_metric_type("Tempo", db_path=db)
+
+    ex = core.Exercise("Push-up", db_path=db)
+    ex.description = "changed"
+    core.save_exercise(ex)
+    core.save_exercise(core.Exercise("Push-up", db_path=db, is_user_created=True))
+    core.delete_exercise("Push-up", db_path=db, is_user_created=True)
+
+    editor = core.PresetEditor("Push Day", db)
+    editor.add_section("Extra")
+    editor.add_exercise(1, "Bench Press")
+    editor.save()
+    editor.remove_section(1)
+    editor.save()
+    editor.close()
+
+    session = core.WorkoutSession("Push Day", db, journal=True)
+    session.record_metrics({"Reps": 5})
+    core.find_unfinished_sessions(db)
+    session = core.WorkoutSession.resume(session.session_id, db)
+    while not session.record_metrics({"Reps": 5, "Weight": 10}):
+        pass
+    session.save()
+
+
+@pytest.fixture
+def recorded_statements(sample_db, monkeypatch):
+    statements = []
+    open_connection = core.WorkoutDatabase.open_connection
+
+    def traced(self):
+        conn = open_connection(self)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(core.WorkoutDatabase, "open_connection", traced)
+    _run_workflow(sample_db)
+    core.WorkoutDatabase.close_all()
+    return sample_db, statements
+
+
+def _query_statements(statements):
+    seen = set()
+    for sql in statements:
+        sql = " ".join(sql.split())
+        verb = sql.split(" ", 1)[0].upper()
+        if verb not in ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH"):
+            continue
+        # Internal bookkeeping issued by the FTS5 module itself
+        if "'main'." in sql:
+            continue
+        if sql not in seen:
+            seen.add(sql)
+            yield sql
+
+
+def _full_scans(conn, sql):
+    """Return the tables that ``sql`` reads in full, including full index scans."""
+
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    subqueries = {
+        row[-1].split()[-1]
+        for row in rows
+        if row[-1].startswith(("CO-ROUTINE", "MATERIALIZE"))
+    }
+    scans = []
+    for row in rows:
+        parts = row[-1].split()
+        if parts[0] != "SCAN" or "VIRTUAL" in parts or parts[1] in subqueries:
+            continue
+        scans.append(parts[1])
+    return scans
+
+
+def test_core_queries_use_indexes(recorded_statements):
+    db, statements = recorded_statements
+    conn = sqlite3.connect(db)
+    offending = []
+    checked = 0
+    for sql in _query_statements(statements):
+        checked += 1
+        for table in _full_scans(conn, sql):
+            if not any(
+                table == allowed and sql.startswith(prefix)
+                for allowed, prefix in ALLOWED_SCANS
+            ):
+                offending.append(f"{table}: {sql}")
+    conn.close()
+    assert checked > 50
+    assert offending == []
+
+
+@pytest.mark.parametrize(
+    "sql, index",
+    [
+        (
+            "SELECT id, name FROM preset_preset_sections WHERE preset_id = 1 AND deleted = 0 ORDER BY position",
+            "COVERING INDEX idx_preset_sections_preset_active",
+        ),
+        (
+            "SELECT id, exercise_name, number_of_sets, rest_time, library_exercise_id"
+            " FROM preset_section_exercises WHERE section_id = 1 AND deleted = 0 ORDER BY position",
+            "COVERING INDEX idx_preset_section_exercises_section_active",
+        ),
+        (
+            "SELECT 1 FROM preset_section_exercises WHERE library_exercise_id = 1 AND deleted = 0 LIMIT 1",
+            "COVERING INDEX idx_preset_section_exercises_library_active",
+        ),
+        (
+            "SELECT 1 FROM library_exercise_metrics WHERE metric_type_id = 1 AND deleted = 0 LIMIT 1",
+            "COVERING INDEX idx_library_exercise_metrics_metric_type_active",
+        ),
+        (
+            "SELECT metric_name FROM preset_exercise_metrics WHERE section_exercise_id = 1 AND deleted = 0",
+            # Served by the existing unique index on (section_exercise_id, metric_name)
+            "INDEX idx_unique_exercise_metric_active",
+        ),
+    ],
+)
+def test_hot_lookups_use_indexes(sample_db, sql, index):
+    conn = sqlite3.connect(sample_db)
+    plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+    conn.close()
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
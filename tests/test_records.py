@@ -0,0 +1,66 @@
+import copy
+import sys
+
+import pytest
+
+import core
+
+
+def test_metric_def_behaves_like_a_dict():
+    metric = core.MetricDef("Reps", "int", "post_set", True, "set")
+    expected = {
+        "name": "Reps",
+        "type": "int",
+        "input_timing": "post_set",
+        "is_required": True,
+        "scope": "set",
+    }
+
+    assert metric["name"] == metric.name == "Reps"
+    assert metric == expected
+    assert expected == metric
+    assert list(metric) == list(expected)
+    assert "values" not in metric
+    assert metric.get("values", []) == []
+    with pytest.raises(KeyError):
+        metric["values"]
+
+    metric.update({"values": ["A"]}, is_required=False)
+    assert {**metric} == dict(metric) == {**expected, "is_required": False, "values": ["A"]}
+    with pytest.raises(KeyError):
+        metric["unknown"] = 1
+    with pytest.raises(KeyError):
+        metric["get"]
+
+    clone = metric.copy()
+    clone["name"] = "Weight"
+    assert metric["name"] == "Reps"
+    assert copy.deepcopy(metric) == metric
+
+
+def test_records_are_smaller_than_dicts():
+    record = core.PresetExercise("Push-up", 3, 90, id=1, library_id=4)
+    assert sys.getsizeof(record) < sys.getsizeof(dict(record))
+
+
+def test_exercise_ref_keeps_tuple_behaviour(sample_db):
+    refs = core.get_all_exercises(sample_db, include_user_created=True)
+    name, flag = refs[0]
+    assert refs[0] == ("Bench Press", False)
+    assert refs[0].name == refs[0]["name"] == name
+    assert refs[0][1] is flag is False
+    assert refs[0].get("missing") is None
+
+
+def test_helpers_return_records(sample_db):
+    metrics = core.get_metrics_for_exercise("Bench Press", db_path=sample_db)
+    assert all(isinstance(m, core.MetricDef) for m in metrics)
+    assert all(
+        isinstance(m, core.MetricDef) for m in core.get_all_metric_types(sample_db)
+    )
+
+    editor = core.PresetEditor("Push Day", sample_db)
+    section = editor.sections[0]
+    assert isinstance(section, core.PresetSection)
+    assert isinstance(section["exercises"][0], core.PresetExercise)
+    editor.close()
@@ -0,0 +1,91 @@
+import sqlite3
+
+import pytest
+
+import core
+import tracing
+
+
+@pytest.fixture
+def profiler():
+    was_enabled = tracing.is_enabled()
+    core.WorkoutDatabase.close_all()
+    tracing.PROFILER.reset()
+    yield tracing.enable()
+    core.WorkoutDatabase.close_all()
+    if not was_enabled:
+        tracing.disable()
+    tracing.PROFILER.reset()
+
+
+def test_disabled_connections_are_plain():
+    if tracing.is_enabled():
+        pytest.skip("tracing enabled from the environment")
+    conn = tracing.connect(":memory:")
+    assert type(conn) is sqlite3.Connection
+    conn.close()
+
+
+def test_statements_record_latency_and_rows(profiler, sample_db):
+    assert core.get_all_exercises(sample_db) == ["Bench Press", "Push-up"]
+
+    conn = core.get_database(sample_db).connection()
+    assert isinstance(conn, tracing.TracingConnection)
+    report = profiler.snapshot()
+    (select,) = [s for s in report["statements"] if "FROM library_exercises" in s["name"]]
+    assert select["count"] == 1
+    assert select["rows"] == 2
+    assert select["total_ms"] >= select["max_ms"] > 0
+
+
+def test_functions_record_calls_and_statement_counts(profiler, sample_db):
+    core.get_all_exercises(sample_db)
+    core.get_all_exercises(sample_db)
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    session.record_metrics({"Reps": 10})
+
+    functions = {f["name"]: f for f in profiler.snapshot()["functions"]}
+    assert functions["get_all_exercises"]["count"] == 2
+    assert functions["get_all_exercises"]["rows"] == 4
+    assert functions["WorkoutSession.record_metrics"]["count"] == 1
+
+    recent = profiler.snapshot()["recent"]
+    call = next(e for e in recent if e.get("name") == "get_all_exercises")
+    assert call["statements"] >= 1
+    assert call["rows"] == 2
+    statement = next(e for e in recent if e["kind"] == "statement")
+    assert statement["function"] == "get_all_exercises"
+
+
+def test_ring_buffer_keeps_most_recent_events(sample_db):
+    profiler = tracing.Profiler(capacity=3)
+    profiler.enabled = True
+    for i in range(5):
+        profiler.statement(f"SELECT {i}", 0.001, 1)
+    assert [e["sql"] for e in profiler.snapshot()["recent"]] == [
+        "SELECT 2",
+        "SELECT 3",
+        "SELECT 4",
+    ]
+    assert len(profiler.snapshot()["statements"]) == 5
+
+
+def test_dump_and_load_snapshot(profiler, sample_db, tmp_path, capsys):
+    core.get_all_exercises(sample_db)
+    path = profiler.dump(tmp_path / "profile.json")
+
+    report = tracing.load_snapshot(path)
+    assert report["functions"][0]["name"] == "get_all_exercises"
+    assert tracing.load_snapshot(tmp_path / "missing.json") is None
+
+    tracing.main([str(path)])
+    out = capsys.readouterr().out
+    assert "get_all_exercises" in out
+    assert "FROM library_exercises" in out
+
+
+def test_disable_stops_recording(profiler, sample_db):
+    tracing.disable()
+    core.get_all_exercises(sample_db)
+    assert profiler.snapshot()["functions"] == []
+    assert profiler.snapshot()["statements"] == []
@@ -66,6 +66,16 @@ def test_rest_screen_toggle_ready_changes_state():
     assert screen.timer_color == (0, 1, 0, 1)
 
 
+@pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
+def test_rest_screen_announces_beaten_records():
+    records = [
+        {"exercise": "Bench Press", "metric": "Weight", "rep_range": 5, "value": 102.5, "previous": 100},
+        {"exercise": "Bench Press", "metric": "Reps", "rep_range": 0, "value": 5, "previous": None},
+    ]
+    assert RestScreen._records_text(records) == "New record: Weight 102.5 x 5"
+    assert RestScreen._records_text([]) == ""
+
+
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_update_elapsed_formats_time(monkeypatch):
     screen = WorkoutActiveScreen()
@@ -344,15 +354,7 @@ def test_edit_exercise_go_next(monkeypatch):
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_exercise_selection_panel_filters(monkeypatch):
     panel = ExerciseSelectionPanel()
-    panel.exercise_list = type(
-        "L",
-        (),
-        {
-            "children": [],
-            "clear_widgets": lambda self: self.children.clear(),
-            "add_widget": lambda self, w: self.children.append(w),
-        },
-    )()
+    panel.exercise_list = type("L", (), {"data": []})()
 
     monkeypatch.setattr(
         core,
@@ -361,20 +363,19 @@ def test_exercise_selection_panel_filters(monkeypatch):
     )
 
     panel.populate_exercises()
-    assert len(panel.exercise_list.children) == 2
+    assert len(panel.exercise_list.data) == 2
 
     panel.apply_filter("user")
-    assert len(panel.exercise_list.children) == 1
-    assert panel.exercise_list.children[0].text == "Custom"
+    assert len(panel.exercise_list.data) == 1
+    assert panel.exercise_list.data[0]["text"] == "Custom"
 
 
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_preset_select_button_updates(monkeypatch):
     """Selecting a preset updates the select button text."""
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("presets")
 
     monkeypatch.setattr(
         core,
@@ -509,10 +510,9 @@ def test_edit_metric_type_popup_loads_enum_values():
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_preset_select_button_color(monkeypatch):
     """Selecting a preset updates the select button color."""
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("presets")
 
     monkeypatch.setattr(
         core,
@@ -538,10 +538,9 @@ def test_preset_select_button_color(monkeypatch):
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_preset_selected_text_color_and_clear(monkeypatch):
     """Selecting a preset changes text color and is cleared on leave."""
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("presets")
 
     monkeypatch.setattr(
         core,
@@ -572,10 +571,9 @@ def test_preset_selected_text_color_and_clear(monkeypatch):
 
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_edit_preset_populate_details(monkeypatch):
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("edit_preset")
 
     metrics = [
         {
@@ -621,10 +619,9 @@ def test_edit_preset_populate_details(monkeypatch):
 
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_preset_name_row_preserved(monkeypatch):
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("edit_preset")
 
     monkeypatch.setattr(core, "get_all_metric_types", lambda *a, **k: [])
 
@@ -650,10 +647,9 @@ def test_preset_name_row_preserved(monkeypatch):
 
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_details_has_add_button(monkeypatch):
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("edit_preset")
 
     monkeypatch.setattr(core, "get_all_metric_types", lambda *a, **k: [])
 
@@ -678,10 +674,9 @@ def test_details_has_add_button(monkeypatch):
 
 @pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
 def test_metrics_has_add_button(monkeypatch):
-    from kivy.lang import Builder
-    from pathlib import Path
+    from main import load_screen_kv
 
-    Builder.load_file(str(Path(__file__).resolve().parents[1] / "main.kv"))
+    load_screen_kv("edit_preset")
 
     monkeypatch.setattr(core, "get_all_metric_types", lambda *a, **k: [])
 
@@ -721,3 +716,100 @@ def test_fallback_input_timing_options(monkeypatch):
         "pre_set",
         "post_set",
     ]
+
+
+@pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
+def test_startup_timer_reports_each_phase():
+    from main import StartupTimer
+
+    timer = StartupTimer()
+    timer.mark("imports")
+    timer.mark("build")
+    with timer.measure("presets"):
+        pass
+
+    phases = [line.split()[0] for line in timer.report().splitlines()]
+    assert phases == ["imports", "build", "total", "presets"]
+
+
+@pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
+def test_reconcile_children_reuses_matching_widgets():
+    from main import _reconcile_children
+
+    class Box:
+        def __init__(self):
+            self.children = []
+
+        def add_widget(self, widget, index=0):
+            widget.parent = self
+            self.children.insert(index, widget)
+
+        def remove_widget(self, widget):
+            widget.parent = None
+            self.children.remove(widget)
+
+    class Item:
+        def __init__(self, data):
+            self.data = data
+            self.parent = None
+
+    a, b, c = {"name": "A"}, {"name": "B"}, {"name": "C"}
+    box = Box()
+    built = []
+
+    def build(idx, item):
+        widget = Item(item)
+        built.append(widget)
+        return widget
+
+    _reconcile_children(box, [a, b, c], "data", build, lambda i, w: None)
+    first = list(box.children)
+
+    _reconcile_children(box, [c, a, {"name": "D"}], "data", build, lambda i, w: None)
+
+    shown = [w.data["name"] for w in reversed(box.children)]
+    assert shown == ["C", "A", "D"]
+    assert len(built) == 4
+    assert first[-1] in box.children and first[0] in box.children
+
+
+@pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
+def test_library_screen_rebuilds_only_after_library_changes(monkeypatch, sample_db):
+    import main
+    from main import ExerciseLibraryScreen
+
+    monkeypatch.setattr(main, "DEFAULT_DB_PATH", sample_db)
+    screen = ExerciseLibraryScreen()
+    calls = []
+    monkeypatch.setattr(screen, "populate", lambda *a: calls.append(a))
+
+    screen.on_pre_enter()
+    assert len(calls) == 1
+    screen._shown_versions = dict(core.get_library_cache(sample_db).versions)
+    screen.on_pre_enter()
+    assert len(calls) == 1
+
+    core.get_library_cache(sample_db).invalidate("exercises")
+    assert screen._shown_versions is None
+    screen.on_pre_enter()
+    assert len(calls) == 2
+
+
+@pytest.mark.skipif(not kivy_available, reason="Kivy and KivyMD are required")
+def test_library_screen_lists_description_matches(monkeypatch, sample_db):
+    import main
+    from main import ExerciseLibraryScreen
+
+    monkeypatch.setattr(main, "DEFAULT_DB_PATH", sample_db)
+    ex = core.Exercise("Push-up", db_path=sample_db)
+    ex.description = "Bodyweight alternative to the bench press"
+    core.save_exercise(ex)
+
+    screen = ExerciseLibraryScreen()
+    screen.exercise_list = type("L", (), {"data": []})()
+    screen.search_text = "bench"
+    screen._populate_exercises()
+    assert [row["name"] for row in screen.exercise_list.data] == [
+        "Bench Press",
+        "Push-up",
+    ]
@@ -0,0 +1,136 @@
+import sqlite3
+import threading
+
+import pytest
+
+import core
+
+
+def test_connection_is_reused_per_thread(sample_db):
+    db = core.get_database(sample_db)
+    assert core.get_database(sample_db) is db
+    assert db.connection() is db.connection()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not db.connection()
+
+
+def test_helpers_share_pooled_connection(sample_db, monkeypatch):
+    core.get_all_exercises(sample_db)
+
+    def fail_connect(*args, **kwargs):
+        raise AssertionError("helpers should reuse the pooled connection")
+
+    monkeypatch.setattr(core.sqlite3, "connect", fail_connect)
+    assert core.get_all_exercises(sample_db) == ["Bench Press", "Push-up"]
+    assert core.get_metrics_for_exercise("Push-up", db_path=sample_db)
+    assert core.get_exercise_details("Push-up", db_path=sample_db)
+
+
+def test_transaction_rolls_back_on_error(sample_db):
+    db = core.get_database(sample_db)
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cur:
+            cur.execute("UPDATE library_exercises SET description = 'changed'")
+            raise RuntimeError("boom")
+
+    conn = sqlite3.connect(sample_db)
+    descriptions = {r[0] for r in conn.execute("SELECT description FROM library_exercises")}
+    conn.close()
+    assert "changed" not in descriptions
+
+
+def test_close_all_discards_connections(sample_db):
+    db = core.get_database(sample_db)
+    conn = db.connection()
+    core.WorkoutDatabase.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert core.get_database(sample_db) is not db
+
+
+def test_default_pragma_profile_applied(sample_db):
+    conn = core.get_database(sample_db).connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_pragma_profile_can_be_overridden(sample_db):
+    db = core.WorkoutDatabase(sample_db, {"journal_mode": None, "synchronous": "FULL"})
+    conn = db.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    db.close()
+
+
+def test_close_checkpoints_write_ahead_log(sample_db):
+    db = core.get_database(sample_db)
+    with db.transaction() as cur:
+        cur.execute("UPDATE library_exercises SET description = 'changed'")
+    wal = sample_db.with_name(sample_db.name + "-wal")
+    assert wal.stat().st_size > 0
+    db.close()
+    assert not wal.exists() or wal.stat().st_size == 0
+
+
+def _tables(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    return names
+
+
+def test_first_connection_creates_missing_schema(shipped_db):
+    assert "session_sessions" not in _tables(shipped_db)
+
+    core.get_database(shipped_db).connection()
+
+    tables = _tables(shipped_db)
+    for table in (
+        "session_sessions",
+        "session_set_journal",
+        "progress_exercise_weekly",
+        "progress_personal_records",
+        "library_exercises_fts",
+    ):
+        assert table in tables
+    conn = sqlite3.connect(shipped_db)
+    active = conn.execute("SELECT COUNT(*) FROM library_exercises WHERE deleted = 0").fetchone()[0]
+    assert conn.execute("SELECT COUNT(*) FROM library_exercises_fts").fetchone()[0] == active
+    conn.close()
+
+
+def test_ensure_schema_is_idempotent(sample_db):
+    conn = sqlite3.connect(sample_db)
+    assert core.ensure_schema(conn) == []
+    conn.execute("DROP TABLE progress_personal_records")
+    assert core.ensure_schema(conn) == ["progress_personal_records"]
+    assert core.ensure_schema(conn) == []
+    conn.close()
+
+
+def test_bootstrap_rebuilds_progress_from_saved_sessions(sample_db):
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    for metrics in ({"Reps": 10}, {"Reps": 8}, {"Reps": 5, "Weight": 100}, {"Reps": 5, "Weight": 100}):
+        session.record_metrics(metrics)
+    session.save()
+    core.WorkoutDatabase.close_all()
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DROP TABLE progress_exercise_weekly")
+    conn.execute("DROP TABLE progress_personal_records")
+    conn.commit()
+    conn.close()
+
+    assert core.get_exercise_progress("Bench Press", db_path=sample_db)[0]["tonnage"] == 1000
+    records = core.get_personal_records("Bench Press", db_path=sample_db)
+    assert {(r["metric_name"], r["rep_range"]) for r in records} >= {("Weight", 5)}
+
+
+def test_open_connection_can_skip_bootstrap(shipped_db):
+    conn = core.get_database(shipped_db).open_connection(bootstrap=False)
+    conn.close()
+    assert "session_sessions" not in _tables(shipped_db)
@@ -1,3 +1,7 @@
+import sqlite3
+
+import pytest
+
 import core
 
 
@@ -27,3 +31,136 @@ def test_workout_session_flow(sample_db):
     summary = session.summary()
     assert "Push Day" in summary
     assert "Bench Press" in summary
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_save_persists_completed_session(sample_db):
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    assert _count(sample_db, "session_sessions") == 0
+    session.record_metrics({"Reps": 10})
+    session.record_metrics({"Reps": 8})
+    session.record_metrics({"Reps": 5, "Weight": 100.5, "Machine": "A"})
+    session.record_metrics({"Reps": 4, "Weight": 100.5, "Machine": "B"})
+    session_id = session.save()
+
+    conn = sqlite3.connect(sample_db)
+    status = conn.execute(
+        "SELECT status, preset_name FROM session_sessions WHERE id = ?", (session_id,)
+    ).fetchone()
+    rows = conn.execute(
+        """
+        SELECT e.exercise_name, s.set_number, m.metric_name, m.value
+          FROM session_set_metrics m
+          JOIN session_sets s ON s.id = m.session_set_id
+          JOIN session_exercises e ON e.id = s.session_exercise_id
+         WHERE e.session_id = ?
+         ORDER BY e.position, s.set_number, m.id
+        """,
+        (session_id,),
+    ).fetchall()
+    conn.close()
+
+    assert status == ("completed", "Push Day")
+    assert rows[:2] == [("Push-up", 1, "Reps", 10), ("Push-up", 2, "Reps", 8)]
+    assert ("Bench Press", 1, "Weight", 100.5) in rows
+    assert ("Bench Press", 2, "Machine", "B") in rows
+    assert len(rows) == 8
+    assert session.save() == session_id
+
+
+def test_journal_allows_resume(sample_db):
+    session = core.WorkoutSession("Push Day", db_path=sample_db, journal=True)
+    session.record_metrics({"Reps": 10})
+    session.record_metrics({"Reps": 8})
+    session.record_metrics({"Reps": 5, "Weight": 60})
+    assert _count(sample_db, "session_set_journal") == 3
+
+    unfinished = core.find_unfinished_sessions(sample_db)
+    assert [s["id"] for s in unfinished] == [session.session_id]
+
+    resumed = core.WorkoutSession.resume(session.session_id, db_path=sample_db)
+    assert resumed.next_exercise_display() == "Bench Press set 2 of 2"
+    assert resumed.exercises[0]["results"] == [{"Reps": 10}, {"Reps": 8}]
+    assert resumed.record_metrics({"Reps": 4, "Weight": 60})
+
+    resumed.save()
+    assert _count(sample_db, "session_set_journal") == 0
+    assert _count(sample_db, "session_sets") == 4
+    assert core.find_unfinished_sessions(sample_db) == []
+    with pytest.raises(ValueError):
+        core.WorkoutSession.resume(session.session_id, db_path=sample_db)
+
+
+def test_metric_plan_needs_no_queries(sample_db):
+    session = core.WorkoutSession("Push Day", db_path=sample_db)
+    expected = core.get_metrics_for_exercise(
+        "Bench Press", db_path=sample_db, preset_name="Push Day"
+    )
+
+    statements = []
+    core.get_database(sample_db).connection().set_trace_callback(statements.append)
+    assert session.metrics_for("Bench Press") == expected
+    pre_set = [m["name"] for m in session.metrics_for("Bench Press", "pre_set")]
+    assert pre_set == ["Reps", "Weight"]
+    assert session.metrics_for("Unknown") == []
+    assert statements == []
+
+
+def test_set_results_round_trips_sets():
+    sets = [
+        {"Reps": 5, "Weight": 100.5, "Machine": "A"},
+        {"Weight": 102.5, "Reps": 4},
+        {"Reps": 2**70, "Done": True},
+        {},
+        {"Reps": 3.5, "Weight": 7},
+    ]
+    results = core.SetResults()
+    for metrics in sets:
+        results.append(metrics)
+
+    assert len(results) == 5
+    assert results == sets
+    assert [list(r) for r in results] == [list(s) for s in sets]
+    assert results[-1] == {"Reps": 3.5, "Weight": 7}
+    assert type(results[-1]["Weight"]) is int
+    assert results[1:3] == sets[1:3]
+    assert results.metric_names == ("Reps", "Weight", "Machine", "Done")
+    with pytest.raises(IndexError):
+        results[5]
+
+
+def test_set_results_keep_numbers_in_arrays():
+    results = core.SetResults({"Reps": n, "Weight": n * 2.5} for n in range(100))
+    assert [c.typecode for c in results._columns] == ["q", "d"]
+    assert len(results._layouts) == 1
+
+
+def test_workout_on_shipped_database(shipped_db):
+    preset = core.load_workout_presets(shipped_db)[0]
+    session = core.WorkoutSession(preset["name"], db_path=shipped_db, journal=True)
+    session.record_metrics({"Reps": 5})
+
+    (unfinished,) = core.find_unfinished_sessions(shipped_db)
+    resumed = core.WorkoutSession.resume(unfinished["id"], db_path=shipped_db)
+    while not resumed.record_metrics({"Reps": 5}):
+        pass
+    assert resumed.save() == session.session_id
+    assert core.find_unfinished_sessions(shipped_db) == []
+
+
+def test_discard_unfinished_session(sample_db):
+    session = core.WorkoutSession("Push Day", db_path=sample_db, journal=True)
+    session.record_metrics({"Reps": 10})
+
+    core.discard_unfinished_session(session.session_id, db_path=sample_db)
+
+    assert core.find_unfinished_sessions(sample_db) == []
+    assert _count(sample_db, "session_set_journal") == 0
+    with pytest.raises(ValueError):
+        core.WorkoutSession.resume(session.session_id, db_path=sample_db)
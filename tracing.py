@@ -0,0 +1,398 @@
+"""Opt-in SQL tracing and profiling for :mod:`core`.
+
+Start the app with ``WORKOUT_SQL_TRACE=1`` to record every statement run
+through :class:`core.WorkoutDatabase` connections and every call of the
+public :mod:`core` helpers.  For each statement the template SQL, its
+latency (execution plus fetching) and the number of rows returned or
+changed are kept.  For each helper the latency, the number of rows it
+returned and the number of statements SQLite reported through the trace
+callback are kept.  That count includes the implicit ``BEGIN`` and
+``COMMIT`` and the statements run by triggers.  Totals are kept per
+statement and per function, and the most recent events are kept in a
+ring buffer::
+
+    WORKOUT_SQL_TRACE=1 python main.py
+    python tracing.py            # print the snapshot written on exit
+
+Tracing is off by default and costs nothing then: connections are plain
+``sqlite3`` connections and helpers are only wrapped once tracing is
+enabled.  Connections opened before :func:`enable` are not traced, and
+names imported with ``from core import ...`` before that keep pointing at
+the unwrapped helpers.
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+TRACE_ENV = "WORKOUT_SQL_TRACE"
+SNAPSHOT_ENV = "WORKOUT_SQL_TRACE_FILE"
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parent / "data" / "sql_profile.json"
+
+# Number of recent statement and call events kept
+DEFAULT_CAPACITY = 1000
+
+
+def enabled_from_env() -> bool:
+    """Return ``True`` when :data:`TRACE_ENV` asks for tracing."""
+
+    return os.environ.get(TRACE_ENV, "").strip().lower() not in ("", "0", "false", "no")
+
+
+def snapshot_path() -> Path:
+    """Return where the app writes and the devtool reads profile snapshots."""
+
+    return Path(os.environ.get(SNAPSHOT_ENV) or DEFAULT_SNAPSHOT_PATH)
+
+
+class _Stat:
+    """Running totals for one statement or function."""
+
+    __slots__ = ("count", "seconds", "max_seconds", "rows")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+
+    def add(self, seconds: float, rows: int | None) -> None:
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if rows:
+            self.rows += rows
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.seconds * 1000, 3),
+            "mean_ms": round(self.seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+        }
+
+
+class Profiler:
+    """Collects statement and function timings while :attr:`enabled` is set."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.enabled = False
+        self.events: deque = deque(maxlen=capacity)
+        self.statements: dict[str, _Stat] = {}
+        self.functions: dict[str, _Stat] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        """Forget every recorded event and total."""
+
+        with self._lock:
+            self.events.clear()
+            self.statements.clear()
+            self.functions.clear()
+
+    # -- hooks used by connections, cursors and wrapped functions ------
+
+    def trace(self, sql: str) -> None:
+        """``sqlite3`` trace callback counting statements per thread."""
+
+        self._local.traced = getattr(self._local, "traced", 0) + 1
+
+    def _current_function(self) -> str | None:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def statement(self, sql: str, seconds: float, rows: int | None) -> list:
+        """Record one executed statement and return its mutable event."""
+
+        event = [
+            "statement",
+            time.time(),
+            self._current_function(),
+            sql,
+            seconds,
+            rows if rows and rows > 0 else 0,
+        ]
+        with self._lock:
+            stat = self.statements.get(sql)
+            if stat is None:
+                stat = self.statements[sql] = _Stat()
+            stat.count += 1
+            stat.add(seconds, event[5])
+            self.events.append(event)
+        return event
+
+    def fetched(self, event: list, seconds: float, rows: int) -> None:
+        """Add fetching time and rows to the statement ``event``."""
+
+        with self._lock:
+            event[4] += seconds
+            event[5] += rows
+            stat = self.statements.get(event[3])
+            if stat is not None:
+                stat.add(seconds, rows)
+                stat.max_seconds = max(stat.max_seconds, event[4])
+
+    def call(self, name: str, func, args, kwargs):
+        """Run ``func`` and record its latency, rows and statement count."""
+
+        local = self._local
+        stack = getattr(local, "stack", None)
+        if stack is None:
+            stack = local.stack = []
+        traced = getattr(local, "traced", 0)
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+        rows = len(result) if isinstance(result, (list, tuple, dict, set)) else None
+        statements = getattr(local, "traced", 0) - traced
+        with self._lock:
+            stat = self.functions.get(name)
+            if stat is None:
+                stat = self.functions[name] = _Stat()
+            stat.count += 1
+            stat.add(seconds, rows)
+            self.events.append(["call", time.time(), name, statements, seconds, rows or 0])
+        return result
+
+    # -- reporting -----------------------------------------------------
+
+    def snapshot(self, limit: int = 20, recent: int = 50) -> dict:
+        """Return the slowest statements and functions and recent events."""
+
+        def top(stats: dict[str, _Stat]) -> list[dict]:
+            ranked = sorted(stats.items(), key=lambda item: item[1].seconds, reverse=True)
+            return [{"name": key, **stat.as_dict()} for key, stat in ranked[:limit]]
+
+        with self._lock:
+            events = list(self.events)[-recent:] if recent else []
+            return {
+                "statements": top(self.statements),
+                "functions": top(self.functions),
+                "recent": [
+                    {
+                        "kind": kind,
+                        "time": at,
+                        "function" if kind == "statement" else "name": owner,
+                        "sql" if kind == "statement" else "statements": detail,
+                        "ms": round(seconds * 1000, 3),
+                        "rows": rows,
+                    }
+                    for kind, at, owner, detail, seconds, rows in events
+                ],
+            }
+
+    def dump(self, path: Path | None = None, **kwargs) -> Path:
+        """Write :meth:`snapshot` as JSON to ``path`` and return the path."""
+
+        path = Path(path or snapshot_path())
+        path.write_text(json.dumps(self.snapshot(**kwargs), indent=2) + "\n", encoding="utf-8")
+        return path
+
+
+PROFILER = Profiler()
+
+
+class TracingCursor(sqlite3.Cursor):
+    """Cursor reporting each statement and the rows fetched from it."""
+
+    _event = None
+
+    def _timed(self, method, sql, *args):
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            if PROFILER.enabled:
+                self._event = PROFILER.statement(
+                    sql, time.perf_counter() - start, self.rowcount
+                )
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._timed(super().executescript, sql_script)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        if self._event is not None and PROFILER.enabled:
+            if isinstance(result, list):
+                rows = len(result)
+            else:
+                rows = 0 if result is None else 1
+            PROFILER.fetched(self._event, time.perf_counter() - start, rows)
+        return result
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        if self._event is not None and PROFILER.enabled:
+            PROFILER.fetched(self._event, time.perf_counter() - start, 1)
+        return row
+
+
+class TracingConnection(sqlite3.Connection):
+    """Connection whose cursors, including implicit ones, are traced."""
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect(database, **kwargs) -> sqlite3.Connection:
+    """Open ``database`` like ``sqlite3.connect``, traced when enabled."""
+
+    if not PROFILER.enabled:
+        return sqlite3.connect(database, **kwargs)
+    conn = sqlite3.connect(database, factory=TracingConnection, **kwargs)
+    conn.set_trace_callback(PROFILER.trace)
+    return conn
+
+
+def _wrap(name: str, func):
+    if getattr(func, "_traced_name", None):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.enabled:
+            return func(*args, **kwargs)
+        return PROFILER.call(name, func, args, kwargs)
+
+    wrapper._traced_name = name
+    return wrapper
+
+
+_registered: list[tuple] = []
+
+
+def _instrument(module, classes) -> None:
+    for name, obj in list(vars(module).items()):
+        if (
+            inspect.isfunction(obj)
+            and not name.startswith("_")
+            and obj.__module__ == module.__name__
+        ):
+            setattr(module, name, _wrap(name, obj))
+    for cls in classes:
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_"):
+                continue
+            qualname = f"{cls.__name__}.{name}"
+            if inspect.isfunction(attr):
+                setattr(cls, name, _wrap(qualname, attr))
+            elif isinstance(attr, (classmethod, staticmethod)):
+                setattr(cls, name, type(attr)(_wrap(qualname, attr.__func__)))
+
+
+def register(module, classes=()) -> None:
+    """Profile the public functions of ``module`` and methods of ``classes``.
+
+    The wrappers are installed right away when tracing is enabled, or by
+    :func:`enable` later.
+    """
+
+    _registered.append((module, tuple(classes)))
+    if PROFILER.enabled:
+        _instrument(module, classes)
+
+
+def enable(capacity: int | None = None) -> Profiler:
+    """Start recording and return the profiler."""
+
+    if capacity is not None and capacity != PROFILER.events.maxlen:
+        PROFILER.events = deque(PROFILER.events, maxlen=capacity)
+    PROFILER.enabled = True
+    for module, classes in _registered:
+        _instrument(module, classes)
+    return PROFILER
+
+
+def disable() -> None:
+    """Stop recording; collected data is kept until :meth:`Profiler.reset`."""
+
+    PROFILER.enabled = False
+
+
+def is_enabled() -> bool:
+    return PROFILER.enabled
+
+
+def format_report(report: dict, limit: int = 10) -> str:
+    """Return a :meth:`Profiler.snapshot` as a short text table."""
+
+    lines = []
+    for title, key in (("Functions", "functions"), ("Statements", "statements")):
+        lines.append(f"{title} (count, total ms, max ms, rows):")
+        for entry in report[key][:limit]:
+            name = " ".join(entry["name"].split())
+            if len(name) > 60:
+                name = name[:57] + "..."
+            lines.append(
+                f"  {entry['count']:>6} {entry['total_ms']:>10.3f}"
+                f" {entry['max_ms']:>9.3f} {entry['rows']:>7}  {name}"
+            )
+        if not report[key]:
+            lines.append("  (none)")
+    return "\n".join(lines)
+
+
+def load_snapshot(path: Path | None = None) -> dict | None:
+    """Return the snapshot stored at ``path``, or ``None`` if there is none."""
+
+    path = Path(path or snapshot_path())
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+if enabled_from_env():
+    enable()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Print a saved SQL profile snapshot.")
+    parser.add_argument("path", type=Path, nargs="?", default=None)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+    report = load_snapshot(args.path)
+    if report is None:
+        raise SystemExit(f"No profile snapshot at {args.path or snapshot_path()}")
+    print(format_report(report, args.limit))
+
+
+if __name__ == "__main__":
+    main()